@@ -0,0 +1,177 @@
+import time
+import asyncio
+import logging
+import functools
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Sequence, Set, Tuple, Union
+
+import discord
+from discord.ext import commands
+
+logger = logging.getLogger("sabaw_bot.animations")
+
+Final = Union[str, Callable[[], str]]
+
+
+class ChannelPressure:
+    """Recent REST writes per channel, as seen from `bot.http.request`.
+
+    A channel is "busy" when it has had `budget` writes in the last `window`
+    seconds (Discord's message bucket is 5 per 5s per channel) or its last
+    write took longer than `slow` seconds, which usually means discord.py sat
+    out a 429 for it.
+    """
+
+    def __init__(self, budget: int = 4, window: float = 5.0, slow: float = 1.0):
+        self.budget = budget
+        self.window = window
+        self.slow = slow
+        self._writes: Dict[int, Deque[float]] = {}
+        self._last_duration: Dict[int, float] = {}  # only for channels in _writes
+        self._swept = time.monotonic()
+
+    def attach(self, bot: commands.Bot) -> None:
+        http = bot.http
+        original = http.request
+
+        @functools.wraps(original)
+        async def request(route, **kwargs):
+            channel_id = getattr(route, "channel_id", None)
+            if channel_id is None or route.method == "GET":
+                return await original(route, **kwargs)
+            self.note(channel_id)
+            started = time.monotonic()
+            try:
+                return await original(route, **kwargs)
+            finally:
+                if channel_id in self._writes:
+                    self._last_duration[channel_id] = time.monotonic() - started
+
+        http.request = request
+
+    def note(self, channel_id: int, now: Optional[float] = None) -> None:
+        now = now if now is not None else time.monotonic()
+        cutoff = now - self.window
+        if now - self._swept >= self.window:
+            self._sweep(cutoff)
+            self._swept = now
+        writes = self._writes.get(channel_id)
+        if writes is None:
+            writes = self._writes[channel_id] = deque()
+        while writes and writes[0] <= cutoff:
+            writes.popleft()
+        writes.append(now)
+
+    def _sweep(self, cutoff: float) -> None:
+        # Channels written to once and never asked about again would otherwise stay forever.
+        idle = [channel_id for channel_id, writes in self._writes.items() if not writes or writes[-1] <= cutoff]
+        for channel_id in idle:
+            del self._writes[channel_id]
+            self._last_duration.pop(channel_id, None)
+
+    def recent(self, channel_id: int, now: Optional[float] = None) -> int:
+        writes = self._writes.get(channel_id)
+        if not writes:
+            return 0
+        cutoff = (now if now is not None else time.monotonic()) - self.window
+        while writes and writes[0] <= cutoff:
+            writes.popleft()
+        if not writes:
+            del self._writes[channel_id]
+            self._last_duration.pop(channel_id, None)
+            return 0
+        return len(writes)
+
+    def busy(self, channel_id: int) -> bool:
+        return self.recent(channel_id) >= self.budget or self._last_duration.get(channel_id, 0.0) > self.slow
+
+
+class AnimationEngine:
+    """Plays "thinking..." message animations as background tasks.
+
+    An animation is an opening message, a few intermediate edits with holds
+    between them, a final edit, and optionally one follow-up message. The
+    command that starts it returns right away.
+
+    Intermediate frames are decoration, so they're the first thing to go:
+    a frame is skipped (the hold still happens) while the channel is busy per
+    `ChannelPressure`. Once `max_per_channel` animations are already running
+    in a channel, new ones skip the animation entirely and just send the
+    final state. The final frame and follow-up are always sent.
+    """
+
+    def __init__(self, pressure: Optional[ChannelPressure] = None, max_per_channel: int = 2, metrics=None):
+        self.pressure = pressure or ChannelPressure()
+        self.max_per_channel = max_per_channel
+        self.metrics = metrics
+        self._running: Dict[int, Set[asyncio.Task]] = {}
+
+    @property
+    def running(self) -> int:
+        return sum(len(tasks) for tasks in self._running.values())
+
+    def play(self, channel: discord.abc.Messageable, frames: Sequence[Tuple[str, float]], final: Final,
+             follow_up: Optional[str] = None) -> asyncio.Task:
+        """`frames` is [(text, seconds to hold it)]; the first one is sent, the rest are edits."""
+        channel_id = getattr(channel, "id", 0)
+        tasks = self._running.setdefault(channel_id, set())
+        crowded = len(tasks) >= self.max_per_channel
+        self._count("sabaw_animations_total", ("mode", "final_only" if crowded else "animated"),
+                    help="Animations started, by whether frames were played.")
+        coro = self._final_only(channel, final, follow_up) if crowded else self._animate(channel, frames, final, follow_up)
+        task = asyncio.create_task(coro, name=f"animation:{channel_id}")
+        tasks.add(task)
+        task.add_done_callback(functools.partial(self._done, channel_id))
+        return task
+
+    def _done(self, channel_id: int, task: asyncio.Task) -> None:
+        tasks = self._running.get(channel_id)
+        if tasks is not None:
+            tasks.discard(task)
+            if not tasks:
+                del self._running[channel_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Animation in channel {channel_id} failed", exc_info=task.exception())
+
+    def _count(self, name: str, label: Tuple[str, str], help: str = "") -> None:
+        if self.metrics is not None:
+            self.metrics.inc(name, (label,), help=help)
+
+    @staticmethod
+    def _resolve(final: Final) -> str:
+        return final() if callable(final) else final
+
+    async def _final_only(self, channel: discord.abc.Messageable, final: Final, follow_up: Optional[str]) -> None:
+        await channel.send(self._resolve(final))
+        if follow_up:
+            await channel.send(follow_up)
+
+    async def _animate(self, channel: discord.abc.Messageable, frames: Sequence[Tuple[str, float]], final: Final,
+                       follow_up: Optional[str]) -> None:
+        channel_id = getattr(channel, "id", 0)
+        first, hold = frames[0]
+        message = await channel.send(first)
+        await asyncio.sleep(hold)
+        for text, hold in frames[1:]:
+            if self.pressure.busy(channel_id):
+                self._count("sabaw_animation_frames_total", ("outcome", "dropped"),
+                            help="Intermediate animation frames, sent or dropped under pressure.")
+            else:
+                await message.edit(content=text)
+                self._count("sabaw_animation_frames_total", ("outcome", "sent"),
+                            help="Intermediate animation frames, sent or dropped under pressure.")
+            await asyncio.sleep(hold)
+        try:
+            await message.edit(content=self._resolve(final))
+        except discord.NotFound:
+            # Someone deleted the "thinking" message; the answer still goes out.
+            await channel.send(self._resolve(final))
+        if follow_up:
+            await channel.send(follow_up)
+
+    async def close(self) -> None:
+        tasks = [t for ts in self._running.values() for t in ts]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._running.clear()
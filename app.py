@@ -0,0 +1,970 @@
+import os
+import time
+import random
+import signal
+import asyncio
+import sqlite3
+import discord
+import logging
+from zoneinfo import ZoneInfo
+from discord.ext import commands
+from typing import cast, Optional, List
+from discord import TextChannel
+from threading import Thread
+from matcher import KeywordMatcher
+from cooldowns import CooldownStore, ScopedLimiter, TokenBuckets
+from health import HealthServer, run_flask_fallback
+from metrics import Metrics
+from reactions import ReactionJob, ReactionScheduler
+from member_index import BoosterIndex, MemberPool
+from embeds import EmbedRegistry
+from content import ContentLibrary
+from batcher import Coalescer
+from roles import RoleCache, RoleGrants
+from guild_config import GuildConfigStore
+from selection import SelectionEngine
+from state_store import StateStore, collect_command_cooldowns, restore_command_cooldowns
+from sharding import owns_guild, parse_shard_ids, register_shard_metrics
+from scheduler import AnnouncementScheduler, ScheduledAnnouncement, parse_when
+from memdiag import MemoryDiagnostics
+from watchdog import LoopWatchdog
+from animations import AnimationEngine, ChannelPressure
+from cards import CardRenderer
+from log_pipeline import LogPipeline
+from cache_profile import CacheProfile, MemberLoader, StartupReport, resident_memory_bytes
+
+# Logs are queued and written by a background thread. LOG_FORMAT=text|json; below ERROR each log call
+# site keeps at most LOG_SAMPLE_PER_SECOND records a second (bursts of LOG_SAMPLE_BURST), 0 keeps everything.
+log_pipeline = LogPipeline(
+    level=getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper()),
+    fmt=os.environ.get("LOG_FORMAT", "text").lower(),
+    sample_rate=float(os.environ.get("LOG_SAMPLE_PER_SECOND", 10)),
+    sample_burst=int(os.environ.get("LOG_SAMPLE_BURST", 20)),
+).install()
+logger = logging.getLogger("sabaw_bot")
+startup_report = StartupReport()
+
+VERBOSE_LOGS = os.environ.get("VERBOSE_LOGS", "1") == "1"
+RESPONSE_CHANCE = 0.25
+USER_COOLDOWN_SECONDS = 60
+AUTORESPONDER_MAX_TRACKED_USERS = 10_000
+# On top of the per-user cooldown: (replies, per seconds) per channel and per guild, bursts up to `replies`.
+AUTORESPONDER_CHANNEL_BUDGET = (3, 30.0)
+AUTORESPONDER_GUILD_BUDGET = (8, 60.0)
+# Replies waiting out their "typing" delay at once; more than this are dropped, not queued.
+AUTORESPONDER_MAX_PENDING = 10
+
+# "aiohttp" serves /healthz and /readyz on the bot's loop; "flask" is the old thread; "off" disables.
+WEB_SERVER = os.environ.get("WEB_SERVER", "aiohttp").lower()
+WEB_PORT = int(os.environ.get("PORT", 8080))
+# Opt-in: needs the privileged presence intent enabled in the developer portal.
+TRACK_PRESENCES = os.environ.get("TRACK_PRESENCES", "0") == "1"
+# Joins/leaves within this many seconds of each other are merged into one message. 0 disables.
+MEMBER_BATCH_WINDOW_SECONDS = float(os.environ.get("MEMBER_BATCH_WINDOW", 3.0))
+MEMBER_BATCH_MAX_NAMES = 25
+ROLE_GRANT_CONCURRENCY = 4
+# !huy / !sabaw: animations running at once per channel before new ones send only their final frame.
+ANIMATIONS_PER_CHANNEL = 2
+# Welcome / boost / goodbye images are rendered locally in CARD_WORKERS processes (0 keeps the Drive URLs).
+# A <CARD_ASSET_DIR>/<template>.png overrides the template's banner URL; downloaded banners are kept in CARD_CACHE_DIR.
+CARD_WORKERS = int(os.environ.get("CARD_WORKERS", 2))
+CARD_CACHE_BYTES = int(float(os.environ.get("CARD_CACHE_MB", 32)) * 2**20)
+CARD_FONT = os.environ.get("CARD_FONT")
+CARD_ASSET_DIR = os.environ.get("CARD_ASSET_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cards"))
+CARD_CACHE_DIR = os.environ.get("CARD_CACHE_DIR", os.path.join(".cache", "cards"))
+CONFIG_DB_PATH = os.environ.get("CONFIG_DB", "sabaw.db")
+# Cooldowns and last picks are kept in memory and written to CONFIG_DB this often.
+STATE_FLUSH_SECONDS = float(os.environ.get("STATE_FLUSH_INTERVAL", 5.0))
+# A line can't come back within this many picks for the same guild/user (roast, who, sabaw, goodbye).
+SELECTION_NO_REPEAT = int(os.environ.get("SELECTION_NO_REPEAT", 3))
+SELECTION_HISTORY_SECONDS = 7 * 24 * 3600
+# !ann schedule: clock times are read in ANN_TIMEZONE; jobs overdue by more than ANN_CATCH_UP_HOURS after downtime are dropped.
+ANN_TIMEZONE = ZoneInfo(os.environ.get("ANN_TIMEZONE", "Asia/Manila"))
+ANN_CATCH_UP_SECONDS = float(os.environ.get("ANN_CATCH_UP_HOURS", 24)) * 3600
+ANN_MAX_PENDING_PER_GUILD = 200
+# Discord signs attachment URLs for about a day; saved ones older than this aren't trusted to still load.
+ANN_ATTACHMENT_URL_SECONDS = 20 * 3600
+# Sharding: SHARDED=1 (or SHARD_COUNT / SHARD_IDS, as set by launcher.py) runs an AutoShardedBot.
+SHARD_COUNT = int(os.environ["SHARD_COUNT"]) if os.environ.get("SHARD_COUNT") else None
+SHARD_IDS = parse_shard_ids(os.environ.get("SHARD_IDS", ""))
+SHARDED = os.environ.get("SHARDED", "0") == "1" or SHARD_COUNT is not None or SHARD_IDS is not None
+# Points REST and gateway somewhere other than discord.com, e.g. fake_discord.py for offline runs.
+DISCORD_API_BASE = os.environ.get("DISCORD_API_BASE")
+# CACHE_PROFILE=full|lean|lazy; CHUNK_GUILDS, MAX_MESSAGES and MEMBER_CACHE override single knobs.
+CACHE_PROFILE = CacheProfile.from_env()
+# Enables /debug/memory on the health server; requests need "Authorization: Bearer <DEBUG_TOKEN>".
+DEBUG_TOKEN = os.environ.get("DEBUG_TOKEN")
+# Anything holding the loop longer than this gets its stack logged. LOOP_DEBUG=1 also turns on asyncio debug mode.
+LOOP_LAG_THRESHOLD_SECONDS = float(os.environ.get("LOOP_LAG_THRESHOLD_MS", 100)) / 1000
+LOOP_DEBUG = os.environ.get("LOOP_DEBUG", "0") == "1"
+
+# Intents Setup
+intents = discord.Intents.default()
+intents.message_content = True
+intents.guilds = True
+intents.members = True
+intents.presences = TRACK_PRESENCES
+
+if SHARDED:
+    bot = commands.AutoShardedBot(command_prefix='!', intents=intents, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS,
+                                  **CACHE_PROFILE.client_kwargs())
+else:
+    bot = commands.Bot(command_prefix='!', intents=intents, **CACHE_PROFILE.client_kwargs())
+embed_templates = EmbedRegistry.load()
+content_library = ContentLibrary()
+health_server = HealthServer(bot, port=WEB_PORT)
+metrics = Metrics()
+metrics.add_routes(health_server.app)
+reaction_scheduler = ReactionScheduler(metrics=metrics)
+booster_index = BoosterIndex()
+member_pool = MemberPool(track_presences=TRACK_PRESENCES)
+role_cache = RoleCache()
+role_grants = RoleGrants(concurrency=ROLE_GRANT_CONCURRENCY, metrics=metrics)
+cards = CardRenderer.from_registry(
+    embed_templates, asset_dir=CARD_ASSET_DIR, cache_dir=CARD_CACHE_DIR, workers=CARD_WORKERS, cache_bytes=CARD_CACHE_BYTES, font_path=CARD_FONT, metrics=metrics)
+channel_pressure = ChannelPressure()
+animations = AnimationEngine(channel_pressure, max_per_channel=ANIMATIONS_PER_CHANNEL, metrics=metrics)
+
+def _rebuild_member_indexes(guild: discord.Guild):
+    booster_index.rebuild(guild)
+    member_pool.rebuild(guild)
+
+member_loader = MemberLoader(CACHE_PROFILE.chunk_mode, on_chunked=_rebuild_member_indexes)
+
+state = StateStore(CONFIG_DB_PATH, flush_interval=STATE_FLUSH_SECONDS, metrics=metrics)
+state.add_collector(lambda: collect_command_cooldowns(bot, state))
+selector = SelectionEngine(window=SELECTION_NO_REPEAT)
+
+def _save_selection_history():
+    expires_at = time.time() + SELECTION_HISTORY_SECONDS
+    for scope in selector.touched():
+        state.put("selection", scope, selector.recent(scope), expires_at=expires_at)
+
+state.add_collector(_save_selection_history)
+
+def _pick(scope: str, pack: str, corpus: str = "lines", **values) -> str:
+    """Next line from this scope's shuffle bag over a content corpus."""
+    return selector.draw(scope, content_library.corpus(pack, corpus)).render(values)
+
+_autoresponder_cooldowns = CooldownStore(USER_COOLDOWN_SECONDS, AUTORESPONDER_MAX_TRACKED_USERS)
+_autoresponder_channel_budget = TokenBuckets(*AUTORESPONDER_CHANNEL_BUDGET)
+_autoresponder_guild_budget = TokenBuckets(*AUTORESPONDER_GUILD_BUDGET)
+_autoresponder_budget = ScopedLimiter([
+    ("user", _autoresponder_cooldowns),
+    ("channel", _autoresponder_channel_budget),
+    ("guild", _autoresponder_guild_budget),
+])
+_autoresponder_pending = 0
+
+# Roles / Channel IDs (defaults; each guild can override them with !config)
+VERIFY_ROLE_NAME = "certified tambayers ⋆ ˙ ⟡ .ᐟ"
+WELCOME_CHANNEL_ID = 1293515009665531925
+BOOST_CHANNEL_ID = 1397335182465437697
+GOODBYE_CHANNEL_ID = 1293513854466261064
+ROLES_CHANNEL_ID = 1396943702085206117
+BOOST_ROLE_NAME = "booster ⋆ ˙ ⟡ .ᐟ"
+
+guild_config = GuildConfigStore(CONFIG_DB_PATH, defaults={
+    "welcome_channel_id": WELCOME_CHANNEL_ID,
+    "boost_channel_id": BOOST_CHANNEL_ID,
+    "goodbye_channel_id": GOODBYE_CHANNEL_ID,
+    "roles_channel_id": ROLES_CHANNEL_ID,
+    "verify_role_name": VERIFY_ROLE_NAME,
+    "boost_role_name": BOOST_ROLE_NAME,
+})
+
+def _config_channel(guild: discord.Guild, key: str) -> Optional[TextChannel]:
+    # guild.get_channel only sees this guild's channels, so defaults never leak across servers.
+    channel_id = getattr(guild_config.get(guild.id), key)
+    channel = guild.get_channel(channel_id) if channel_id else None
+    return channel if isinstance(channel, TextChannel) else None
+    
+# Bot Ready
+@bot.event
+async def on_ready():
+    logger.info(f"Bot is ready: {bot.user} | ID: {bot.user.id} | shards: {bot.shard_count or 1}")
+    if startup_report.ready(bot, CACHE_PROFILE):
+        member_loader.start(bot, done=_members_backfilled)
+    try:
+        bot.add_view(VerifyButton())
+    except Exception:
+        logger.exception("Failed to add persistent view.")
+
+async def _members_backfilled():
+    startup_report.chunked(bot)
+
+# Member Indexes (partial until the guild is chunked; MemberLoader rebuilds them then)
+@bot.event
+async def on_guild_available(guild: discord.Guild):
+    _rebuild_member_indexes(guild)
+
+@bot.event
+async def on_guild_join(guild: discord.Guild):
+    _rebuild_member_indexes(guild)
+
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    booster_index.drop_guild(guild.id)
+    member_pool.drop_guild(guild.id)
+
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    role_cache.invalidate(role.guild.id)
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    role_cache.invalidate(after.guild.id)
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    role_cache.invalidate(role.guild.id)
+
+@bot.event
+async def on_presence_update(before: discord.Member, after: discord.Member):
+    if before.status != after.status:
+        member_pool.update_presence(after)
+
+# Parsing Helpers
+def parse_announcement_input(input_str):
+    parts = [part.strip() for part in input_str.split('|')]
+    
+    if len(parts) == 1:
+        return [], "", parts[0], ""
+
+    while len(parts) < 4:
+        parts.append("")
+
+    emoji_part, title, body, image_url = parts
+    emojis = emoji_part.split()
+    return emojis, title, body, image_url
+    
+async def _send_card_embed(channel: discord.abc.Messageable, template: str, embed: discord.Embed,
+                           member: Optional[discord.abc.User] = None):
+    """Send `embed` with its banner rendered locally when the card renderer has one, else with the banner URL."""
+    file = cards.attach(embed, template, await cards.render(template, member))
+    return await channel.send(embed=embed, file=file) if file else await channel.send(embed=embed)
+
+# Welcomer
+def _human_list(names: List[str], overflow: int = 0) -> str:
+    if overflow:
+        return ", ".join(names) + f" and {overflow} others"
+    if len(names) == 1:
+        return names[0]
+    return ", ".join(names[:-1]) + " and " + names[-1]
+
+async def _send_welcome(member: discord.Member):
+    channel = _config_channel(member.guild, "welcome_channel_id")
+    if channel is None:
+        return
+    roles_channel_id = guild_config.get(member.guild.id).roles_channel_id
+    embed = embed_templates["welcome"].render(mention=member.mention, roles_channel_id=roles_channel_id)
+    try:
+        await _send_card_embed(channel, "welcome", embed, member)
+    except Exception:
+        logger.exception("Failed to send welcome embed.")
+
+async def _send_welcome_batch(members: List[discord.Member], overflow: int):
+    guild = members[0].guild
+    channel = _config_channel(guild, "welcome_channel_id")
+    if channel is None:
+        return
+    embed = embed_templates["welcome_batch"].render(mentions=_human_list([m.mention for m in members], overflow),
+                                                    roles_channel_id=guild_config.get(guild.id).roles_channel_id)
+    try:
+        await _send_card_embed(channel, "welcome_batch", embed)
+    except Exception:
+        logger.exception("Failed to send batched welcome embed.")
+
+welcome_batcher = Coalescer(_send_welcome, _send_welcome_batch, window=MEMBER_BATCH_WINDOW_SECONDS,
+                            max_items=MEMBER_BATCH_MAX_NAMES, name="welcome", metrics=metrics)
+
+@bot.event
+async def on_member_join(member: discord.Member):
+    member_pool.add(member)
+
+    if _config_channel(member.guild, "welcome_channel_id") is None:
+        if VERBOSE_LOGS:
+            logger.warning("Welcome channel not found or not a TextChannel.")
+        return
+
+    await welcome_batcher.push(member.guild.id, member)
+
+# Verify Button View
+class VerifyButton(discord.ui.View):
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    @discord.ui.button(label="slurp in!", style=discord.ButtonStyle.success, emoji="🍜", custom_id="verify_button")
+    @metrics.timed("interaction")
+    async def verify_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        guild = interaction.guild
+        if guild is None:
+            await interaction.response.send_message("This button only works in servers!", ephemeral=True)
+            return
+
+        # Ack first: the grant below can be slow and the interaction deadline is 3s.
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        if isinstance(interaction.user, discord.Member):
+            member = interaction.user
+        else:
+            member = await member_loader.member(guild, interaction.user.id)
+        if member is None:
+            await interaction.followup.send("Couldn’t fetch your member data!", ephemeral=True)
+            return
+
+        role = role_cache.get(guild, guild_config.get(guild.id).verify_role_name)
+        if role is None:
+            await interaction.followup.send("Couldn't find the verify role!", ephemeral=True)
+            return
+
+        if member.get_role(role.id) is not None:
+            await interaction.followup.send("you're already part of the sabaw! 🍜", ephemeral=True)
+            return
+
+        try:
+            await role_grants.grant(member, role)
+        except discord.HTTPException:
+            logger.exception(f"Could not give verify role to {member}")
+            await interaction.followup.send("couldn't hand you the role — ping a mod! 🍜", ephemeral=True)
+            return
+        await interaction.followup.send("🍜 welcome to the hub — you’re in!", ephemeral=True)
+
+# Admin-Only: Send Verification
+@bot.command(name="sendverify")
+@commands.has_permissions(administrator=True)
+async def send_verify_message(ctx: commands.Context):
+    try:
+        await ctx.message.delete()
+    except Exception:
+        pass
+        
+    embed = embed_templates["verify"].render()
+    try:
+        await ctx.send(embed=embed, view=VerifyButton())
+    except Exception:
+        logger.exception("Failed to send verify embed.")
+
+# Booster Spotted
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    if before.premium_since != after.premium_since:
+        booster_index.update(after)
+
+    # detect boost
+    if not before.premium_since and after.premium_since:
+        channel = _config_channel(after.guild, "boost_channel_id")
+        if channel is None:
+            logger.warning("Boost channel not found or wrong type.")
+            return
+
+        booster_role = role_cache.get(after.guild, guild_config.get(after.guild.id).boost_role_name)
+        if booster_role:
+            try:
+                await role_grants.grant(after, booster_role, reason="Server boosted ✨")
+                logger.info("Booster role given to %s", after)
+            except discord.Forbidden:
+                logger.warning("Missing permissions to add %s to %s", booster_role, after)
+            except discord.HTTPException:
+                logger.exception("Could not add role")
+
+        embed = embed_templates["boost"].render(mention=after.mention)
+        try:
+            await _send_card_embed(channel, "boost", embed, after)
+            logger.info("Boost notification sent!")
+        except Exception:
+            logger.exception("Failed to send boost embed.")
+
+# Leaver
+async def _send_goodbye(member: discord.Member):
+    channel = _config_channel(member.guild, "goodbye_channel_id")
+    if channel is None:
+        return
+    embed = embed_templates["goodbye"].render(description=_pick(f"goodbye:{member.guild.id}", "goodbye", name=member.name))
+    try:
+        await _send_card_embed(channel, "goodbye", embed, member)
+    except Exception:
+        logger.exception("Failed to send goodbye embed.")
+
+async def _send_goodbye_batch(members: List[discord.Member], overflow: int):
+    channel = _config_channel(members[0].guild, "goodbye_channel_id")
+    if channel is None:
+        return
+    embed = embed_templates["goodbye_batch"].render(names=_human_list([m.name for m in members], overflow))
+    try:
+        await _send_card_embed(channel, "goodbye_batch", embed)
+    except Exception:
+        logger.exception("Failed to send batched goodbye embed.")
+
+goodbye_batcher = Coalescer(_send_goodbye, _send_goodbye_batch, window=MEMBER_BATCH_WINDOW_SECONDS,
+                            max_items=MEMBER_BATCH_MAX_NAMES, name="goodbye", metrics=metrics)
+
+@bot.event
+async def on_member_remove(member: discord.Member):
+    booster_index.discard(member.guild.id, member.id)
+    member_pool.discard(member.guild.id, member.id)
+
+    if _config_channel(member.guild, "goodbye_channel_id") is None:
+        logger.warning("Goodbye channel not found or is not a TextChannel.")
+        return
+
+    await goodbye_batcher.push(member.guild.id, member)
+
+# AUTORESPONDER
+
+AUTORESPONDER_KEYWORDS: List[str] = [
+    "im bored", "i'm bored", "bored", "pagod", "i'm tired", "tired",
+    "miss", "sleep", "gutom", "hungry", "help", "sos",
+]
+AUTORESPONDER_RESPONSES: List[str] = [
+    "try talking to someone! or make a sandwich.",
+    "take a breather — life is a marathon, not a sprint.",
+    "say hi in vc and start a chaos thread.",
+    "go outside for 2 mins. deep breath.",
+]
+_autoresponder_matcher = KeywordMatcher(AUTORESPONDER_KEYWORDS)
+
+def _can_autorespond(user_id: int, channel_id: int = 0, guild_id: int = 0) -> bool:
+    """Spend from the user cooldown and the channel and guild budgets, all or nothing."""
+    if _autoresponder_pending >= AUTORESPONDER_MAX_PENDING:
+        refused = "pending"
+    else:
+        refused = _autoresponder_budget.acquire((user_id, channel_id, guild_id), asyncio.get_event_loop().time())
+    if refused is not None:
+        metrics.inc("sabaw_autoresponder_suppressed_total", (("level", refused),),
+                    help="Autoresponses skipped, by the limit that stopped them.")
+        return False
+    state.put("autoresponder", str(user_id), None, expires_at=time.time() + USER_COOLDOWN_SECONDS)
+    return True
+
+def _restore_autoresponder_cooldowns():
+    now, wall = asyncio.get_running_loop().time(), time.time()
+    saved = sorted((expires_at, key) for key, _, expires_at in state.items("autoresponder"))
+    for expires_at, key in saved:
+        _autoresponder_cooldowns.restore(int(key), expires_at - wall, now)
+    return len(saved)
+
+@bot.event
+async def on_message(message: discord.Message):
+    global _autoresponder_pending
+    if message.author.bot or message.webhook_id is not None:
+        return
+    await bot.process_commands(message)
+
+    content = (message.content or "").lower()
+
+    if _autoresponder_matcher.search(content) is not None:
+        if random.random() < RESPONSE_CHANCE and _can_autorespond(message.author.id, message.channel.id,
+                                                                  message.guild.id if message.guild else 0):
+            _autoresponder_pending += 1
+            try:
+                await asyncio.sleep(random.uniform(0.6, 1.5))
+                await message.reply(random.choice(AUTORESPONDER_RESPONSES), mention_author=False)
+                if VERBOSE_LOGS:
+                    # Lazy args: when this site is being sampled, dropped records are never formatted.
+                    logger.info("Autoresponded to %s in %s", message.author, message.channel)
+            except discord.HTTPException:
+                logger.exception("Failed to autorespond.")
+            finally:
+                _autoresponder_pending -= 1
+
+# COMMANDS
+async def _report_reaction_failures(job: ReactionJob):
+    if not job.partial:
+        return
+    failed = " ".join(emoji for emoji, _ in job.failed)
+    try:
+        await job.message.channel.send(f"⚠️ couldn't add some reactions: {failed}", delete_after=10)
+    except discord.HTTPException:
+        pass
+
+# --- Announcement Command ---
+def _announcement_embed(title: str, body: str, image_url: str) -> discord.Embed:
+    embed = discord.Embed(
+        title=title if title else None,
+        description=body or "*No message provided.*",
+        color=embed_templates.colour,
+    )
+    if image_url:
+        embed.set_image(url=image_url)
+    return embed
+
+def _announcement_parts(ctx: commands.Context, input_message: Optional[str]):
+    emojis, title, body, image_url = parse_announcement_input(input_message or "")
+    if ctx.message.attachments:
+        attachment = ctx.message.attachments[0]
+        if attachment.content_type and attachment.content_type.startswith("image/"):
+            image_url = attachment.url
+    return emojis, title, body, image_url
+
+@bot.group(name="ann", invoke_without_command=True)
+@commands.has_permissions(administrator=True)
+async def announce(ctx: commands.Context, mode: str = "off", *, input_message: str = None):
+    try:
+        mention_mode = mode.lower() if mode else "off"
+        mention_text = "@everyone" if mention_mode == "on" else ""
+        
+        emojis, title, body, image_url = _announcement_parts(ctx, input_message)
+
+        if not title and not body and not image_url:
+            await ctx.send("You need at least a title, message, or image.")
+            return
+
+        sent = await ctx.send(content=mention_text, embed=_announcement_embed(title, body, image_url))
+
+        reaction_scheduler.submit(sent, emojis, on_done=_report_reaction_failures)
+
+        try:
+            await ctx.message.delete()
+        except Exception:
+            pass
+            
+    except Exception:
+        logger.exception("ANN ERROR")
+        await ctx.send("Something went wrong formatting your announcement.")
+
+@announce.command(name="schedule")
+@commands.has_permissions(administrator=True)
+async def announce_schedule(ctx: commands.Context, when: str, channel: Optional[TextChannel] = None,
+                            mode: str = "off", *, input_message: str = None):
+    """!ann schedule <when> [#channel] <on|off> <emojis | title | body | image>"""
+    try:
+        run_at = parse_when(when, time.time(), ANN_TIMEZONE)
+    except ValueError:
+        await ctx.send("when? try `2h30m`, `18:00`, `\"2026-10-20 18:00\"` or a `<t:...>` timestamp.")
+        return
+    if run_at <= time.time():
+        await ctx.send("that time already passed.")
+        return
+    if len(announcement_scheduler.pending(ctx.guild.id)) >= ANN_MAX_PENDING_PER_GUILD:
+        await ctx.send(f"this server already has {ANN_MAX_PENDING_PER_GUILD} scheduled announcements. cancel some first.")
+        return
+
+    emojis, title, body, image_url = _announcement_parts(ctx, input_message)
+    if not title and not body and not image_url:
+        await ctx.send("You need at least a title, message, or image.")
+        return
+
+    image_from = None
+    if image_url and ctx.message.attachments and image_url == ctx.message.attachments[0].url:
+        # Attachment URLs are signed and expire after about a day, so the post re-reads this message for a fresh one.
+        image_from = [ctx.channel.id, ctx.message.id]
+
+    channel = channel or ctx.channel
+    job = await announcement_scheduler.add(ctx.guild.id, channel.id, ctx.author.id, run_at, {
+        "mention": mode.lower() == "on",
+        "emojis": emojis,
+        "title": title,
+        "body": body,
+        "image_url": image_url,
+        "image_from": image_from,
+    })
+    keep = "\nkeep this message up until then, the image is taken from it." if image_from else ""
+    await ctx.send(f"🗓️ announcement `#{job.id}` scheduled for <t:{int(run_at)}:F> (<t:{int(run_at)}:R>) in {channel.mention}.{keep}")
+
+@announce.command(name="list")
+@commands.has_permissions(administrator=True)
+async def announce_list(ctx: commands.Context):
+    jobs = announcement_scheduler.pending(ctx.guild.id)
+    if not jobs:
+        await ctx.send("no scheduled announcements.")
+        return
+    lines = []
+    for job in jobs[:20]:
+        label = job.payload.get("title") or job.payload.get("body") or "(image)"
+        lines.append(f"`#{job.id}` <t:{int(job.run_at)}:f> in <#{job.channel_id}> — {label[:60]}")
+    more = f"\n…and {len(jobs) - 20} more" if len(jobs) > 20 else ""
+    await ctx.send("🗓️ scheduled announcements:\n" + "\n".join(lines) + more + "\n\ncancel with `!ann cancel <id>`")
+
+@announce.command(name="cancel")
+@commands.has_permissions(administrator=True)
+async def announce_cancel(ctx: commands.Context, job_id: str):
+    try:
+        cancelled = await announcement_scheduler.cancel(ctx.guild.id, int(job_id.lstrip("#")))
+    except ValueError:
+        cancelled = False
+    await ctx.send(f"🗑️ announcement `#{job_id.lstrip('#')}` cancelled." if cancelled
+                   else f"no scheduled announcement `{job_id}` here.")
+
+async def _fresh_attachment_url(channel_id: int, message_id: int) -> Optional[str]:
+    """A newly signed URL for the first image attached to a message, or None if the message or image is gone."""
+    channel = bot.get_channel(channel_id)
+    if not isinstance(channel, discord.abc.Messageable):
+        return None
+    try:
+        message = await channel.fetch_message(message_id)
+    except discord.HTTPException:
+        return None
+    for attachment in message.attachments:
+        if attachment.content_type and attachment.content_type.startswith("image/"):
+            return attachment.url
+    return None
+
+async def _post_scheduled_announcement(job: ScheduledAnnouncement):
+    channel = bot.get_channel(job.channel_id)
+    if not isinstance(channel, TextChannel):
+        raise LookupError(f"channel {job.channel_id} is gone")
+    payload = job.payload
+    image_url = payload["image_url"]
+    if payload.get("image_from"):
+        fresh = await _fresh_attachment_url(*payload["image_from"])
+        if fresh is not None:
+            image_url = fresh
+        elif time.time() - job.created_at > ANN_ATTACHMENT_URL_SECONDS:
+            logger.warning(f"Scheduled announcement #{job.id}: its image message is gone and the saved URL has "
+                           f"likely expired; posting without the image")
+            image_url = None
+    sent = await channel.send(content="@everyone" if payload["mention"] else "",
+                              embed=_announcement_embed(payload["title"], payload["body"], image_url))
+    reaction_scheduler.submit(sent, payload["emojis"], on_done=_report_reaction_failures)
+    logger.info(f"Posted scheduled announcement #{job.id} in {channel}")
+
+announcement_scheduler = AnnouncementScheduler(
+    CONFIG_DB_PATH, _post_scheduled_announcement, catch_up=ANN_CATCH_UP_SECONDS,
+    owns=lambda guild_id: owns_guild(guild_id, SHARD_COUNT, SHARD_IDS), metrics=metrics)
+
+# --- Say / Chat Repeater Command ---
+@bot.command(name="say")
+@commands.cooldown(rate=1, per=30, type=commands.BucketType.user)
+async def say_plain(ctx: commands.Context, *, message: str):
+    try:
+        await ctx.message.delete()
+    except Exception:
+        pass
+        
+    emojis, text, title, image_url = parse_announcement_input(message)
+    content = text or title or "*No message provided.*"
+    sent = await ctx.send(content.strip())
+    reaction_scheduler.submit(sent, emojis, on_done=_report_reaction_failures)
+
+@say_plain.error
+async def say_plain_error(ctx: commands.Context, error):
+    if isinstance(error, commands.CommandOnCooldown):
+        await ctx.send(f"⏳ {ctx.author.mention}, puro ping. kalma, ayaw? try again in `{error.retry_after:.1f}s`.")
+        
+# --- Boosters ---
+def _booster_description(mentions: List[str]) -> str:
+    template = embed_templates["boosters"]
+    if not mentions:
+        return template.strings["empty"]
+    listed = "\n".join([f"{i+1}. {mention}" for i, mention in enumerate(mentions)])
+    return template.fill(listed=listed)
+
+@bot.command(name="boosters")
+async def boosters(ctx: commands.Context):
+    try:
+        await ctx.message.delete()
+    except Exception:
+        pass
+        
+    await member_loader.ensure(ctx.guild)
+    if ctx.guild.id not in booster_index:
+        booster_index.rebuild(ctx.guild)
+    description = booster_index.render(ctx.guild.id, _booster_description)
+
+    embed = embed_templates["boosters"].render(description=description)
+    await _send_card_embed(ctx, "boosters", embed)
+    
+# --- Test Drive ---
+@bot.command(name="huy")
+@commands.cooldown(rate=1, per=30, type=commands.BucketType.user) 
+async def test_bot(ctx: commands.Context):
+    animations.play(ctx.channel, [
+        ("🤖 checking if bot is breathing...", 1.2),
+        ("🧠 analyzing braincells... please wait...", 2.5),
+    ], final=lambda: content_library.render("huy", latency=round(bot.latency * 1000)))
+    
+@test_bot.error
+async def test_bot_error(ctx, error):
+    if isinstance(error, commands.CommandOnCooldown):
+        await ctx.send(f"⏳ {ctx.author.mention}, puro ping. kalma, ayaw? try again in `{error.retry_after:.1f}s`.")
+        
+# RANDOM INTERACTIVE COMMANDS
+# --- Sabaw Command ---
+@bot.command(name="sabaw")
+@commands.cooldown(rate=1, per=30, type=commands.BucketType.user)
+async def sabaw_line(ctx: commands.Context):
+    scope = ctx.guild.id if ctx.guild else ctx.channel.id
+    chosen_intro = _pick(f"sabaw.intros:{scope}", "sabaw", "intros")
+    chosen_line = _pick(f"sabaw.lines:{scope}", "sabaw", "lines")
+
+    animations.play(ctx.channel, [
+        ("🤖 diagnosing emotional damage...", 1.2),
+        ("🩻 calculating iq deficit... please wait...", 1.5),
+    ], final=chosen_intro, follow_up=f"> {chosen_line}")
+
+@sabaw_line.error
+async def sabaw_line_error(ctx, error):
+    if isinstance(error, commands.CommandOnCooldown):
+        await ctx.send(f"⏳ {ctx.author.mention}, puro ping. kalma, ayaw? try again in `{error.retry_after:.1f}s`.")
+
+# --- Who Command ---
+@bot.command(name="who")
+@commands.cooldown(rate=1, per=30, type=commands.BucketType.user)
+async def who(ctx: commands.Context):
+    await member_loader.ensure(ctx.guild)
+    if ctx.guild.id not in member_pool:
+        member_pool.rebuild(ctx.guild)
+    chosen = member_pool.sample(ctx.guild)
+
+    if chosen is None:
+        await ctx.send("walang tao dito... server ghost town na 💀")
+        return
+        
+    await ctx.send(_pick(f"who:{ctx.guild.id}", "who", mention=chosen.mention, display_name=chosen.display_name))
+
+@who.error
+async def who_error(ctx, error):
+    if isinstance(error, commands.CommandOnCooldown):
+        await ctx.send(f"⏳ {ctx.author.mention}, puro ping. kalma, ayaw? try again in `{error.retry_after:.1f}s`.")
+
+# --- Roast Command ---
+@bot.command(name="roast")
+@commands.cooldown(rate=1, per=30, type=commands.BucketType.user)
+async def roast(ctx: commands.Context, member: Optional[discord.Member] = None):
+    target = member or ctx.author
+
+    await ctx.send(_pick(f"roast:{target.id}", "roast", mention=target.mention))
+
+@roast.error
+async def roast_error(ctx, error):
+    if isinstance(error, commands.CommandOnCooldown):
+        await ctx.send(f"⏳ {ctx.author.mention}, puro ping. kalma, ayaw? try again in `{error.retry_after:.1f}s`.")
+
+# --- Help Command ---
+@bot.command(name="helpme")
+@commands.cooldown(rate=1, per=30, type=commands.BucketType.user)
+async def helpme(ctx: commands.Context):
+    embed = embed_templates["helpme"].render()
+
+    await ctx.send(embed=embed)
+
+@helpme.error
+async def helpme_error(ctx, error):
+    if isinstance(error, commands.CommandOnCooldown):
+        await ctx.send(f"⏳ {ctx.author.mention}, puro ping. kalma, ayaw? try again in `{error.retry_after:.1f}s`.")
+
+# --- Server Config (admin) ---
+@bot.group(name="config", invoke_without_command=True)
+@commands.has_permissions(administrator=True)
+async def config_show(ctx: commands.Context):
+    overrides = guild_config.overrides(ctx.guild.id)
+    lines = [
+        f"`{key}` = {value}" + (" *(default)*" if key not in overrides else "")
+        for key, value in guild_config.get(ctx.guild.id).as_dict().items()
+    ]
+    await ctx.send("⚙️ server settings:\n" + "\n".join(lines) + "\n\nchange with `!config set <key> <value>` or `!config reset <key>`")
+
+@config_show.command(name="set")
+@commands.has_permissions(administrator=True)
+async def config_set(ctx: commands.Context, key: str, *, value: str):
+    try:
+        stored = await guild_config.set(ctx.guild.id, key, value)
+    except KeyError:
+        await ctx.send(f"unknown setting `{key}`.")
+        return
+    except ValueError:
+        await ctx.send(f"`{value}` isn't a valid value for `{key}`.")
+        return
+    except sqlite3.Error:
+        logger.exception(f"Couldn't save {key} for guild {ctx.guild.id}")
+        await ctx.send(f"⚠️ couldn't save `{key}`, nothing was changed. Try again in a bit.")
+        return
+    await ctx.send(f"✅ `{key}` = {stored}")
+
+@config_show.command(name="reset")
+@commands.has_permissions(administrator=True)
+async def config_reset(ctx: commands.Context, key: str):
+    try:
+        await guild_config.reset(ctx.guild.id, key)
+    except KeyError:
+        await ctx.send(f"unknown setting `{key}`.")
+        return
+    except sqlite3.Error:
+        logger.exception(f"Couldn't reset {key} for guild {ctx.guild.id}")
+        await ctx.send(f"⚠️ couldn't reset `{key}`, nothing was changed. Try again in a bit.")
+        return
+    await ctx.send(f"↩️ `{key}` is back to the default.")
+
+# --- Memory Diagnostics (admin) ---
+def _fmt_bytes(n: Optional[int]) -> str:
+    if n is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+@bot.command(name="memory")
+@commands.has_permissions(administrator=True)
+async def memory_command(ctx: commands.Context, action: str = "report", limit: int = 8):
+    """!memory [report|start|snapshot|top|diff|stop] [limit]"""
+    limit = max(1, min(limit, 20))
+    if action == "start":
+        started = memory.start()
+        await ctx.send("🧠 tracemalloc started, baseline taken." if started else "tracemalloc is already running.")
+        return
+    if action == "stop":
+        await ctx.send("🧠 tracemalloc stopped." if memory.stop() else "tracemalloc isn't running.")
+        return
+    if action == "snapshot":
+        try:
+            memory.snapshot()
+        except RuntimeError as e:
+            await ctx.send(str(e))
+            return
+        await ctx.send("📸 snapshot taken. `!memory diff` compares it to the baseline.")
+        return
+    if action not in ("report", "top", "diff"):
+        await ctx.send("usage: `!memory [report|start|snapshot|top|diff|stop] [limit]`")
+        return
+
+    report = await memory.report(limit)
+    lines = [f"rss {_fmt_bytes(report['rss'])}"]
+    if report["tracing"]:
+        lines[0] += f" | traced {_fmt_bytes(report['traced_current'])} (peak {_fmt_bytes(report['traced_peak'])})"
+    if action == "report":
+        lines += [f"{name:<24} {size if size is not None else 'n/a'}" for name, size in report["structures"].items()]
+    if action in ("report", "top") and report["top"]:
+        lines.append("-- top allocation sites --")
+        lines += [f"{_fmt_bytes(s['size']):>9} {s['count']:>7}  {s['site']}" for s in report["top"]]
+    if action == "diff":
+        if not report["diff"]:
+            lines.append("need a baseline and a snapshot: `!memory start`, wait, `!memory snapshot`.")
+        lines += [f"{'+' if s['size_diff'] >= 0 else '-'}{_fmt_bytes(abs(s['size_diff'])):>9} {s['count_diff']:>+7}  {s['site']}"
+                  for s in report["diff"]]
+    if action == "top" and not report["tracing"]:
+        lines.append("tracemalloc isn't running: `!memory start` first.")
+    text = "\n".join(lines)
+    await ctx.send(f"```\n{text[:1900]}\n```")
+
+# --- Content Reload (admin) ---
+@bot.command(name="reloadcontent")
+@commands.has_permissions(administrator=True)
+async def reload_content(ctx: commands.Context, pack: Optional[str] = None):
+    if pack and pack not in content_library.available():
+        await ctx.send(f"no content pack named `{pack}`. available: {', '.join(content_library.available())}")
+        return
+    results = content_library.reload(pack)
+    if not results:
+        await ctx.send("no content packs loaded yet — they load on first use.")
+        return
+    lines = [f"`{name}` → v{version}" if version is not None else f"`{name}` → failed, kept old version" for name, version in results.items()]
+    await ctx.send("🔁 content reloaded:\n" + "\n".join(lines))
+
+# RUN BOT
+metrics.instrument_bot(bot)
+channel_pressure.attach(bot)
+register_shard_metrics(bot, metrics)
+loop_watchdog = LoopWatchdog(threshold=LOOP_LAG_THRESHOLD_SECONDS, metrics=metrics)
+memory = MemoryDiagnostics()
+memory.register("autoresponder_cooldowns", lambda: len(_autoresponder_cooldowns))
+memory.register("cached_guilds", lambda: len(bot.guilds))
+memory.register("cached_members", lambda: sum(len(g.members) for g in bot.guilds))
+memory.register("cached_users", lambda: len(bot.users))
+memory.register("cached_messages", lambda: len(bot.cached_messages))
+memory.register("selection_bags", lambda: len(selector))
+memory.register("state_dirty_keys", lambda: state.pending)
+memory.register("animations_running", lambda: animations.running)
+memory.register("announcements_scheduled", lambda: len(announcement_scheduler))
+memory.register("card_cache_entries", lambda: len(cards))
+memory.register("card_cache_bytes", lambda: cards.cached_bytes)
+memory.register("reactions_pending", lambda: reaction_scheduler.pending)
+memory.register("member_batches_pending", lambda: welcome_batcher.pending + goodbye_batcher.pending)
+memory.register("autoresponder_channel_buckets", lambda: len(_autoresponder_channel_budget))
+memory.register("autoresponder_guild_buckets", lambda: len(_autoresponder_guild_budget))
+memory.register("log_backlog", lambda: log_pipeline.backlog)
+memory.register("asyncio_tasks", lambda: len(asyncio.all_tasks()))
+memory.add_routes(health_server.app, DEBUG_TOKEN)
+
+metrics.gauge("sabaw_gateway_latency_seconds", lambda: bot.latency if bot.is_ready() else float("nan"),
+              help="Heartbeat latency reported by discord.py.")
+metrics.gauge("sabaw_autoresponder_cooldown_entries", lambda: len(_autoresponder_cooldowns),
+              help="Users currently tracked by the autoresponder cooldown.")
+metrics.gauge("sabaw_state_dirty_keys", lambda: state.pending,
+              help="State changes waiting for the next write-behind flush.")
+metrics.gauge("sabaw_resident_memory_bytes", lambda: resident_memory_bytes() or float("nan"),
+              help="Resident set size of the bot process.")
+metrics.gauge("sabaw_cached_members", lambda: sum(len(g.members) for g in bot.guilds),
+              help="Members held in discord.py's cache.")
+metrics.gauge("sabaw_chunked_guilds", lambda: sum(1 for g in bot.guilds if g.chunked),
+              help="Guilds whose full member list is loaded.")
+metrics.gauge("sabaw_cached_messages", lambda: len(bot.cached_messages),
+              help="Messages held in discord.py's message cache (max_messages).")
+metrics.gauge("sabaw_startup_seconds", lambda: {(("phase", phase),): value for phase, value in
+                                                (("ready", startup_report.ready_after),
+                                                 ("chunked", startup_report.chunked_after)) if value is not None},
+              help="Seconds from process start to first ready / to all member lists loaded.")
+metrics.gauge("sabaw_animations_running", lambda: animations.running,
+              help="!huy / !sabaw animations currently playing.")
+metrics.gauge("sabaw_announcements_scheduled", lambda: len(announcement_scheduler),
+              help="Scheduled announcements waiting to be posted.")
+metrics.gauge("sabaw_card_cache_bytes", lambda: cards.cached_bytes,
+              help="Encoded welcome/boost/goodbye cards held in the LRU.")
+metrics.gauge("sabaw_log_queue_backlog", lambda: log_pipeline.backlog,
+              help="Log records queued for the writer thread.")
+metrics.gauge("sabaw_log_records_sampled_out", lambda: {(("logger", name),): n for name, n in
+                                                        log_pipeline.sampler.dropped_counts().items()},
+              help="Log records dropped by per-call-site sampling, by logger.")
+metrics.gauge("sabaw_autoresponder_pending", lambda: _autoresponder_pending,
+              help="Autoresponses waiting out their reply delay.")
+metrics.gauge("sabaw_reactions_pending", lambda: reaction_scheduler.pending,
+              help="Reaction jobs waiting in the reaction scheduler.")
+
+async def run_bot(token: str):
+    guild_config.open()
+    state.open()
+    for scope, recent, _ in state.items("selection"):
+        selector.seed(scope, recent)
+    restored = _restore_autoresponder_cooldowns() + restore_command_cooldowns(bot, state)
+    logger.info(f"Restored {restored} running cooldown(s)")
+    state.start()
+    announcement_scheduler.open()
+    announcement_scheduler.start(ready=bot.wait_until_ready)
+    if LOOP_DEBUG:
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = LOOP_LAG_THRESHOLD_SECONDS
+    loop_watchdog.start()
+    cards.start()
+    try:
+        # launcher.py and Render stop the bot with SIGTERM; close as on Ctrl+C so the cleanup below runs.
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: asyncio.ensure_future(bot.close()))
+    except NotImplementedError:  # Windows
+        pass
+    async with bot:
+        if WEB_SERVER == "aiohttp":
+            await health_server.start()
+        try:
+            await bot.start(token)
+        finally:
+            # Card workers first: they're separate processes, and shouldn't outlive us if a later close fails.
+            await cards.close()
+            await member_loader.close()
+            await loop_watchdog.close()
+            await announcement_scheduler.close()
+            await animations.close()
+            await reaction_scheduler.close()
+            await welcome_batcher.close()
+            await goodbye_batcher.close()
+            await health_server.stop()
+            await state.close()
+            guild_config.close()
+
+
+def main():
+    if DISCORD_API_BASE:
+        from fake_discord import point_client_at
+        point_client_at(DISCORD_API_BASE)
+
+    if WEB_SERVER == "flask":
+        Thread(target=run_flask_fallback, args=(WEB_PORT,), daemon=True).start()
+
+    token = os.getenv("DISCORD_TOKEN")
+    if not token:
+        raise RuntimeError("DISCORD_TOKEN not found! Set it in Render Environment Variables.")
+
+    try:
+        asyncio.run(run_bot(token))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger("sabaw_bot.batcher")
+
+SendOne = Callable[[Any], Awaitable[None]]
+SendMany = Callable[[List[Any], int], Awaitable[None]]
+
+
+class _Window:
+    __slots__ = ("items", "overflow", "task")
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.overflow = 0
+        self.task: Optional[asyncio.Task] = None
+
+
+class Coalescer:
+    """Merges bursts of events per key into one message per window.
+
+    The first event after a quiet spell goes out on its own right away, so
+    light traffic looks exactly like before. It also opens a window: anything
+    else for the same key in the next `window` seconds is held, then flushed
+    as one `send_many(items, overflow)` call (or `send_one` if only one
+    arrived). Windows keep rolling while events keep coming.
+
+    Backpressure: at most `max_items` are held per window, the rest are only
+    counted in `overflow`. Flushes for a key never overlap, so a slow,
+    rate-limited send just makes the next batch bigger instead of queueing
+    more sends behind it.
+    """
+
+    def __init__(self, send_one: SendOne, send_many: SendMany, window: float = 3.0,
+                 max_items: int = 25, name: str = "batch", metrics=None):
+        self.send_one = send_one
+        self.send_many = send_many
+        self.window = window
+        self.max_items = max_items
+        self.name = name
+        self.metrics = metrics
+        self._windows: Dict[Hashable, _Window] = {}
+
+    @property
+    def pending(self) -> int:
+        return sum(len(w.items) + w.overflow for w in self._windows.values())
+
+    async def push(self, key: Hashable, item: Any) -> None:
+        if self.window <= 0:
+            await self._send_one(item)
+            return
+
+        w = self._windows.get(key)
+        if w is not None:
+            if len(w.items) < self.max_items:
+                w.items.append(item)
+            else:
+                w.overflow += 1
+            return
+
+        w = self._windows[key] = _Window()
+        w.task = asyncio.create_task(self._run(key, w), name=f"{self.name}-{key}")
+        await self._send_one(item)
+
+    async def _send_one(self, item: Any) -> None:
+        self._count("single")
+        await self.send_one(item)
+
+    async def _run(self, key: Hashable, w: _Window) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.window)
+                if not w.items:
+                    return
+                items, overflow = w.items, w.overflow
+                w.items, w.overflow = [], 0
+                try:
+                    if len(items) == 1 and not overflow:
+                        await self._send_one(items[0])
+                    else:
+                        self._count("batch")
+                        await self.send_many(items, overflow)
+                except Exception:
+                    logger.exception(f"{self.name}: flush of {len(items) + overflow} events failed")
+        finally:
+            if self._windows.get(key) is w:
+                del self._windows[key]
+
+    def _count(self, mode: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("sabaw_coalesced_sends_total", (("batcher", self.name), ("mode", mode)),
+                             help="Messages sent by event coalescers, single vs merged.")
+
+    async def close(self) -> None:
+        tasks = [w.task for w in self._windows.values() if w.task is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
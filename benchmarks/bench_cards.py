@@ -0,0 +1,129 @@
+"""Welcome cards in a join wave: rendering on the event loop vs in CardRenderer's process pool.
+
+For each setup it renders one card per joining member (distinct avatars,
+so every card is a miss) and reports cards per second and the worst
+event-loop stall seen by a 10ms ticker while the wave is in flight. A
+second wave of the same members shows the LRU hit path.
+
+On a single CPU the workers and the loop still share one core, so the pool
+can't raise throughput there and stalls only shrink as far as the OS
+scheduler lets the loop back in; the gap opens up with two or more cores.
+
+Run from the repo root:  python -m benchmarks.bench_cards [--members 200] [--workers 1,2,4]
+"""
+import io
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import List, Optional
+
+from PIL import Image
+
+from cards import CardRenderer, CardSource, render_card
+from fake_discord import write_sample_banner
+
+LAYOUT = {"avatar": [0.5, 0.42, 0.42], "name": [0.5, 0.86, 0.09], "text": "welcome, {name}!"}
+
+
+class _Avatar:
+    def __init__(self, key: str, data: bytes):
+        self.key = key
+        self._data = data
+
+    def replace(self, **kwargs) -> "_Avatar":
+        return self
+
+    async def read(self) -> bytes:
+        return self._data
+
+
+class _Member:
+    """Just what CardRenderer.render reads off a discord.Member."""
+
+    def __init__(self, id: int, avatar: bytes):
+        self.id = id
+        self.display_name = f"tambay_{id}"
+        self.display_avatar = _Avatar(f"a{id}", avatar)
+
+
+def _avatars(n: int) -> List[bytes]:
+    out = []
+    for i in range(n):
+        buf = io.BytesIO()
+        Image.new("RGB", (256, 256), ((i * 37) % 256, (i * 91) % 256, (i * 53) % 256)).save(buf, "PNG")
+        out.append(buf.getvalue())
+    return out
+
+
+class _LagProbe:
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.worst = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.worst = max(self.worst, loop.time() - started - self.interval)
+
+    def __enter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+async def wave_inline(banner: str, members: List[_Member]) -> tuple:
+    started = time.perf_counter()
+    with _LagProbe() as probe:
+        for m in members:
+            render_card(banner, LAYOUT, await m.display_avatar.read(), m.display_name)
+            await asyncio.sleep(0)
+    return len(members) / (time.perf_counter() - started), probe.worst
+
+
+async def wave_pool(renderer: CardRenderer, members: List[_Member]) -> tuple:
+    started = time.perf_counter()
+    with _LagProbe() as probe:
+        cards = await asyncio.gather(*(renderer.render("welcome", m) for m in members))
+    assert all(cards), "a card failed to render"
+    return len(members) / (time.perf_counter() - started), probe.worst
+
+
+async def main(members: int, workers: List[int]) -> None:
+    tmp = tempfile.mkdtemp(prefix="bench-cards-")
+    banner = os.path.join(tmp, "welcome.png")
+    write_sample_banner(banner)
+    people = [_Member(i, a) for i, a in enumerate(_avatars(members))]
+    render_card(banner, LAYOUT, await people[0].display_avatar.read(), "warmup")  # decode the banner once here too
+
+    print(f"join wave of {members} members, {os.cpu_count()} CPU(s)")
+    print(f"{'setup':<22} {'cards/s':>9} {'worst loop stall':>18}")
+    rate, lag = await wave_inline(banner, people)
+    print(f"{'inline (on the loop)':<22} {rate:>9.1f} {lag * 1000:>15.1f} ms")
+
+    for n in workers:
+        renderer = CardRenderer({"welcome": CardSource("welcome", "unused", LAYOUT)}, asset_dir=tmp,
+                                cache_dir=os.path.join(tmp, "cache"), workers=n, cache_bytes=256 * 2**20)
+        await renderer.load()
+        # Start every worker and let each decode the banner before timing.
+        await asyncio.gather(*(renderer.render("welcome", _Member(-i - 1, people[0].display_avatar._data))
+                               for i in range(n * 2)))
+        rate, lag = await wave_pool(renderer, people)
+        print(f"{f'pool, {n} worker(s)':<22} {rate:>9.1f} {lag * 1000:>15.1f} ms")
+        rate, lag = await wave_pool(renderer, people)
+        print(f"{f'  same wave, LRU hits':<22} {rate:>9.0f} {lag * 1000:>15.1f} ms")
+        await renderer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--workers", default="1,2,4", help="pool sizes to try, comma separated")
+    args = parser.parse_args()
+    asyncio.run(main(args.members, [int(w) for w in args.workers.split(",")]))
@@ -0,0 +1,81 @@
+"""Autoresponder keyword check: `any(k in content ...)` vs KeywordMatcher.
+
+Timed over all of MESSAGES and over QUIET, the keyword-free chat among them.
+Small keyword sets only beat any() on QUIET: the matcher's substring
+prefilter rejects those outright, while messages holding a keyword inside a
+word ("mission", "helpful") go on to the regex's word-boundary check, which
+any() doesn't make.
+
+Run from the repo root:  python -m benchmarks.bench_matcher
+"""
+import random
+import string
+import timeit
+
+from matcher import KeywordMatcher
+
+BASE_KEYWORDS = [
+    "im bored", "i'm bored", "bored", "pagod", "i'm tired", "tired",
+    "miss", "sleep", "gutom", "hungry", "help", "sos",
+]
+
+MESSAGES = [
+    "ghorl 5am na, one more game daw pero ang lag ng server ko ngayon",
+    "akala ko clutch moment... turns out spectator mode agad. diff daw? bro",
+    "on a mission to find the helpful teammate who actually plants the spike",
+    "vc na pero di ako magsasalita, presence lang po 🫡🍜✨ ⋆ ˙ ⟡ .ᐟ",
+    "i'm tired of losing pistol rounds honestly",
+    "wala lang, nag-join ako for vibes not conversations " * 8,
+    # Ordinary chat with no keyword in it, even inside a word: most messages look like this (QUIET).
+    "sino online? tara ranked later pag tapos ng klase ko",
+    "grabe yung ulan dito sa amin, baha na naman sa kanto",
+    "lf 2 more for customs, need duelist and smokes, join vc",
+    "nakakatawa yung clip mo kanina HAHAHA pa-upload sa highlights",
+]
+
+
+def make_keywords(n: int, rng: random.Random) -> list:
+    words = list(BASE_KEYWORDS)
+    while len(words) < n:
+        size = rng.randint(4, 10)
+        words.append("".join(rng.choice(string.ascii_lowercase) for _ in range(size)))
+    return words[:n]
+
+
+QUIET = MESSAGES[-4:]
+
+
+def bench(n: int, messages: list, number: int = 2000) -> tuple:
+    rng = random.Random(n)
+    keywords = make_keywords(n, rng)
+    matcher = KeywordMatcher(keywords)
+    messages = [m.lower() for m in messages]
+
+    def scan():
+        for content in messages:
+            any(k in content for k in keywords)
+
+    def compiled():
+        for content in messages:
+            matcher.search(content)
+
+    t_scan = min(timeit.repeat(scan, number=number, repeat=3))
+    t_compiled = min(timeit.repeat(compiled, number=number, repeat=3))
+    per_msg = number * len(messages)
+    return t_scan / per_msg * 1e6, t_compiled / per_msg * 1e6
+
+
+def main():
+    print(f"{'':>9} {'all messages (us/msg)':^30} {'keyword-free chat (us/msg)':^30}")
+    print(f"{'keywords':>9} {'any()':>9} {'matcher':>9} {'speedup':>9} {'any()':>9} {'matcher':>9} {'speedup':>9}")
+    for n in (10, 12, 24, 48, 100, 1000):
+        number = 2000 if n < 1000 else 200
+        row = []
+        for messages in (MESSAGES, QUIET):
+            t_scan, t_compiled = bench(n, messages, number)
+            row.append(f"{t_scan:>9.2f} {t_compiled:>9.2f} {t_scan / t_compiled:>8.1f}x")
+        print(f"{n:>9} " + " ".join(row))
+
+
+if __name__ == "__main__":
+    main()
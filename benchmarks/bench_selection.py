@@ -0,0 +1,39 @@
+"""Line selection: filtered-copy `random.choice` vs SelectionEngine shuffle bags.
+
+Timing only; the bag guarantees are covered by tests/test_selection.py.
+
+Run from the repo root:  python -m benchmarks.bench_selection
+"""
+import random
+import timeit
+
+from selection import SelectionEngine
+
+
+def bench(n: int, number: int = 20_000) -> tuple:
+    lines = tuple(f"line {i}" for i in range(n))
+    last = [None]
+
+    def filtered():
+        choices = [x for x in lines if x != last[0]] or lines
+        last[0] = random.choice(choices)
+
+    engine = SelectionEngine(window=3)
+
+    def bagged():
+        engine.draw("guild:1", lines)
+
+    t_filtered = min(timeit.repeat(filtered, number=number, repeat=3))
+    t_bag = min(timeit.repeat(bagged, number=number, repeat=3))
+    return t_filtered / number * 1e6, t_bag / number * 1e6
+
+
+def main():
+    print(f"{'lines':>6} {'filtered us/pick':>17} {'bag us/pick':>12} {'speedup':>8}")
+    for n in (30, 300, 3000):
+        t_filtered, t_bag = bench(n)
+        print(f"{n:>6} {t_filtered:>17.2f} {t_bag:>12.2f} {t_filtered / t_bag:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
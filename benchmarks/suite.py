@@ -0,0 +1,184 @@
+"""Micro-benchmarks for the pure functions on the event path, with saved baselines.
+
+    python -m benchmarks.suite                   # run, compare against the baseline if there is one
+    python -m benchmarks.suite --save            # run and make this the new baseline
+    python -m benchmarks.suite -k embed -k pick  # only benchmarks whose name contains "embed" or "pick"
+
+Results are per call, best of `--repeat` runs. A benchmark more than
+`--threshold` (default 20%) slower than its baseline is flagged and the exit
+status is 1, so this can gate a CI job. Baselines are machine-specific and
+live in benchmarks/baseline.json, which is not checked in.
+"""
+import os
+import sys
+import json
+import random
+import string
+import asyncio
+import argparse
+import platform
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+
+# Titles and bodies in the style the bot actually sends.
+UNICODE_TITLE = "⋆ ˙ ⟡ .ᐟ 🍜✨ sabaw night announcement ⋆ ˙ ⟡ .ᐟ 🫡🍜✨"
+LONG_CHAT = ("ghorl 5am na, one more game daw pero ang lag ng server ko ngayon 🫠 "
+             "akala ko clutch moment... turns out spectator mode agad. diff daw? bro ") * 12
+
+Bench = Tuple[Callable[[], None], int]  # (one call, calls per timing run)
+
+
+def _keywords(n: int, rng: random.Random) -> List[str]:
+    import app
+    words = list(app.AUTORESPONDER_KEYWORDS)
+    while len(words) < n:
+        words.append("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))))
+    return words[:n]
+
+
+def build_benchmarks() -> Dict[str, Bench]:
+    """name -> (callable, number). Imports app lazily so `--help` stays fast."""
+    import app
+    from matcher import KeywordMatcher
+    from member_index import SamplePool
+
+    rng = random.Random(17)
+    benches: Dict[str, Bench] = {}
+
+    ann_full = f"🍜 ✨ 🫡 | {UNICODE_TITLE} | {LONG_CHAT} | https://cdn.example.com/banner.png"
+    benches["parse_announcement.full"] = (lambda: app.parse_announcement_input(ann_full), 20_000)
+    benches["parse_announcement.plain"] = (lambda: app.parse_announcement_input(LONG_CHAT), 20_000)
+
+    lowered = LONG_CHAT.lower()
+    for n in (len(app.AUTORESPONDER_KEYWORDS), 1000):
+        matcher = KeywordMatcher(_keywords(n, rng))
+        benches[f"autoresponder.match.{n}kw"] = (lambda m=matcher: m.search(lowered), 5_000)
+
+    # _can_autorespond reads the running loop's clock, so give it one.
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    users = [rng.getrandbits(60) for _ in range(50_000)]
+    it = iter(range(10**12))
+
+    # Every call gets a channel and guild of its own, so this times the user cooldown and an accepted
+    # autoresponse rather than the channel / guild budgets refusing. Users come back every 50k calls,
+    # long after the 10k-user cooldown table has evicted them, so they're accepted again too.
+    def spread(ids=iter(range(1, 10**12))):
+        i = next(ids)
+        return app._can_autorespond(users[i % len(users)], i, i)
+    accepted = sum(spread() for _ in range(5_000))
+    assert accepted == 5_000, f"autoresponder.cooldown.50k_users accepted {accepted}/5000; it'd time refusals"
+    benches["autoresponder.cooldown.50k_users"] = (spread, 50_000)
+    # One busy channel: almost everything is refused by the channel budget after the user check.
+    benches["autoresponder.budget.hot_channel"] = (lambda: app._can_autorespond(users[next(it) % len(users)], 1, 1), 50_000)
+
+    welcome = app.embed_templates["welcome"]
+    batch = app.embed_templates["welcome_batch"]
+    mentions = [f"<@{rng.getrandbits(60)}>" for _ in range(25)]
+    benches["embed.welcome"] = (lambda: welcome.render(mention="<@1234567890123>", roles_channel_id=1), 10_000)
+    benches["embed.welcome_batch.25"] = (
+        lambda: batch.render(mentions=app._human_list(mentions, 40), roles_channel_id=1), 10_000)
+    boosters = [f"<@{rng.getrandbits(60)}>" for _ in range(300)]
+    benches["embed.boosters.300"] = (
+        lambda: app.embed_templates["boosters"].render(description=app._booster_description(boosters)), 2_000)
+
+    benches["pick.sabaw.per_guild"] = (lambda: app._pick(f"sabaw.lines:{rng.randrange(50)}", "sabaw", "lines"), 20_000)
+    benches["pick.roast.per_user"] = (
+        lambda: app._pick(f"roast:{rng.randrange(5000)}", "roast", mention="<@1234567890123>"), 20_000)
+    benches["pick.goodbye.content_render"] = (lambda: app.content_library.render("goodbye", name="tambay"), 20_000)
+
+    pool = SamplePool()
+    for uid in range(200_000):
+        pool.add(uid)
+    benches["members.sample.200k"] = (pool.sample, 100_000)
+
+    def churn(ids=iter(range(200_000, 10**12))):
+        uid = next(ids)
+        pool.add(uid)
+        pool.discard(uid - 100_000)
+    benches["members.churn.200k"] = (churn, 100_000)
+    return benches
+
+
+def run(benches: Dict[str, Bench], repeat: int) -> Dict[str, float]:
+    """name -> seconds per call (best of `repeat`)."""
+    results = {}
+    for name, (func, number) in benches.items():
+        func()  # warm caches, lazy loads and bags
+        results[name] = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    return results
+
+
+def load_baseline(path: str) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path: str, results: Dict[str, float]) -> None:
+    data = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def _fmt(seconds: float) -> str:
+    ns = seconds * 1e9
+    return f"{ns / 1000:.2f} us" if ns >= 1000 else f"{ns:.0f} ns"
+
+
+def report(results: Dict[str, float], baseline: Optional[dict], threshold: float) -> List[str]:
+    """Print the table. Returns the names that regressed past `threshold`."""
+    base = (baseline or {}).get("results", {})
+    regressed = []
+    print(f"{'benchmark':<36} {'per call':>11} {'baseline':>11} {'change':>8}")
+    for name, value in results.items():
+        old = base.get(name)
+        if old:
+            change = value / old - 1
+            flag = ""
+            if change > threshold:
+                regressed.append(name)
+                flag = "  REGRESSION"
+            print(f"{name:<36} {_fmt(value):>11} {_fmt(old):>11} {change:>+7.0%}{flag}")
+        else:
+            print(f"{name:<36} {_fmt(value):>11} {'-':>11} {'new':>8}")
+    if baseline and baseline.get("python") != platform.python_version():
+        print(f"\nnote: baseline was recorded on Python {baseline.get('python')}, this is {platform.python_version()}")
+    return regressed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filters", action="append", default=[], help="run only names containing this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.20, help="flag slowdowns beyond this fraction")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    benches = build_benchmarks()
+    if args.filters:
+        benches = {n: b for n, b in benches.items() if any(f in n for f in args.filters)}
+    results = run(benches, args.repeat)
+
+    baseline = load_baseline(args.baseline)
+    regressed = report(results, baseline, args.threshold)
+    if args.save:
+        merged = dict((baseline or {}).get("results", {})) if args.filters else {}
+        merged.update(results)
+        save_baseline(args.baseline, merged)
+        print(f"\nsaved baseline to {args.baseline}")
+        return 0
+    if regressed:
+        print(f"\n{len(regressed)} benchmark(s) regressed more than {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+import discord
+from discord.ext import commands
+
+logger = logging.getLogger("sabaw_bot.cache")
+
+CHUNK_MODES = ("startup", "background", "lazy")
+
+# name -> (chunk mode, max_messages)
+PROFILES: Dict[str, tuple] = {
+    # discord.py defaults: every member list downloaded before on_ready, 1000 messages kept.
+    "full": ("startup", 1000),
+    # Ready as soon as guilds arrive; member lists fill in afterwards. No handler reads cached messages.
+    "lean": ("background", None),
+    # Member lists are only downloaded for guilds where a command needs them.
+    "lazy": ("lazy", None),
+}
+
+
+def _parse_max_messages(value: str) -> Optional[int]:
+    value = value.strip().lower()
+    return None if value in ("", "0", "none", "off") else int(value)
+
+
+def _parse_member_cache(value: str) -> discord.MemberCacheFlags:
+    """"all", "none", or a comma list of MemberCacheFlags names, e.g. "joined,voice"."""
+    value = value.strip().lower()
+    if value == "all":
+        return discord.MemberCacheFlags.all()
+    if value == "none":
+        return discord.MemberCacheFlags.none()
+    flags = discord.MemberCacheFlags.none()
+    for name in filter(None, (part.strip() for part in value.split(","))):
+        if name not in discord.MemberCacheFlags.VALID_FLAGS:
+            raise ValueError(f"unknown member cache flag {name!r}")
+        setattr(flags, name, True)
+    return flags
+
+
+class CacheProfile:
+    """How much of Discord the bot mirrors in memory, and when it downloads member lists.
+
+    Picked with CACHE_PROFILE (full / lean / lazy); CHUNK_GUILDS, MAX_MESSAGES
+    and MEMBER_CACHE override single knobs of the chosen profile.
+    """
+
+    def __init__(self, name: str, chunk_mode: str, max_messages: Optional[int],
+                 member_cache_flags: discord.MemberCacheFlags):
+        if chunk_mode not in CHUNK_MODES:
+            raise ValueError(f"CHUNK_GUILDS must be one of {', '.join(CHUNK_MODES)}")
+        self.name = name
+        self.chunk_mode = chunk_mode
+        self.max_messages = max_messages
+        self.member_cache_flags = member_cache_flags
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] = os.environ) -> "CacheProfile":
+        name = env.get("CACHE_PROFILE", "full").lower()
+        if name not in PROFILES:
+            raise ValueError(f"CACHE_PROFILE must be one of {', '.join(PROFILES)}")
+        chunk_mode, max_messages = PROFILES[name]
+        if env.get("CHUNK_GUILDS"):
+            chunk_mode = env["CHUNK_GUILDS"].lower()
+        if env.get("MAX_MESSAGES") is not None:
+            max_messages = _parse_max_messages(env["MAX_MESSAGES"])
+        flags = _parse_member_cache(env.get("MEMBER_CACHE", "all"))
+        return cls(name, chunk_mode, max_messages, flags)
+
+    def client_kwargs(self) -> Dict[str, Any]:
+        return {
+            "chunk_guilds_at_startup": self.chunk_mode == "startup",
+            "max_messages": self.max_messages,
+            "member_cache_flags": self.member_cache_flags,
+        }
+
+    def describe(self) -> str:
+        flags = ",".join(name for name, on in self.member_cache_flags if on) or "none"
+        return f"profile {self.name}, chunking {self.chunk_mode}, max_messages {self.max_messages}, member cache {flags}"
+
+
+class MemberLoader:
+    """Downloads a guild's member list when it's first needed instead of at startup.
+
+    `ensure(guild)` chunks the guild once (concurrent callers share the same
+    request) and then calls `on_chunked(guild)` so member indexes can be
+    rebuilt from the complete list. Once is tracked here rather than by
+    `guild.chunked`, which a narrow MEMBER_CACHE lets drift back to False
+    as members are dropped from the cache, and which would otherwise send a
+    whole-guild member request on every call. In "background" mode `start()` also walks
+    every guild after ready, one at a time, so the lists fill in without
+    holding up on_ready. In "startup" mode discord.py already did it.
+    """
+
+    def __init__(self, mode: str, on_chunked: Optional[Callable[[discord.Guild], None]] = None,
+                 pause: float = 0.5):
+        self.mode = mode
+        self.on_chunked = on_chunked
+        self.pause = pause
+        self._inflight: Dict[int, "asyncio.Future[None]"] = {}
+        # guild id -> id() of the Guild object chunked. A reconnect replaces the object (and empties its
+        # members), which then gets chunked again; Guild can't be weakly referenced.
+        self._chunked: Dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def loaded(self, guild: discord.Guild) -> bool:
+        return guild.chunked or self._chunked.get(guild.id) == id(guild)
+
+    async def ensure(self, guild: discord.Guild) -> None:
+        if self.loaded(guild):
+            return
+        pending = self._inflight.get(guild.id)
+        if pending is None:
+            pending = self._inflight[guild.id] = asyncio.ensure_future(self._chunk(guild))
+            pending.add_done_callback(lambda _: self._inflight.pop(guild.id, None))
+        await asyncio.shield(pending)
+
+    async def _chunk(self, guild: discord.Guild) -> None:
+        started = time.perf_counter()
+        await guild.chunk(cache=True)
+        self._chunked[guild.id] = id(guild)
+        logger.info(f"Chunked {guild.name}: {len(guild.members)} member(s) in {time.perf_counter() - started:.2f}s")
+        if self.on_chunked is not None:
+            self.on_chunked(guild)
+
+    async def member(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        """Cached member, or a single REST fetch when the member list isn't loaded."""
+        member = guild.get_member(user_id)
+        if member is not None or guild.chunked:
+            return member
+        try:
+            return await guild.fetch_member(user_id)
+        except discord.NotFound:
+            return None
+
+    def start(self, bot: commands.Bot, done: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        if self.mode == "background" and self._task is None:
+            self._task = asyncio.create_task(self._backfill(bot, done), name="member-backfill")
+
+    async def _backfill(self, bot: commands.Bot, done) -> None:
+        for guild in list(bot.guilds):
+            if self.loaded(guild):
+                continue
+            try:
+                await self.ensure(guild)
+            except Exception:
+                logger.exception(f"Background chunk of {guild.name} failed.")
+            await asyncio.sleep(self.pause)
+        if done is not None:
+            await done()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """Current RSS from /proc on Linux, else peak RSS from getrusage; None if neither works."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+class StartupReport:
+    """Time from process start to first on_ready (and to full member lists), plus RSS at each."""
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.ready_after: Optional[float] = None
+        self.chunked_after: Optional[float] = None
+        self.rss_at_ready: Optional[int] = None
+        self.rss_at_chunked: Optional[int] = None
+
+    @staticmethod
+    def _mb(value: Optional[int]) -> str:
+        return f"{value / 2**20:.1f} MB" if value is not None else "n/a"
+
+    def ready(self, bot: commands.Bot, profile: CacheProfile) -> bool:
+        """Record the first on_ready. Returns False on later (reconnect) calls."""
+        if self.ready_after is not None:
+            return False
+        self.ready_after = time.perf_counter() - self.started
+        self.rss_at_ready = resident_memory_bytes()
+        chunked = sum(1 for g in bot.guilds if g.chunked)
+        logger.info(f"Startup: ready in {self.ready_after:.2f}s with {len(bot.guilds)} guild(s) "
+                    f"({chunked} chunked), {len(bot.users)} user(s) cached, RSS {self._mb(self.rss_at_ready)} "
+                    f"[{profile.describe()}]")
+        if chunked == len(bot.guilds):
+            self.chunked_after, self.rss_at_chunked = self.ready_after, self.rss_at_ready
+        return True
+
+    def chunked(self, bot: commands.Bot) -> None:
+        self.chunked_after = time.perf_counter() - self.started
+        self.rss_at_chunked = resident_memory_bytes()
+        logger.info(f"Startup: all member lists loaded after {self.chunked_after:.2f}s, "
+                    f"{len(bot.users)} user(s) cached, RSS {self._mb(self.rss_at_chunked)}")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"ready_after_s": self.ready_after, "chunked_after_s": self.chunked_after,
+                "rss_at_ready": self.rss_at_ready, "rss_at_chunked": self.rss_at_chunked}
@@ -0,0 +1,79 @@
+"""Card rendering that runs inside CardRenderer's worker processes.
+
+Only Pillow is imported here, so a spawned worker doesn't pull in discord.py,
+aiohttp or the bot.
+"""
+import io
+import signal
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageOps
+except ImportError:  # cards are optional; embeds fall back to the banner URL
+    Image = None
+
+# banner path -> decoded, resized banner. Each worker decodes a banner once and keeps it.
+_banners: Dict[str, "Image.Image"] = {}
+_fonts: Dict[Tuple[Optional[str], int], Any] = {}
+
+
+def ignore_interrupts() -> None:
+    """Pool initializer: Ctrl+C goes to the whole process group, but only the bot should act on it."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _banner(path: str, max_width: int) -> "Image.Image":
+    banner = _banners.get(path)
+    if banner is None:
+        with Image.open(path) as src:
+            banner = ImageOps.exif_transpose(src).convert("RGB")
+        if banner.width > max_width:
+            banner = banner.resize((max_width, round(banner.height * max_width / banner.width)), Image.LANCZOS)
+        _banners[path] = banner
+    return banner
+
+
+def _font(path: Optional[str], size: int):
+    font = _fonts.get((path, size))
+    if font is None:
+        font = ImageFont.truetype(path, size) if path else ImageFont.load_default(size)
+        _fonts[(path, size)] = font
+    return font
+
+
+def render_card(banner_path: str, layout: Optional[Dict[str, Any]], avatar: Optional[bytes], name: Optional[str],
+                font_path: Optional[str] = None, max_width: int = 1024, quality: int = 88) -> bytes:
+    """JPEG bytes: the banner, plus a round avatar and a name line when `layout` and a member are given.
+
+    `layout` positions are fractions of the banner: "avatar" is [centre x, centre y, diameter / height],
+    "name" is [centre x, centre y, font size / height].
+    """
+    card = _banner(banner_path, max_width)
+    if layout and (avatar or name):
+        card = card.copy()
+        h = card.height
+        if avatar and "avatar" in layout:
+            cx, cy, size = layout["avatar"]
+            d = max(8, round(size * h))
+            with Image.open(io.BytesIO(avatar)) as src:
+                face = ImageOps.fit(src.convert("RGB"), (d, d), Image.LANCZOS)
+            mask = Image.new("L", (d * 4, d * 4), 0)
+            ImageDraw.Draw(mask).ellipse((0, 0, d * 4 - 1, d * 4 - 1), fill=255)
+            mask = mask.resize((d, d), Image.LANCZOS)  # drawn 4x and scaled down for a smooth edge
+            ring = max(2, d // 24)
+            ImageDraw.Draw(card).ellipse((round(cx * card.width) - d // 2 - ring, round(cy * h) - d // 2 - ring,
+                                          round(cx * card.width) + d // 2 + ring, round(cy * h) + d // 2 + ring),
+                                         fill=layout.get("ring", "#FFFFFF"))
+            card.paste(face, (round(cx * card.width) - d // 2, round(cy * h) - d // 2), mask)
+        if name and "name" in layout:
+            cx, cy, size = layout["name"]
+            text = layout.get("text", "{name}").format(name=name)
+            px = max(8, round(size * h))
+            while px > 8 and _font(font_path, px).getlength(text) > card.width * 0.9:
+                px -= 2  # long names shrink instead of running off the banner
+            ImageDraw.Draw(card).text((round(cx * card.width), round(cy * h)), text, anchor="mm",
+                                      font=_font(font_path, px), fill=layout.get("color", "#FFFFFF"),
+                                      stroke_width=max(1, round(px / 14)), stroke_fill="#000000")
+    out = io.BytesIO()
+    card.save(out, "JPEG", quality=quality, optimize=False)
+    return out.getvalue()
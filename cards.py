@@ -0,0 +1,217 @@
+import io
+import os
+import time
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+import aiohttp
+import discord
+
+from card_worker import Image, ignore_interrupts, render_card
+from embeds import EmbedRegistry
+
+logger = logging.getLogger("sabaw_bot.cards")
+
+RENDER_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class CardSource:
+    """A template's banner on local disk, and the layout drawn over it."""
+
+    __slots__ = ("name", "url", "layout", "path", "version")
+
+    def __init__(self, name: str, url: str, layout: Optional[Dict[str, Any]]):
+        self.name = name
+        self.url = url
+        self.layout = layout
+        self.path: Optional[str] = None
+        self.version: Optional[str] = None
+
+
+class CardRenderer:
+    """Welcome / boost / goodbye images rendered by the bot instead of hot-linked from Drive.
+
+    `load()` makes every template banner local once: a file in `asset_dir`
+    named after the template wins, otherwise the template's `image` URL is
+    downloaded into `cache_dir` (and reused on the next start). Rendering is
+    CPU work, so it happens in a process pool; each worker decodes a banner
+    the first time it needs it and keeps it. Results go into an LRU of
+    encoded images, at most `cache_bytes` big, keyed by template version,
+    member, avatar and name, so a changed banner, layout, avatar or name gets
+    a fresh card. Concurrent requests for the same card share one render.
+
+    Anything that goes wrong returns None, and callers keep using the URL.
+    """
+
+    def __init__(self, sources: Dict[str, CardSource], asset_dir: str, cache_dir: str, workers: int = 2,
+                 cache_bytes: int = 32 * 2**20, font_path: Optional[str] = None, timeout: float = 10.0,
+                 metrics=None):
+        self.sources = sources
+        self.asset_dir = asset_dir
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.cache_bytes = cache_bytes
+        self.font_path = font_path
+        self.timeout = timeout
+        self.metrics = metrics
+        self._cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._cached_bytes = 0
+        self._inflight: Dict[tuple, "asyncio.Future[bytes]"] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._load_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_registry(cls, registry: EmbedRegistry, **kwargs) -> "CardRenderer":
+        """A source for every embed template that has a banner; templates with a "card" layout get personalised."""
+        sources = {}
+        for name in registry.names():
+            template = registry[name]
+            if template.image:
+                sources[name] = CardSource(name, template.image, template.card)
+        return cls(sources, **kwargs)
+
+    @property
+    def enabled(self) -> bool:
+        return self._pool is not None
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def cached_bytes(self) -> int:
+        return self._cached_bytes
+
+    def start(self) -> None:
+        """Load in the background; until it's done, `render()` returns None and embeds use their URLs."""
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self.load(), name="card-banners")
+
+    async def load(self) -> None:
+        if Image is None:
+            logger.warning("Pillow isn't installed; embeds keep their banner URLs.")
+            return
+        if not self.sources or self.workers <= 0:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            for source in self.sources.values():
+                try:
+                    await self._localise(session, source)
+                except Exception as e:
+                    logger.warning(f"No local banner for {source.name} ({e}); it keeps its URL.")
+        # Spawned, not forked: the bot has threads and a running loop that a forked child would inherit mid-flight.
+        # Workers only import card_worker (Pillow), and leave Ctrl+C to the bot, which shuts the pool down.
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=ignore_interrupts)
+        ready = sum(1 for s in self.sources.values() if s.path)
+        logger.info(f"Card renderer ready: {ready}/{len(self.sources)} banner(s) local, {self.workers} worker(s)")
+
+    async def _localise(self, session: aiohttp.ClientSession, source: CardSource) -> None:
+        for ext in (".png", ".jpg", ".jpeg", ".webp"):
+            path = os.path.join(self.asset_dir, source.name + ext)
+            if os.path.exists(path):
+                break
+        else:
+            path = os.path.join(self.cache_dir, hashlib.sha1(source.url.encode()).hexdigest()[:16] + ".img")
+            if not os.path.exists(path):
+                async with session.get(source.url) as resp:
+                    resp.raise_for_status()
+                    if not resp.content_type.startswith("image/"):
+                        raise ValueError(f"{source.url} served {resp.content_type}, not an image")
+                    data = await resp.read()
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read())
+        digest.update(repr(sorted((source.layout or {}).items())).encode())
+        source.path, source.version = path, digest.hexdigest()[:12]
+
+    async def close(self) -> None:
+        if self._load_task is not None:
+            self._load_task.cancel()
+            await asyncio.gather(self._load_task, return_exceptions=True)
+            self._load_task = None
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, True, cancel_futures=True)
+
+    # --- rendering ---
+    async def render(self, template: str, member: Optional[discord.abc.User] = None) -> Optional[bytes]:
+        """The card for `template`, personalised for `member` if the template has a layout. None to use the URL."""
+        source = self.sources.get(template)
+        if self._pool is None or source is None or source.path is None:
+            return None
+        personal = member is not None and source.layout is not None
+        name = member.display_name if personal else None
+        avatar_key = member.display_avatar.key if personal else None
+        key = (template, source.version, member.id if personal else None, avatar_key, name)
+
+        data = self._cache.get(key)
+        if data is not None:
+            self._cache.move_to_end(key)
+            self._count("hit")
+            return data
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            self._count("miss")
+            pending = self._inflight[key] = asyncio.ensure_future(
+                self._render(key, source, member if personal else None, name))
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        try:
+            data = await asyncio.wait_for(asyncio.shield(pending), self.timeout)
+        except Exception as e:
+            logger.warning(f"Card {template} failed ({type(e).__name__}: {e}); using the banner URL.")
+            self._count("error")
+            return None
+        return data
+
+    async def _render(self, key: tuple, source: CardSource, member: Optional[discord.abc.User],
+                      name: Optional[str]) -> bytes:
+        pool = self._pool
+        avatar = await member.display_avatar.replace(size=256, static_format="png").read() if member else None
+        if pool is None or self._pool is not pool:
+            # Closed during the download; run_in_executor(None, ...) would render on the bot's own threads.
+            raise RuntimeError("card renderer closed")
+        started = time.perf_counter()
+        data = await asyncio.get_running_loop().run_in_executor(
+            pool, render_card, source.path, source.layout, avatar, name, self.font_path)
+        if self.metrics is not None:
+            self.metrics.observe("sabaw_card_render_seconds", time.perf_counter() - started, (("template", source.name),),
+                                 help="Time to render one card in the process pool.", buckets=RENDER_BUCKETS)
+        # Cached here rather than by the caller, so a render that outlives its caller's timeout still counts.
+        self._remember(key, data)
+        return data
+
+    def _remember(self, key: tuple, data: bytes) -> None:
+        if key in self._cache or len(data) > self.cache_bytes:
+            return
+        self._cache[key] = data
+        self._cached_bytes += len(data)
+        while self._cached_bytes > self.cache_bytes:
+            _, old = self._cache.popitem(last=False)
+            self._cached_bytes -= len(old)
+
+    def _count(self, outcome: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("sabaw_cards_total", (("outcome", outcome),),
+                             help="Card lookups: LRU hits, renders (misses) and failures.")
+
+    def attach(self, embed: discord.Embed, template: str, data: Optional[bytes]) -> Optional[discord.File]:
+        """Point `embed` at the rendered card and return the file to send with it. None (embed untouched) if no card.
+
+        `embed` must be one built for this message, not a template's shared static embed.
+        """
+        if data is None:
+            return None
+        filename = f"{template}.jpg"
+        embed.set_image(url=f"attachment://{filename}")
+        return discord.File(io.BytesIO(data), filename=filename)
@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import random
+import string
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger("sabaw_bot.content")
+
+DEFAULT_CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "content")
+
+_formatter = string.Formatter()
+
+
+class LineTemplate:
+    """One corpus line, parsed at load time.
+
+    Lines without placeholders are stored already unescaped and returned
+    as-is; the rest are formatted only when they're the line that got picked.
+    """
+
+    __slots__ = ("text", "fields")
+
+    def __init__(self, raw: str):
+        fields = set()
+        for _, field, spec, conversion in _formatter.parse(raw):
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"unsupported placeholder {{{field}}} in {raw!r}")
+            fields.add(field)
+        self.fields: FrozenSet[str] = frozenset(fields)
+        self.text = raw if fields else raw.format()
+
+    def render(self, values: Dict[str, Any]) -> str:
+        return self.text.format_map(values) if self.fields else self.text
+
+    def __repr__(self) -> str:
+        return f"<LineTemplate {self.text[:30]!r}>"
+
+
+Corpus = Tuple[LineTemplate, ...]
+
+
+class ContentPack:
+    """One versioned JSON file of named corpora: {"version": N, "corpora": {name: [lines]}}."""
+
+    __slots__ = ("name", "path", "version", "mtime", "corpora")
+
+    def __init__(self, name: str, path: str, version: int, mtime: float, corpora: Dict[str, Corpus]):
+        self.name = name
+        self.path = path
+        self.version = version
+        self.mtime = mtime
+        self.corpora = corpora
+
+    @classmethod
+    def load(cls, name: str, path: str) -> "ContentPack":
+        mtime = os.stat(path).st_mtime
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        corpora = {}
+        for corpus, lines in data["corpora"].items():
+            if not lines:
+                raise ValueError(f"{path}: corpus {corpus!r} is empty")
+            try:
+                corpora[corpus] = tuple(LineTemplate(line) for line in lines)
+            except ValueError as e:
+                raise ValueError(f"{path}: corpus {corpus!r}: {e}") from None
+        return cls(name, path, int(data.get("version", 0)), mtime, corpora)
+
+    def __getitem__(self, corpus: str) -> Corpus:
+        return self.corpora[corpus]
+
+
+class ContentLibrary:
+    """Lazily loaded content packs from a directory, hot-reloaded on change.
+
+    A pack is read the first time something asks for it. After that its file
+    is stat'ed at most once per `check_interval` seconds; if it changed, the
+    new file is parsed in full and swapped in as one object, so readers see
+    either the old pack or the new one, never a mix. A pack that fails to
+    parse on reload is logged and the old one stays live.
+    """
+
+    def __init__(self, root: str = DEFAULT_CONTENT_DIR, check_interval: float = 5.0):
+        self.root = root
+        self.check_interval = check_interval
+        self._packs: Dict[str, ContentPack] = {}
+        self._checked: Dict[str, float] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, f"{name}.json")
+
+    def available(self) -> List[str]:
+        return sorted(f[:-5] for f in os.listdir(self.root) if f.endswith(".json"))
+
+    def loaded(self) -> Dict[str, int]:
+        return {name: pack.version for name, pack in sorted(self._packs.items())}
+
+    def pack(self, name: str) -> ContentPack:
+        pack = self._packs.get(name)
+        if pack is None:
+            pack = self._packs[name] = ContentPack.load(name, self._path(name))
+            self._checked[name] = time.monotonic()
+            logger.info(f"Loaded content pack {name} v{pack.version}")
+            return pack
+
+        now = time.monotonic()
+        if now - self._checked.get(name, 0.0) >= self.check_interval:
+            self._checked[name] = now
+            try:
+                changed = os.stat(pack.path).st_mtime != pack.mtime
+            except OSError:
+                changed = False
+            if changed:
+                pack = self._reload_one(name) or pack
+        return pack
+
+    def _reload_one(self, name: str) -> Optional[ContentPack]:
+        try:
+            fresh = ContentPack.load(name, self._path(name))
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Content pack {name} failed to reload, keeping the old one: {e}")
+            return None
+        old = self._packs.get(name)
+        self._packs[name] = fresh
+        self._checked[name] = time.monotonic()
+        logger.info(f"Reloaded content pack {name}: v{old.version if old else '?'} -> v{fresh.version}")
+        return fresh
+
+    def reload(self, name: Optional[str] = None) -> Dict[str, Optional[int]]:
+        """Force a reload of one pack, or of every loaded pack. Maps name -> new version (None on failure)."""
+        names = [name] if name else list(self._packs)
+        result = {}
+        for n in names:
+            fresh = self._reload_one(n)
+            result[n] = fresh.version if fresh else None
+        return result
+
+    def corpus(self, pack: str, corpus: str = "lines") -> Corpus:
+        return self.pack(pack)[corpus]
+
+    def render(self, pack: str, corpus: str = "lines", rng: random.Random = random, **values: Any) -> str:
+        """Pick one line at random and format only that one."""
+        return rng.choice(self.corpus(pack, corpus)).render(values)
@@ -0,0 +1,163 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+
+class CooldownStore:
+    """Per-key cooldown table with lazy TTL expiry and a hard LRU cap.
+
+    Keys are kept in the order they were last granted. Every grant uses the
+    same TTL with a monotonic clock, so that order is also expiry order:
+    expired entries are always at the front and get popped off as new grants
+    come in, without a sweeper task or a full scan.
+    """
+
+    __slots__ = ("ttl", "max_size", "_last", "evictions", "expirations")
+
+    def __init__(self, ttl: float, max_size: int = 10_000):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.ttl = ttl
+        self.max_size = max_size
+        self._last: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._last
+
+    def _expire(self, now: float) -> None:
+        last = self._last
+        cutoff = now - self.ttl
+        while last:
+            key, ts = next(iter(last.items()))
+            if ts > cutoff:
+                break
+            del last[key]
+            self.expirations += 1
+
+    def remaining(self, key: Hashable, now: float) -> float:
+        """Seconds left on `key`'s cooldown, 0.0 if it can fire now."""
+        ts = self._last.get(key)
+        if ts is None:
+            return 0.0
+        return max(0.0, self.ttl - (now - ts))
+
+    def try_acquire(self, key: Hashable, now: float) -> bool:
+        """Start `key`'s cooldown if it isn't running. Returns False while cooling down."""
+        self._expire(now)
+        last = self._last
+        ts = last.get(key)
+        if ts is not None and now - ts < self.ttl:
+            return False
+
+        last[key] = now
+        last.move_to_end(key)
+        while len(last) > self.max_size:
+            last.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    # ScopedLimiter level interface: a cooldown is a bucket of one token.
+    def allows(self, key: Hashable, now: float) -> bool:
+        return self.remaining(key, now) == 0.0
+
+    def take(self, key: Hashable, now: float) -> None:
+        self.try_acquire(key, now)
+
+    def restore(self, key: Hashable, remaining: float, now: float) -> None:
+        """Re-add a cooldown with `remaining` seconds left (e.g. loaded from disk).
+
+        Restore in ascending `remaining` order so the table stays in expiry order.
+        """
+        if remaining <= 0:
+            return
+        last = self._last
+        last[key] = now - (self.ttl - min(remaining, self.ttl))
+        last.move_to_end(key)
+        while len(last) > self.max_size:
+            last.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._last.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._last),
+            "max_size": self.max_size,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TokenBuckets:
+    """Per-key token buckets: bursts of up to `capacity`, refilled at `capacity / per` tokens a second.
+
+    Only keys that have spent tokens are stored, in last-spent order behind a
+    hard LRU cap like CooldownStore. A bucket that has refilled completely is
+    the same as no bucket, so those are dropped off the front as new spends
+    come in.
+    """
+
+    __slots__ = ("capacity", "rate", "max_size", "_buckets", "evictions")
+
+    def __init__(self, capacity: float, per: float, max_size: int = 10_000):
+        if capacity <= 0 or per <= 0:
+            raise ValueError("capacity and per must be positive")
+        self.capacity = float(capacity)
+        self.rate = capacity / per
+        self.max_size = max_size
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, at)
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def tokens(self, key: Hashable, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.capacity
+        return min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+
+    def allows(self, key: Hashable, now: float, cost: float = 1.0) -> bool:
+        return self.tokens(key, now) >= cost
+
+    def take(self, key: Hashable, now: float, cost: float = 1.0) -> None:
+        buckets = self._buckets
+        buckets[key] = (self.tokens(key, now) - cost, now)
+        buckets.move_to_end(key)
+        while buckets:
+            oldest = next(iter(buckets))
+            if len(buckets) > self.max_size:
+                self.evictions += 1
+            elif self.tokens(oldest, now) < self.capacity:
+                break
+            del buckets[oldest]
+
+
+class ScopedLimiter:
+    """All-or-nothing budget across nested scopes, e.g. user -> channel -> guild.
+
+    `acquire()` checks every level in order and only spends from all of them
+    when all allow it, so a reply refused by the guild budget doesn't burn
+    the user's cooldown. Levels are anything with `allows(key, now)` and
+    `take(key, now)` (TokenBuckets, CooldownStore). Refusals are counted by
+    the first level that refused.
+    """
+
+    def __init__(self, levels: Sequence[Tuple[str, object]]):
+        self.levels = list(levels)
+        self.refused: Dict[str, int] = {name: 0 for name, _ in self.levels}
+
+    def acquire(self, keys: Sequence[Hashable], now: float) -> Optional[str]:
+        """`keys` line up with the levels. Returns None if granted, else the refusing level's name."""
+        for (name, level), key in zip(self.levels, keys):
+            if not level.allows(key, now):
+                self.refused[name] += 1
+                return name
+        for (_, level), key in zip(self.levels, keys):
+            level.take(key, now)
+        return None
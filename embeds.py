@@ -0,0 +1,89 @@
+import os
+import json
+import string
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+
+DEFAULT_EMBEDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "embeds.json")
+
+_formatter = string.Formatter()
+
+
+def _has_placeholders(text: Optional[str]) -> bool:
+    return bool(text) and any(field is not None for _, field, _, _ in _formatter.parse(text))
+
+
+class EmbedTemplate:
+    """One embed with its static parts (colour, title, banner, footer, fields) parsed up front.
+
+    `render()` only fills the per-event placeholders into the description.
+    Templates without placeholders hand back the same prebuilt Embed every
+    time, so callers must not mutate what they get.
+    """
+
+    __slots__ = ("name", "title", "description", "colour", "image", "card", "footer", "fields", "strings", "_static")
+
+    def __init__(self, name: str, spec: Dict[str, Any], colour: discord.Colour):
+        self.name = name
+        self.title: Optional[str] = spec.get("title")
+        self.description: Optional[str] = spec.get("description")
+        self.colour = discord.Colour.from_str(spec["color"]) if "color" in spec else colour
+        self.image: Optional[str] = spec.get("image")
+        # Layout for a rendered card over `image` (see cards.render_card); None means banner only.
+        self.card: Optional[Dict[str, Any]] = spec.get("card")
+        self.footer: Optional[str] = spec.get("footer")
+        self.fields: Tuple[Tuple[str, str, bool], ...] = tuple(
+            (f["name"], f["value"], f.get("inline", True)) for f in spec.get("fields", ())
+        )
+        self.strings: Dict[str, str] = dict(spec.get("strings", {}))
+        self._static: Optional[discord.Embed] = None
+        if not _has_placeholders(self.description):
+            self._static = self._build(self.fill() if self.description else None)
+
+    def _build(self, description: Optional[str]) -> discord.Embed:
+        embed = discord.Embed(title=self.title, description=description, colour=self.colour)
+        if self.image:
+            embed.set_image(url=self.image)
+        if self.footer:
+            embed.set_footer(text=self.footer)
+        for name, value, inline in self.fields:
+            embed.add_field(name=name, value=value, inline=inline)
+        return embed
+
+    def fill(self, **values: Any) -> str:
+        """Just the description text, with placeholders filled."""
+        return (self.description or "").format_map(values)
+
+    def render(self, description: Optional[str] = None, **values: Any) -> discord.Embed:
+        """Embed for one event. `description` overrides the template's own text."""
+        if self._static is not None and description is None:
+            return self._static
+        if description is None:
+            description = self.fill(**values)
+        return self._build(description)
+
+
+class EmbedRegistry:
+    """Embed templates loaded once from a JSON data file (data/embeds.json)."""
+
+    def __init__(self, templates: Dict[str, EmbedTemplate], colour: discord.Colour):
+        self._templates = templates
+        self.colour = colour
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_EMBEDS_PATH) -> "EmbedRegistry":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        colour = discord.Colour.from_str(data.get("color", "#E75480"))
+        templates = {name: EmbedTemplate(name, spec, colour) for name, spec in data["templates"].items()}
+        return cls(templates, colour)
+
+    def __getitem__(self, name: str) -> EmbedTemplate:
+        return self._templates[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    def names(self) -> List[str]:
+        return sorted(self._templates)
@@ -0,0 +1,518 @@
+"""Local stand-in for Discord's REST API and gateway, for offline runs.
+
+Enough of the protocol for discord.py to log in, fetch the gateway, identify
+any number of shards and receive GUILD_CREATEs for synthetic guilds. Write
+routes (messages, reactions, roles, interaction callbacks) are accepted
+generically behind Discord-style rate limits: X-RateLimit-* headers on every
+response and 429s with retry_after once a bucket is spent. Every call is
+counted, and ids registered with `expect()` are timed to the first request
+that mentions them (see loadsim.py).
+
+    python -m fake_discord --port 9000 --guilds 8
+    DISCORD_API_BASE=http://127.0.0.1:9000 DISCORD_TOKEN=fake python main.py
+"""
+import io
+import re
+import json
+import hashlib
+import time
+import asyncio
+import logging
+import argparse
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from aiohttp import web, WSMsgType
+
+logger = logging.getLogger("sabaw_bot.fake_discord")
+
+API_VERSION = 10
+BOT_USER_ID = 100000000000000001
+
+_SNOWFLAKE = re.compile(r"\d{17,20}")
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+_TOKEN_SEGMENT = re.compile(r"^(/(?:webhooks|interactions)/\{id\}/)[^/]+")
+
+# (method, path pattern) -> (limit, per seconds, major parameter group); first match wins.
+RATE_LIMITS: List[Tuple[str, "re.Pattern", int, float, int]] = [
+    ("*", re.compile(r"^/interactions/"), 0, 0.0, 0),  # interaction callbacks aren't rate limited
+    ("*", re.compile(r"^/webhooks/(\d+/[^/?]+)"), 5, 2.0, 1),  # per interaction token
+    ("PUT", re.compile(r"^/channels/(\d+)/messages/\d+/reactions/"), 1, 0.25, 1),
+    ("POST", re.compile(r"^/channels/(\d+)/messages$"), 5, 5.0, 1),
+    ("*", re.compile(r"^/channels/(\d+)/messages/"), 5, 5.0, 1),
+    ("*", re.compile(r"^/guilds/(\d+)/members/\d+/roles/"), 10, 10.0, 1),
+]
+DEFAULT_LIMIT = (50, 1.0)
+GLOBAL_LIMIT = 50  # requests per second across every route
+
+OP_DISPATCH, OP_HEARTBEAT, OP_IDENTIFY, OP_RESUME, OP_REQUEST_MEMBERS, OP_HELLO, OP_HEARTBEAT_ACK = 0, 1, 2, 6, 8, 10, 11
+LARGE_THRESHOLD = 250  # like Discord: bigger guilds arrive without their member list
+CHUNK_SIZE = 1000
+
+
+def guild_snowflake(index: int) -> int:
+    """Deterministic guild id; consecutive indexes land on consecutive shards ((id >> 22) % shard_count)."""
+    return (1_000_000 + index) << 22
+
+
+def point_client_at(base_url: str) -> None:
+    """Aim discord.py's REST routes and default gateway at `base_url` (e.g. the fake server)."""
+    import yarl
+    from discord import asset, gateway, http
+
+    base_url = base_url.rstrip("/")
+    http.Route.BASE = f"{base_url}/api/v{API_VERSION}"
+    asset.Asset.BASE = base_url  # avatars come from the fake CDN routes
+    ws_url = base_url.replace("http://", "ws://").replace("https://", "wss://") + "/gateway"
+    gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(ws_url)
+
+
+def json_response(data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    # discord.py only decodes JSON when Content-Type is exactly "application/json" (no charset).
+    return web.Response(body=json.dumps(data).encode(), status=status,
+                        headers={"Content-Type": "application/json", **(headers or {})})
+
+
+def write_sample_banner(path: str, width: int = 1100, height: int = 440) -> None:
+    """A gradient banner the size of the real ones, for card rendering without the Drive images."""
+    from PIL import Image
+    gradient = Image.linear_gradient("L").resize((width, height))
+    Image.merge("RGB", (gradient, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT), Image.new("L", (width, height), 140))).save(path)
+
+
+def route_template(path: str) -> str:
+    """/channels/123/messages/456 -> /channels/{id}/messages/{id}; interaction tokens -> {token}."""
+    return _TOKEN_SEGMENT.sub(r"\1{token}", _ID_SEGMENT.sub("/{id}", path))
+
+
+def message_payload(message_id: int, channel_id: int, author: Dict[str, Any], body: Dict[str, Any],
+                    guild_id: Optional[int] = None) -> Dict[str, Any]:
+    data = {"id": str(message_id), "channel_id": str(channel_id), "author": author,
+            "content": body.get("content") or "", "embeds": body.get("embeds") or [],
+            "timestamp": datetime.now(timezone.utc).isoformat(), "edited_timestamp": None, "tts": False,
+            "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+            "components": [], "pinned": False, "type": 0, "flags": body.get("flags") or 0}
+    if guild_id is not None:
+        data["guild_id"] = str(guild_id)
+    return data
+
+
+def user_payload(user_id: int, name: str, bot: bool = False) -> Dict[str, Any]:
+    return {"id": str(user_id), "username": name, "discriminator": "0", "global_name": None,
+            "avatar": None, "bot": bot, "public_flags": 0}
+
+
+def member_payload(user_id: int, name: str, premium_since: Optional[str] = None, bot: bool = False) -> Dict[str, Any]:
+    return {"user": user_payload(user_id, name, bot), "roles": [], "nick": None,
+            "joined_at": datetime.now(timezone.utc).isoformat(), "premium_since": premium_since,
+            "deaf": False, "mute": False, "flags": 0, "pending": False}
+
+
+class FakeGuild:
+    """A synthetic guild: @everyone, a few named roles, some text channels and members."""
+
+    def __init__(self, guild_id: int, name: str, members: int = 20, channels: int = 3,
+                 role_names: Optional[List[str]] = None):
+        self.id = guild_id
+        self.name = name
+        self.channel_ids = [guild_id + 1 + i for i in range(channels)]
+        self.role_ids = {role: guild_id + 100 + i for i, role in enumerate(role_names or [])}
+        self.members = [member_payload(guild_id + 1000 + i, f"tambay{i}") for i in range(members)]
+        self.members.append(member_payload(BOT_USER_ID, "cosmos", bot=True))
+
+    def shard_id(self, shard_count: int) -> int:
+        return (self.id >> 22) % shard_count
+
+    def payload(self, large_threshold: int = LARGE_THRESHOLD) -> Dict[str, Any]:
+        roles = [{"id": str(self.id), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+                  "hoist": False, "managed": False, "mentionable": False}]
+        roles += [{"id": str(rid), "name": name, "permissions": "0", "position": i + 1, "color": 0,
+                   "hoist": False, "managed": False, "mentionable": False}
+                  for i, (name, rid) in enumerate(self.role_ids.items())]
+        channels = [{"id": str(cid), "type": 0, "name": f"channel-{i}", "position": i, "guild_id": str(self.id),
+                     "permission_overwrites": [], "nsfw": False, "parent_id": None, "topic": None,
+                     "last_message_id": None, "rate_limit_per_user": 0}
+                    for i, cid in enumerate(self.channel_ids)]
+        large = len(self.members) > large_threshold
+        members = [m for m in self.members if m["user"]["id"] == str(BOT_USER_ID)] if large else self.members
+        return {"id": str(self.id), "name": self.name, "unavailable": False, "owner_id": str(self.id + 1000),
+                "member_count": len(self.members), "large": large, "features": [], "emojis": [], "stickers": [],
+                "roles": roles, "channels": channels, "threads": [], "members": members, "presences": [],
+                "voice_states": [], "stage_instances": [], "guild_scheduled_events": [],
+                "premium_tier": 0, "premium_subscription_count": 0, "preferred_locale": "en-US",
+                "joined_at": datetime.now(timezone.utc).isoformat(), "verification_level": 0,
+                "explicit_content_filter": 0, "default_message_notifications": 0, "mfa_level": 0,
+                "nsfw_level": 0, "system_channel_flags": 0, "afk_timeout": 300}
+
+
+class RateLimiter:
+    """Fixed-window buckets shaped like Discord's: per route + major parameter, plus a global cap."""
+
+    def __init__(self, global_limit: int = GLOBAL_LIMIT):
+        self.global_limit = global_limit
+        self._buckets: Dict[str, List[float]] = {}  # key -> [window start, used]
+        self._global = [0.0, 0]
+
+    @staticmethod
+    def classify(method: str, path: str) -> Tuple[str, int, float]:
+        for m, pattern, limit, per, group in RATE_LIMITS:
+            if m != "*" and m != method:
+                continue
+            match = pattern.match(path)
+            if match:
+                major = f" [{match.group(group)}]" if group else ""
+                return f"{method} {route_template(path)}{major}", limit, per
+        return f"{method} {route_template(path)}", DEFAULT_LIMIT[0], DEFAULT_LIMIT[1]
+
+    def hit(self, method: str, path: str, now: float) -> Dict[str, Any]:
+        key, limit, per = self.classify(method, path)
+        g = self._global
+        if now - g[0] >= 1.0:
+            g[0], g[1] = now, 0
+        if g[1] >= self.global_limit:
+            return {"allowed": False, "global": True, "retry_after": g[0] + 1.0 - now}
+        g[1] += 1
+        if not limit:
+            return {"allowed": True, "limit": None}
+
+        bucket = self._buckets.get(key)
+        if bucket is None or now - bucket[0] >= per:
+            bucket = self._buckets[key] = [now, 0]
+        reset_after = bucket[0] + per - now
+        if bucket[1] >= limit:
+            return {"allowed": False, "global": False, "retry_after": reset_after, "bucket": key,
+                    "limit": limit, "reset_after": reset_after}
+        bucket[1] += 1
+        return {"allowed": True, "bucket": key, "limit": limit, "remaining": limit - bucket[1],
+                "reset_after": reset_after}
+
+
+def _rate_limit_headers(verdict: Dict[str, Any]) -> Dict[str, str]:
+    if verdict.get("limit") is None:
+        return {}
+    reset_after = max(0.0, verdict["reset_after"])
+    return {
+        "X-RateLimit-Limit": str(verdict["limit"]),
+        "X-RateLimit-Remaining": str(verdict.get("remaining", 0)),
+        "X-RateLimit-Reset": f"{time.time() + reset_after:.3f}",
+        "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        # Like Discord's, the hash names the route's limit; the major parameter isn't part of it.
+        "X-RateLimit-Bucket": format(hash(verdict["bucket"].split(" [")[0]) & 0xFFFFFFFF, "08x"),
+    }
+
+
+class GatewaySession:
+    """One connected shard."""
+
+    def __init__(self, ws: web.WebSocketResponse):
+        self.ws = ws
+        self.seq = 0
+        self.shard_id = 0
+        self.shard_count = 1
+        self.session_id = ""
+
+    async def dispatch(self, event: str, data: Dict[str, Any]) -> None:
+        self.seq += 1
+        await self.ws.send_str(json.dumps({"op": OP_DISPATCH, "s": self.seq, "t": event, "d": data}))
+
+
+class FakeDiscord:
+    """aiohttp app serving the REST routes discord.py needs plus a gateway websocket."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, guilds: int = 1, shard_count: int = 1,
+                 members_per_guild: int = 20, role_names: Optional[List[str]] = None,
+                 rest_latency: float = 0.0, rate_limits: bool = True):
+        self.host = host
+        self.port = port
+        self.shard_count = shard_count
+        self.rest_latency = rest_latency
+        self.limiter = RateLimiter() if rate_limits else None
+        self.calls: Counter = Counter()  # "METHOD /route/{id}" -> requests
+        self.rate_limited: Counter = Counter()
+        self.expected: Dict[int, Tuple[str, float]] = {}  # id -> (label, dispatched at)
+        self._avatars: Dict[str, bytes] = {}  # name -> PNG bytes
+        self.latencies: Dict[str, List[float]] = {}
+        self._next_id = 300_000_000_000_000_000
+        self.guilds = [FakeGuild(guild_snowflake(i), f"fake sabaw {i}", members=members_per_guild, role_names=role_names)
+                       for i in range(guilds)]
+        self.sessions: Set[GatewaySession] = set()
+        self.identified: List[int] = []
+        self.app = web.Application(middlewares=[self._rest_middleware])
+        api = f"/api/v{API_VERSION}"
+        self.app.router.add_get(f"{api}/users/@me", self.users_me)
+        self.app.router.add_get(f"{api}/oauth2/applications/@me", self.application)
+        self.app.router.add_get(f"{api}/gateway/bot", self.gateway_bot)
+        self.app.router.add_get(f"{api}/gateway", self.gateway_plain)
+        self.app.router.add_route("*", f"{api}/{{tail:.*}}", self.rest_write)
+        self.app.router.add_get("/gateway", self.gateway_ws)
+        self.app.router.add_get("/embed/avatars/{name}", self.avatar)
+        self.app.router.add_get("/avatars/{user}/{name}", self.avatar)
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def expect(self, snowflake: int, label: str) -> None:
+        """Time how long until a REST call mentions `snowflake` (in its path or body)."""
+        self.expected[snowflake] = (label, time.perf_counter())
+
+    # --- REST ---
+    @web.middleware
+    async def _rest_middleware(self, request: web.Request, handler):
+        api = f"/api/v{API_VERSION}"
+        if not request.path.startswith(api + "/"):
+            return await handler(request)
+        path = request.path[len(api):]
+        self.calls[f"{request.method} {route_template(path)}"] += 1
+        # Multipart uploads (files) carry binary parts; only the JSON part matters here.
+        body = (await request.read()).decode("utf-8", "replace") if request.can_read_body else ""
+        if self.expected:
+            now = time.perf_counter()
+            for match in _SNOWFLAKE.finditer(path + " " + body):
+                entry = self.expected.pop(int(match.group()), None)
+                if entry is not None:
+                    self.latencies.setdefault(entry[0], []).append(now - entry[1])
+        if self.rest_latency:
+            await asyncio.sleep(self.rest_latency)
+
+        verdict = self.limiter.hit(request.method, path, time.monotonic()) if self.limiter else {"limit": None}
+        if not verdict.get("allowed", True):
+            self.rate_limited["global" if verdict["global"] else self.limiter.classify(request.method, path)[0]] += 1
+            retry_after = round(max(0.0, verdict["retry_after"]), 3)
+            # discord.py treats a 429 without Via as a Cloudflare ban and gives up.
+            headers = {"Retry-After": str(retry_after), "X-RateLimit-Scope": "user", "Via": "1.1 google"}
+            if verdict["global"]:
+                headers["X-RateLimit-Global"] = "true"
+            else:
+                headers.update(_rate_limit_headers(verdict))
+            return json_response({"message": "You are being rate limited.", "retry_after": retry_after,
+                                  "global": verdict["global"]}, status=429, headers=headers)
+        request["fake_body"] = body
+        response = await handler(request)
+        response.headers.update(_rate_limit_headers(verdict))
+        return response
+
+    async def rest_write(self, request: web.Request) -> web.Response:
+        """Generic write routes: enough of a response for discord.py to build its objects."""
+        path = "/" + request.match_info["tail"]
+        body = request.get("fake_body") or ""
+        try:
+            payload = json.loads(body) if body.startswith("{") else {}
+        except ValueError:
+            payload = {}
+        bot = user_payload(BOT_USER_ID, "cosmos", bot=True)
+        parts = path.strip("/").split("/")
+
+        if request.method in ("POST", "PATCH") and parts[0] == "channels" and len(parts) >= 3 and parts[2] == "messages":
+            channel_id = int(parts[1])
+            message_id = int(parts[3]) if len(parts) > 3 else self.new_id()
+            return json_response(message_payload(message_id, channel_id, bot, payload, self._guild_for_channel(channel_id)))
+        if request.method in ("POST", "PATCH") and parts[0] == "webhooks":
+            return json_response(message_payload(self.new_id(), self.guilds[0].channel_ids[0] if self.guilds else 0,
+                                                 bot, payload))
+        if request.method == "GET" and parts[0] == "guilds" and len(parts) == 4 and parts[2] == "members":
+            for guild in self.guilds:
+                if str(guild.id) == parts[1]:
+                    for member in guild.members:
+                        if member["user"]["id"] == parts[3]:
+                            return json_response(member)
+            return json_response({"message": "Unknown Member", "code": 10007}, status=404)
+        if parts[0] == "interactions" and parts[-1] == "callback":
+            return json_response({"interaction": {"id": parts[1], "type": 3, "response_message_id": None,
+                                                  "response_message_loading": payload.get("type") == 5,
+                                                  "response_message_ephemeral": True}})
+        return web.Response(status=204)
+
+    def _guild_for_channel(self, channel_id: int) -> Optional[int]:
+        for guild in self.guilds:
+            if channel_id in guild.channel_ids:
+                return guild.id
+        return None
+
+    async def avatar(self, request: web.Request) -> web.Response:
+        """CDN stand-in: a flat-colour PNG per avatar name, so card rendering has something to fetch."""
+        name = request.match_info["name"].split(".")[0]
+        data = self._avatars.get(name)
+        if data is None:
+            try:
+                from PIL import Image
+            except ImportError:
+                raise web.HTTPNotFound()
+            colour = hashlib.sha1(name.encode()).digest()[:3]
+            out = io.BytesIO()
+            Image.new("RGB", (128, 128), tuple(colour)).save(out, "PNG")
+            data = self._avatars[name] = out.getvalue()
+        return web.Response(body=data, content_type="image/png")
+
+    async def users_me(self, request: web.Request) -> web.Response:
+        return json_response(user_payload(BOT_USER_ID, "cosmos", bot=True))
+
+    async def application(self, request: web.Request) -> web.Response:
+        return json_response({
+            "id": str(BOT_USER_ID), "name": "cosmos", "description": "", "icon": None, "rpc_origins": None,
+            "bot_public": False, "bot_require_code_grant": False, "owner": user_payload(BOT_USER_ID + 1, "owner"),
+            "team": None, "verify_key": "0" * 64, "flags": 0, "summary": "", "guild_id": None,
+            "primary_sku_id": None, "slug": None, "cover_image": None, "interactions_endpoint_url": None,
+        })
+
+    async def gateway_bot(self, request: web.Request) -> web.Response:
+        return json_response({
+            "url": self.base_url.replace("http://", "ws://") + "/gateway",
+            "shards": self.shard_count,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 16},
+        })
+
+    async def gateway_plain(self, request: web.Request) -> web.Response:
+        return json_response({"url": self.base_url.replace("http://", "ws://") + "/gateway"})
+
+    # --- gateway ---
+    async def gateway_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        session = GatewaySession(ws)
+        self.sessions.add(session)
+        try:
+            await ws.send_str(json.dumps({"op": OP_HELLO, "d": {"heartbeat_interval": 41250}}))
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                payload = json.loads(msg.data)
+                op = payload.get("op")
+                if op == OP_HEARTBEAT:
+                    await ws.send_str(json.dumps({"op": OP_HEARTBEAT_ACK}))
+                elif op == OP_IDENTIFY:
+                    await self._identify(session, payload["d"])
+                elif op == OP_RESUME:
+                    await session.dispatch("RESUMED", {})
+                elif op == OP_REQUEST_MEMBERS:
+                    await self._send_members(session, payload["d"])
+        finally:
+            self.sessions.discard(session)
+        return ws
+
+    async def _identify(self, session: GatewaySession, data: Dict[str, Any]) -> None:
+        shard = data.get("shard") or [0, 1]
+        session.shard_id, session.shard_count = int(shard[0]), int(shard[1])
+        session.session_id = f"fake-{session.shard_id}-{len(self.identified)}"
+        self.identified.append(session.shard_id)
+        mine = [g for g in self.guilds if g.shard_id(session.shard_count) == session.shard_id]
+        await session.dispatch("READY", {
+            "v": API_VERSION,
+            "user": user_payload(BOT_USER_ID, "cosmos", bot=True),
+            "guilds": [{"id": str(g.id), "unavailable": True} for g in mine],
+            "session_id": session.session_id,
+            "resume_gateway_url": self.base_url.replace("http://", "ws://") + "/gateway",
+            "shard": [session.shard_id, session.shard_count],
+            "application": {"id": str(BOT_USER_ID), "flags": 0},
+        })
+        for guild in mine:
+            await session.dispatch("GUILD_CREATE", guild.payload())
+        logger.info(f"Shard {session.shard_id}/{session.shard_count} identified with {len(mine)} guild(s)")
+
+    async def _send_members(self, session: GatewaySession, data: Dict[str, Any]) -> None:
+        guild_ids = data["guild_id"] if isinstance(data["guild_id"], list) else [data["guild_id"]]
+        for guild in self.guilds:
+            if str(guild.id) not in map(str, guild_ids):
+                continue
+            members = guild.members
+            if data.get("user_ids"):
+                wanted = set(map(str, data["user_ids"]))
+                members = [m for m in members if m["user"]["id"] in wanted]
+            elif data.get("limit"):
+                members = members[:data["limit"]]
+            count = max(1, -(-len(members) // CHUNK_SIZE))
+            for index in range(count):
+                await session.dispatch("GUILD_MEMBERS_CHUNK", {
+                    "guild_id": str(guild.id), "members": members[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE],
+                    "chunk_index": index, "chunk_count": count, "nonce": data.get("nonce"),
+                })
+
+    def session_for_guild(self, guild: FakeGuild) -> Optional[GatewaySession]:
+        for session in self.sessions:
+            if session.session_id and guild.shard_id(session.shard_count) == session.shard_id:
+                return session
+        return None
+
+    # --- synthetic events ---
+    async def dispatch(self, guild: FakeGuild, event: str, data: Dict[str, Any]) -> bool:
+        """Send one gateway event on the shard that owns `guild`. False if it isn't connected."""
+        session = self.session_for_guild(guild)
+        if session is None:
+            return False
+        await session.dispatch(event, data)
+        return True
+
+    async def message_create(self, guild: FakeGuild, channel_id: int, member: Dict[str, Any], content: str,
+                             message_id: Optional[int] = None) -> int:
+        message_id = message_id or self.new_id()
+        data = message_payload(message_id, channel_id, member["user"], {"content": content}, guild.id)
+        data["member"] = {k: v for k, v in member.items() if k != "user"}
+        await self.dispatch(guild, "MESSAGE_CREATE", data)
+        return message_id
+
+    async def member_add(self, guild: FakeGuild, member: Dict[str, Any]) -> None:
+        await self.dispatch(guild, "GUILD_MEMBER_ADD", {**member, "guild_id": str(guild.id)})
+
+    async def member_update(self, guild: FakeGuild, member: Dict[str, Any]) -> None:
+        await self.dispatch(guild, "GUILD_MEMBER_UPDATE", {**member, "guild_id": str(guild.id)})
+
+    async def member_remove(self, guild: FakeGuild, member: Dict[str, Any]) -> None:
+        await self.dispatch(guild, "GUILD_MEMBER_REMOVE", {"guild_id": str(guild.id), "user": member["user"]})
+
+    async def button_click(self, guild: FakeGuild, channel_id: int, member: Dict[str, Any], custom_id: str,
+                           interaction_id: Optional[int] = None) -> int:
+        interaction_id = interaction_id or self.new_id()
+        await self.dispatch(guild, "INTERACTION_CREATE", {
+            "id": str(interaction_id), "application_id": str(BOT_USER_ID), "type": 3, "version": 1,
+            "token": f"fake-token-{interaction_id}", "guild_id": str(guild.id),
+            "channel_id": str(channel_id), "channel": {"id": str(channel_id), "type": 0},
+            "member": {**member, "permissions": "0"}, "app_permissions": "0", "locale": "en-US",
+            "data": {"custom_id": custom_id, "component_type": 2},
+        })
+        return interaction_id
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = self._runner.addresses[0][1]
+        logger.info(f"Fake Discord listening on {self.base_url}")
+
+    async def stop(self) -> None:
+        for session in list(self.sessions):
+            await session.ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    fake = FakeDiscord(args.host, args.port, guilds=args.guilds, shard_count=args.shards,
+                       members_per_guild=args.members)
+    await fake.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await fake.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--guilds", type=int, default=4)
+    parser.add_argument("--shards", type=int, default=1, help="recommended shard count reported by /gateway/bot")
+    parser.add_argument("--members", type=int, default=20)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
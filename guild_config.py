@@ -0,0 +1,139 @@
+import asyncio
+import sqlite3
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("sabaw_bot.config")
+
+
+def _parse_channel(value: str) -> int:
+    value = value.strip()
+    if value.startswith("<#") and value.endswith(">"):
+        value = value[2:-1]
+    return int(value)
+
+
+def _parse_name(value: str) -> str:
+    value = value.strip()
+    if not value:
+        raise ValueError("name can't be empty")
+    return value
+
+
+# key -> parser for values typed into !config
+SETTINGS: Dict[str, Callable[[str], Any]] = {
+    "welcome_channel_id": _parse_channel,
+    "boost_channel_id": _parse_channel,
+    "goodbye_channel_id": _parse_channel,
+    "roles_channel_id": _parse_channel,
+    "verify_role_name": _parse_name,
+    "boost_role_name": _parse_name,
+}
+
+
+class GuildConfig:
+    """Resolved settings for one guild (overrides on top of the defaults). Read-only."""
+
+    __slots__ = tuple(SETTINGS)
+
+    def __init__(self, values: Dict[str, Any]):
+        for key in SETTINGS:
+            object.__setattr__(self, key, values.get(key))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("GuildConfig is read-only; use GuildConfigStore.set()")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in SETTINGS}
+
+
+class GuildConfigStore:
+    """Per-guild settings in SQLite behind an in-memory cache.
+
+    Every row is read once in `open()`. After that `get()` is a dict lookup
+    and never touches disk; `set()` / `reset()` write through to SQLite off
+    the event loop and update the cache only once the write has committed, so
+    a failed write leaves both unchanged.
+    """
+
+    def __init__(self, path: str, defaults: Dict[str, Any]):
+        unknown = set(defaults) - set(SETTINGS)
+        if unknown:
+            raise ValueError(f"unknown settings: {', '.join(sorted(unknown))}")
+        self.path = path
+        self._defaults = dict(defaults)
+        self._default_config = GuildConfig(self._defaults)
+        self._overrides: Dict[int, Dict[str, Any]] = {}
+        self._resolved: Dict[int, GuildConfig] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._write_lock = asyncio.Lock()
+
+    def open(self) -> None:
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS guild_settings ("
+            " guild_id INTEGER NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " PRIMARY KEY (guild_id, key))"
+        )
+        self._conn.commit()
+        rows = self._conn.execute("SELECT guild_id, key, value FROM guild_settings").fetchall()
+        for guild_id, key, value in rows:
+            parser = SETTINGS.get(key)
+            if parser is None:
+                logger.warning(f"Ignoring unknown setting {key!r} for guild {guild_id}")
+                continue
+            self._overrides.setdefault(guild_id, {})[key] = parser(value)
+        logger.info(f"Loaded settings for {len(self._overrides)} guild(s) from {self.path}")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, guild_id: int) -> GuildConfig:
+        config = self._resolved.get(guild_id)
+        if config is None:
+            overrides = self._overrides.get(guild_id)
+            config = GuildConfig({**self._defaults, **overrides}) if overrides else self._default_config
+            self._resolved[guild_id] = config
+        return config
+
+    def overrides(self, guild_id: int) -> Dict[str, Any]:
+        return dict(self._overrides.get(guild_id, {}))
+
+    async def set(self, guild_id: int, key: str, raw: str) -> Any:
+        """Parse and store one setting. Raises KeyError/ValueError on bad input, sqlite3.Error if the write fails."""
+        value = SETTINGS[key](raw)
+
+        def apply():
+            self._overrides.setdefault(guild_id, {})[key] = value
+            self._resolved.pop(guild_id, None)
+
+        await self._write(
+            "INSERT INTO guild_settings (guild_id, key, value) VALUES (?, ?, ?)"
+            " ON CONFLICT (guild_id, key) DO UPDATE SET value = excluded.value",
+            (guild_id, key, str(value)), apply,
+        )
+        return value
+
+    async def reset(self, guild_id: int, key: str) -> None:
+        if key not in SETTINGS:
+            raise KeyError(key)
+
+        def apply():
+            self._overrides.get(guild_id, {}).pop(key, None)
+            self._resolved.pop(guild_id, None)
+
+        await self._write("DELETE FROM guild_settings WHERE guild_id = ? AND key = ?", (guild_id, key), apply)
+
+    async def _write(self, sql: str, params: tuple, apply: Callable[[], None]) -> None:
+        if self._conn is None:
+            raise RuntimeError("GuildConfigStore is not open")
+        async with self._write_lock:
+            await asyncio.to_thread(self._execute, sql, params)
+            # Still under the lock, so the cache sees changes in the same order as the database.
+            apply()
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._conn:
+            self._conn.execute(sql, params)
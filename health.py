@@ -0,0 +1,87 @@
+import math
+import logging
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+from discord.ext import commands
+
+from sharding import is_sharded, shard_state
+
+logger = logging.getLogger("sabaw_bot.health")
+
+
+def gateway_state(bot: commands.Bot) -> Dict[str, Any]:
+    """What the gateway actually looks like right now, JSON-safe."""
+    latency = bot.latency
+    state = {
+        "ready": bot.is_ready(),
+        "closed": bot.is_closed(),
+        "latency_ms": round(latency * 1000, 1) if math.isfinite(latency) else None,
+        "guilds": len(bot.guilds),
+        "user": str(bot.user) if bot.user else None,
+    }
+    if is_sharded(bot):
+        shards = shard_state(bot)
+        state["gateway_open"] = bool(shards["shards"]) and not any(s["closed"] for s in shards["shards"].values())
+        state.update(shards)
+    else:
+        ws = bot.ws
+        state["gateway_open"] = ws is not None and ws.open
+    return state
+
+
+class HealthServer:
+    """aiohttp server that lives on the bot's own event loop.
+
+    Other modules register extra routes on `app` before `start()` is awaited;
+    aiohttp freezes the router once the runner is set up.
+    """
+
+    def __init__(self, bot: commands.Bot, host: str = "0.0.0.0", port: int = 8080):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.app = web.Application()
+        self.app.router.add_get("/", self.home)
+        self.app.router.add_get("/healthz", self.healthz)
+        self.app.router.add_get("/readyz", self.readyz)
+        self._runner: Optional[web.AppRunner] = None
+
+    async def home(self, request: web.Request) -> web.Response:
+        return web.Response(text="Bot is alive!" if not self.bot.is_closed() else "Bot is down.")
+
+    async def healthz(self, request: web.Request) -> web.Response:
+        # Liveness: the loop answered us, and the client hasn't been shut down.
+        state = gateway_state(self.bot)
+        return web.json_response(state, status=503 if state["closed"] else 200)
+
+    async def readyz(self, request: web.Request) -> web.Response:
+        # Readiness: connected to the gateway with a heartbeat on record.
+        state = gateway_state(self.bot)
+        ok = state["ready"] and state["gateway_open"] and state["latency_ms"] is not None
+        return web.json_response(state, status=200 if ok else 503)
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info(f"Health server listening on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def run_flask_fallback(port: int) -> None:
+    """Legacy Flask keep-alive route. Opt-in only (WEB_SERVER=flask)."""
+    from flask import Flask
+
+    app = Flask("sabaw_bot")
+
+    @app.route('/')
+    def home():
+        return "Bot is alive!"
+
+    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
@@ -0,0 +1,161 @@
+"""Run the bot as several worker processes, each owning a range of shards.
+
+    python launcher.py --shards 8 --workers 2          # shards 0-3 and 4-7
+    python launcher.py --shards auto --workers 4       # ask Discord how many
+    python launcher.py --shards 4 --workers 2 --fake   # offline, against fake_discord
+
+Every worker runs the same main.py with SHARD_COUNT / SHARD_IDS set, and its
+own health/metrics port (PORT + worker index). Crashed workers are restarted
+with backoff; Ctrl+C / SIGTERM stops them all.
+"""
+import os
+import sys
+import signal
+import asyncio
+import logging
+import argparse
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from sharding import format_shard_ids, split_shards
+
+logger = logging.getLogger("sabaw_bot.launcher")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IDENTIFY_INTERVAL = 5.0  # Discord allows one IDENTIFY per 5s per max_concurrency bucket
+
+
+async def recommended_shards(token: str, api_base: str = "https://discord.com/api/v10") -> int:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{api_base}/gateway/bot", headers={"Authorization": f"Bot {token}"}) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+    return int(data["shards"])
+
+
+class Worker:
+    def __init__(self, index: int, shard_ids: List[int], shard_count: int, port: int, env: Dict[str, str]):
+        self.index = index
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.port = port
+        self.env = env
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self.restarts = 0
+
+    def describe(self) -> str:
+        return f"worker {self.index} (shards {format_shard_ids(self.shard_ids)}, port {self.port})"
+
+    async def spawn(self) -> None:
+        env = dict(self.env)
+        env.update({
+            "SHARD_COUNT": str(self.shard_count),
+            "SHARD_IDS": format_shard_ids(self.shard_ids),
+            "PORT": str(self.port),
+            "WORKER_INDEX": str(self.index),
+        })
+        self.proc = await asyncio.create_subprocess_exec(sys.executable, os.path.join(HERE, "main.py"), env=env, cwd=HERE)
+        logger.info(f"Started {self.describe()} as pid {self.proc.pid}")
+
+    async def supervise(self, stopping: asyncio.Event, max_backoff: float = 60.0, stable_after: float = 300.0) -> None:
+        loop = asyncio.get_running_loop()
+        while not stopping.is_set():
+            await self.spawn()
+            started = loop.time()
+            code = await self.proc.wait()
+            if stopping.is_set():
+                return
+            if loop.time() - started >= stable_after:
+                self.restarts = 0  # it ran fine for a while; a crash now isn't part of a crash loop
+            self.restarts += 1
+            delay = min(max_backoff, 2 ** min(self.restarts, 6))
+            logger.warning(f"{self.describe()} exited with {code}; restarting in {delay:.0f}s")
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if self.proc is None or self.proc.returncode is not None:
+            return
+        self.proc.terminate()
+        try:
+            await asyncio.wait_for(self.proc.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.proc.kill()
+            await self.proc.wait()
+
+
+async def launch(args: argparse.Namespace) -> None:
+    env = dict(os.environ)
+    fake = None
+    identify_interval = args.identify_interval
+
+    if args.fake:
+        from fake_discord import FakeDiscord
+        fake = FakeDiscord(port=args.fake_port, guilds=args.fake_guilds,
+                           shard_count=int(args.shards) if args.shards != "auto" else 2)
+        await fake.start()
+        env["DISCORD_API_BASE"] = fake.base_url
+        env["DISCORD_TOKEN"] = "fake"  # never hand a real token to the fake server
+        env.setdefault("CONFIG_DB", os.path.join(HERE, "fake.db"))
+        identify_interval = 0.0
+
+    if args.shards == "auto":
+        token = env.get("DISCORD_TOKEN")
+        if not token:
+            raise RuntimeError("DISCORD_TOKEN not found! It's needed to ask Discord for a shard count.")
+        api_base = f"{env['DISCORD_API_BASE']}/api/v10" if env.get("DISCORD_API_BASE") else "https://discord.com/api/v10"
+        shard_count = await recommended_shards(token, api_base)
+    else:
+        shard_count = int(args.shards)
+
+    ranges = split_shards(shard_count, args.workers)
+    workers = [Worker(i, ids, shard_count, args.base_port + i, env) for i, ids in enumerate(ranges)]
+    logger.info(f"Launching {shard_count} shard(s) across {len(workers)} worker(s)")
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    tasks = []
+    try:
+        for worker in workers:
+            tasks.append(asyncio.create_task(worker.supervise(stopping)))
+            # Stagger so the workers' IDENTIFYs don't collide in the same window.
+            if identify_interval and worker is not workers[-1]:
+                try:
+                    await asyncio.wait_for(stopping.wait(), timeout=identify_interval * len(worker.shard_ids))
+                except asyncio.TimeoutError:
+                    pass
+        await stopping.wait()
+    finally:
+        stopping.set()
+        await asyncio.gather(*(w.stop() for w in workers), return_exceptions=True)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if fake is not None:
+            await fake.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", default="auto", help="total shard count, or 'auto' to ask Discord")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--base-port", type=int, default=int(os.environ.get("PORT", 8080)))
+    parser.add_argument("--identify-interval", type=float, default=IDENTIFY_INTERVAL)
+    parser.add_argument("--fake", action="store_true", help="run against a local fake_discord server")
+    parser.add_argument("--fake-port", type=int, default=0)
+    parser.add_argument("--fake-guilds", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(launch(args))
+
+
+if __name__ == "__main__":
+    main()
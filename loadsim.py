@@ -0,0 +1,277 @@
+"""Offline load simulator: the real handlers in app.py against fake_discord.
+
+    python loadsim.py --rate 50 --duration 30
+    python loadsim.py --rate 200 --duration 20 --mix join=80,message=20    # join raid
+    python loadsim.py --rate 100 --mix message=100 --json report.json      # chat spike
+
+The bot runs in this process exactly as `python main.py` would, logged in to a local
+FakeDiscord that enforces Discord-style rate limits. Synthetic gateway events
+(messages, joins, boosts, leaves, verify-button clicks) are fed in at `--rate`
+per second, then the report shows handler throughput and latency from the
+bot's own metrics, end-to-end latency (event sent -> first REST call about it)
+per event kind, and every outbound REST call and 429 by route.
+
+"answered" counts events that some REST call mentioned. Plain chat that
+triggers nothing is never answered, and joins past MEMBER_BATCH_MAX_NAMES
+in one batch only show up as "and N more".
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fake_discord import FakeDiscord, FakeGuild, member_payload, point_client_at, write_sample_banner
+
+logger = logging.getLogger("sabaw_bot.loadsim")
+
+DEFAULT_MIX = "message=70,join=10,boost=5,leave=10,button=5"
+
+# What a synthetic chat message says: (weight, text). {n} is a unique number.
+MESSAGES = [
+    (60, "wala lang, nag-join ako for vibes not conversations {n}"),
+    (20, "grabe im bored na talaga {n}"),
+    (8, "!say sim drop {n}"),
+    (4, "!who"),
+    (4, "!roast"),
+    (2, "!sabaw"),
+    (2, "!huy"),
+    (2, "!boosters"),
+]
+
+
+def percentiles(values: List[float], qs=(0.5, 0.95, 0.99)) -> Dict[str, Optional[float]]:
+    if not values:
+        return {f"p{int(q * 100)}": None for q in qs}
+    ordered = sorted(values)
+    return {f"p{int(q * 100)}": ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in qs}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in ("message", "join", "boost", "leave", "button"):
+            raise ValueError(f"unknown event kind {kind!r}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+class Simulator:
+    """Generates events against a running FakeDiscord and remembers who's in each guild."""
+
+    def __init__(self, fake: FakeDiscord, mix: Dict[str, float], rng: random.Random):
+        self.fake = fake
+        self.rng = rng
+        self.kinds = list(mix)
+        self.weights = [mix[k] for k in self.kinds]
+        self.joined: Dict[int, List[Dict[str, Any]]] = {g.id: [] for g in fake.guilds}
+        self.sent: Dict[str, int] = {}
+        self._n = 0
+        self._message_texts = [t for _, t in MESSAGES]
+        self._message_weights = [w for w, _ in MESSAGES]
+
+    def _settled(self, joined: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Pop a member whose join has already been answered, so the two timings don't collide."""
+        for _ in range(5):
+            if not joined:
+                return None
+            i = self.rng.randrange(len(joined))
+            if int(joined[i]["user"]["id"]) not in self.fake.expected:
+                joined[i], joined[-1] = joined[-1], joined[i]
+                return joined.pop()
+        return None
+
+    def _new_member(self) -> Dict[str, Any]:
+        user_id = self.fake.new_id()
+        return member_payload(user_id, f"raider{user_id}")
+
+    async def one(self) -> None:
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        guild: FakeGuild = self.rng.choice(self.fake.guilds)
+        joined = self.joined[guild.id]
+        member = self._settled(joined) if kind in ("boost", "leave") else None
+        if kind in ("boost", "leave") and member is None:
+            kind = "join"  # nobody (settled) to boost or leave yet
+        self._n += 1
+
+        if kind == "message":
+            text = self.rng.choices(self._message_texts, self._message_weights)[0].format(n=self._n)
+            member = self._new_member()  # fresh author, so per-user cooldowns don't mask the load
+            message_id = self.fake.new_id()
+            self.fake.expect(message_id, "message")
+            await self.fake.message_create(guild, guild.channel_ids[2], member, text, message_id)
+        elif kind == "join":
+            member = self._new_member()
+            joined.append(member)
+            self.fake.expect(int(member["user"]["id"]), "join")
+            await self.fake.member_add(guild, member)
+        elif kind == "boost":
+            boosted = {**member, "premium_since": datetime.now(timezone.utc).isoformat()}
+            self.fake.expect(int(member["user"]["id"]), "boost")
+            await self.fake.member_update(guild, boosted)
+        elif kind == "leave":
+            self.fake.expect(int(member["user"]["id"]), "leave")
+            await self.fake.member_remove(guild, member)
+        else:
+            member = self._new_member()
+            interaction_id = self.fake.new_id()
+            self.fake.expect(interaction_id, "button")
+            await self.fake.button_click(guild, guild.channel_ids[2], member, "verify_button", interaction_id)
+        self.sent[kind] = self.sent.get(kind, 0) + 1
+
+    async def run(self, rate: float, duration: float) -> float:
+        """Send events at `rate`/s for `duration` seconds. Returns the achieved rate."""
+        interval = 1.0 / rate
+        started = time.perf_counter()
+        deadline = started + duration
+        next_at = started
+        sent = 0
+        while next_at < deadline:
+            await self.one()
+            sent += 1
+            next_at += interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return sent / (time.perf_counter() - started)
+
+
+def build_report(app, fake: FakeDiscord, sim: Simulator, elapsed: float, achieved_rate: float) -> Dict[str, Any]:
+    handlers = {}
+    for (kind, name), stats in sorted(app.metrics.handlers.items()):
+        hist = stats.latency
+        handlers[f"{kind}:{name}"] = {
+            "calls": stats.calls, "errors": stats.errors, "per_second": round(stats.calls / elapsed, 2),
+            **{q: hist.quantile(float(q[1:]) / 100) for q in ("p50", "p95", "p99")},
+        }
+    end_to_end = {}
+    for label, values in sorted(fake.latencies.items()):
+        end_to_end[label] = {"answered": len(values), "sent": sim.sent.get(label, 0), **percentiles(values)}
+    return {
+        "cache_profile": app.CACHE_PROFILE.describe(),
+        "startup": app.startup_report.as_dict(),
+        "elapsed_s": round(elapsed, 2),
+        "events_sent": sim.sent,
+        "achieved_rate": round(achieved_rate, 1),
+        "handlers": handlers,
+        "end_to_end_s": end_to_end,
+        "rest_calls": dict(fake.calls.most_common()),
+        "rest_calls_total": sum(fake.calls.values()),
+        "rate_limited": dict(fake.rate_limited.most_common()),
+        "rate_limited_total": sum(fake.rate_limited.values()),
+    }
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None or value != value or value == float("inf") else f"{value * 1000:.1f}"
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    startup = report["startup"]
+    rss = startup["rss_at_ready"]
+    print(f"\nstartup: ready after {startup['ready_after_s']:.2f}s, RSS {rss / 2**20 if rss else float('nan'):.1f} MB "
+          f"[{report['cache_profile']}]")
+    print(f"\nsent {sum(report['events_sent'].values())} events in {report['elapsed_s']}s "
+          f"({report['achieved_rate']}/s): {report['events_sent']}")
+    print(f"\n{'handler':<34} {'calls':>7} {'/s':>7} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, h in report["handlers"].items():
+        print(f"{name:<34} {h['calls']:>7} {h['per_second']:>7} {h['errors']:>6} "
+              f"{_ms(h['p50']):>8} {_ms(h['p95']):>8} {_ms(h['p99']):>8}")
+    print(f"\n{'end-to-end':<12} {'sent':>6} {'answered':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, e in report["end_to_end_s"].items():
+        print(f"{label:<12} {e['sent']:>6} {e['answered']:>8} {_ms(e['p50']):>8} {_ms(e['p95']):>8} {_ms(e['p99']):>8}")
+    print(f"\nREST calls: {report['rest_calls_total']}  (429s: {report['rate_limited_total']})")
+    for route, n in report["rest_calls"].items():
+        print(f"  {n:>7}  {route}")
+    for bucket, n in report["rate_limited"].items():
+        print(f"  {n:>7}  429 {bucket}")
+
+
+async def simulate(args: argparse.Namespace) -> Dict[str, Any]:
+    fake = FakeDiscord(guilds=args.guilds, members_per_guild=args.members, rest_latency=args.rest_latency / 1000,
+                       rate_limits=not args.no_rate_limits)
+    await fake.start()
+
+    workdir = tempfile.mkdtemp(prefix="sabaw-loadsim-")
+    db = os.path.join(workdir, "loadsim.db")
+    os.environ.update({"WEB_SERVER": "off", "CONFIG_DB": db, "DISCORD_API_BASE": fake.base_url,
+                       "CARD_ASSET_DIR": os.path.join(workdir, "cards"), "CARD_CACHE_DIR": os.path.join(workdir, "cache")})
+    if os.environ.get("CARD_WORKERS", "2") != "0":
+        # Local banners, so cards render without reaching Google Drive; avatars come from the fake CDN.
+        os.makedirs(os.environ["CARD_ASSET_DIR"])
+        for name in ("welcome", "welcome_batch", "boost", "goodbye", "goodbye_batch", "boosters"):
+            write_sample_banner(os.path.join(os.environ["CARD_ASSET_DIR"], f"{name}.png"))
+    os.environ.pop("SHARD_COUNT", None)
+    os.environ.pop("SHARD_IDS", None)
+    point_client_at(fake.base_url)
+    import app  # reads the environment above at import time
+
+    for guild in fake.guilds:
+        # Route welcome/goodbye/boost into the fake guild's channels, and give it the real role names.
+        guild.role_ids = {app.VERIFY_ROLE_NAME: guild.id + 100, app.BOOST_ROLE_NAME: guild.id + 101}
+    seed = app.GuildConfigStore(db, defaults={})
+    seed.open()
+    for guild in fake.guilds:
+        for key, channel in (("welcome_channel_id", 0), ("goodbye_channel_id", 0),
+                             ("boost_channel_id", 1), ("roles_channel_id", 2)):
+            await seed.set(guild.id, key, str(guild.channel_ids[channel]))
+    seed.close()
+
+    if not args.verbose:
+        logging.getLogger("sabaw_bot").setLevel(logging.WARNING)
+        logging.getLogger("discord").setLevel(logging.ERROR)
+
+    bot_task = asyncio.create_task(app.run_bot("fake"))
+    try:
+        await asyncio.wait_for(app.bot.wait_until_ready(), timeout=30)
+        while len(app.bot.guilds) < len(fake.guilds):
+            await asyncio.sleep(0.05)
+        print(f"bot ready with {len(app.bot.guilds)} guild(s); sending {args.rate}/s for {args.duration}s")
+
+        app.metrics.handlers.clear()  # only count the load, not startup
+        fake.calls.clear()
+        sim = Simulator(fake, parse_mix(args.mix), random.Random(args.seed))
+        started = time.perf_counter()
+        achieved = await sim.run(args.rate, args.duration)
+        await asyncio.sleep(args.drain)  # batch windows, reaction retries and command sleeps finish here
+        report = build_report(app, fake, sim, time.perf_counter() - started, achieved)
+    finally:
+        await app.bot.close()
+        await asyncio.gather(bot_task, return_exceptions=True)
+        await fake.stop()
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=50.0, help="events per second")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load")
+    parser.add_argument("--drain", type=float, default=8.0, help="seconds to wait for work to finish afterwards")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"event weights (default {DEFAULT_MIX})")
+    parser.add_argument("--guilds", type=int, default=4)
+    parser.add_argument("--members", type=int, default=50, help="members per guild at startup")
+    parser.add_argument("--rest-latency", type=float, default=50.0, help="ms added to every fake REST call")
+    parser.add_argument("--no-rate-limits", action="store_true", help="never answer 429")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--verbose", action="store_true", help="keep the bot's INFO logs")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    report = asyncio.run(simulate(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
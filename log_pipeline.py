@@ -0,0 +1,152 @@
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import traceback
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Tuple
+
+# LogRecord attributes that aren't user-supplied `extra=` fields.
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "suppressed"}
+
+
+class SamplingFilter(logging.Filter):
+    """Per call site rate limit for everything below `always_level`.
+
+    Each call site (logger, file, line) or explicit `extra={"event": ...}`
+    key gets a token bucket of `rate` records per second with room for
+    `burst`. Records past that are dropped before they are formatted or
+    queued; the next record that gets through from the same site carries
+    `suppressed=<n>` so the gap shows in the output. ERROR and above always
+    pass. `rate <= 0` turns sampling off.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, always_level: int = logging.ERROR):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.always_level = always_level
+        self._buckets: Dict[tuple, List[float]] = {}  # key -> [tokens, last refill, dropped since last pass]
+        self.dropped: Dict[str, int] = {}  # logger name -> records dropped, for metrics
+        self._lock = threading.Lock()  # records come from to_thread workers too
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= self.always_level:
+            return True
+        key = getattr(record, "event", None) or (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                self.dropped[record.name] = self.dropped.get(record.name, 0) + 1
+                return False
+            bucket[0] -= 1.0
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+    def dropped_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.dropped)
+
+
+class LoopSafeQueueHandler(QueueHandler):
+    """Enqueues records with as little work as possible on the calling thread.
+
+    The stock `prepare()` runs the full formatter before enqueueing; here only
+    the message is merged (so later mutation of its args can't change it) and
+    any traceback rendered. Timestamps, JSON and the write all happen on the
+    listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        return record
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} [+{suppressed} similar suppressed]" if suppressed else text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, plus exc, suppressed and any `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LogPipeline:
+    """Root logging through a queue: callers enqueue, one listener thread formats and writes.
+
+    Replaces `logging.basicConfig`. The handler on the root logger is a
+    LoopSafeQueueHandler behind a SamplingFilter, so a log call on the event
+    loop costs a filter check and a queue put; the stream handler (text or
+    JSON) runs on the listener's thread. `stop()` drains the queue; it's also
+    registered with atexit.
+    """
+
+    def __init__(self, level: int = logging.INFO, fmt: str = "text", sample_rate: float = 10.0,
+                 sample_burst: int = 20, stream=None):
+        if fmt not in ("text", "json"):
+            raise ValueError("LOG_FORMAT must be text or json")
+        self.queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.sampler = SamplingFilter(sample_rate, sample_burst)
+        self.handler = LoopSafeQueueHandler(self.queue)
+        self.handler.addFilter(self.sampler)
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter(logging.BASIC_FORMAT))
+        self.listener = QueueListener(self.queue, output, respect_handler_level=True)
+        self.level = level
+        self._installed: Optional[Tuple[List[logging.Handler], int]] = None
+
+    def install(self) -> "LogPipeline":
+        root = logging.getLogger()
+        self._installed = (root.handlers[:], root.level)
+        root.handlers[:] = [self.handler]
+        root.setLevel(self.level)
+        self.listener.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self) -> None:
+        if self._installed is None:
+            return
+        handlers, level = self._installed
+        self._installed = None
+        root = logging.getLogger()
+        root.handlers[:] = handlers
+        root.setLevel(level)
+        self.listener.stop()  # writes whatever is still queued
+
+    @property
+    def backlog(self) -> int:
+        return self.queue.qsize()
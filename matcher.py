@@ -0,0 +1,139 @@
+import re
+from typing import Dict, Iterable, Optional, Pattern, Tuple
+
+# Apostrophes people actually type in chat: straight, curly and the modifier letter.
+_APOSTROPHES = "'’ʼ"
+_APOSTROPHE_CLASS = "[" + _APOSTROPHES + "]"
+_WS = re.compile(r"\s+")
+_LITERAL_RUNS = re.compile("[^ " + _APOSTROPHES + "]+")
+
+# Up to this many keywords, a plain substring scan rejects non-matching messages faster than the
+# regex can (see benchmarks/bench_matcher.py); above it the regex alone wins.
+PREFILTER_MAX_KEYWORDS = 24
+
+
+def _normalize(text: str) -> str:
+    text = _WS.sub(" ", text.strip().lower())
+    for ch in _APOSTROPHES[1:]:
+        text = text.replace(ch, "'")
+    return text
+
+
+def _escape_char(ch: str) -> str:
+    if ch == " ":
+        return r"\s+"
+    if ch == "'":
+        return _APOSTROPHE_CLASS
+    return re.escape(ch)
+
+
+def _trie_pattern(node: dict) -> str:
+    """Turn a character trie into a regex with no redundant alternation."""
+    end = "" in node
+    branches = [(ch, child) for ch, child in sorted(node.items()) if ch != ""]
+    if not branches:
+        return ""
+
+    singles = []
+    alts = []
+    for ch, child in branches:
+        tail = _trie_pattern(child)
+        if tail:
+            alts.append(_escape_char(ch) + tail)
+        else:
+            singles.append(ch)
+
+    if len(singles) == 1:
+        alts.append(_escape_char(singles[0]))
+    elif singles:
+        if any(ch in (" ", "'") for ch in singles):
+            alts.extend(_escape_char(ch) for ch in singles)
+        else:
+            alts.append("[" + "".join(re.escape(ch) for ch in singles) + "]")
+
+    body = alts[0] if len(alts) == 1 and not end else "(?:" + "|".join(alts) + ")"
+    return body + "?" if end else body
+
+
+class KeywordMatcher:
+    """Single-pass, word-bounded keyword/phrase matcher.
+
+    Keywords are folded into a trie and compiled into one regex, so a message
+    is scanned once no matter how many keywords there are. Matches must sit on
+    word boundaries ("miss" does not fire on "mission"), and multi-word phrases
+    tolerate any run of whitespace and either apostrophe style.
+
+    For small keyword sets the regex only runs on messages that contain the
+    longest literal piece of some keyword ("tired" for "i'm tired"); most chat
+    contains none, and `in` checks beat the regex until there are many.
+    """
+
+    __slots__ = ("_keywords", "_lookup", "_pattern", "_needles")
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        self._keywords: frozenset = frozenset()
+        self._lookup: Dict[str, str] = {}
+        self._pattern: Optional[Pattern[str]] = None
+        self._needles: Optional[Tuple[str, ...]] = None
+        self.set_keywords(keywords)
+
+    @property
+    def keywords(self) -> frozenset:
+        return self._keywords
+
+    def set_keywords(self, keywords: Iterable[str]) -> bool:
+        """Replace the keyword set. Recompiles only if the set actually changed."""
+        lookup = {}
+        for keyword in keywords:
+            norm = _normalize(keyword)
+            if norm:
+                lookup.setdefault(norm, keyword)
+
+        new_keys = frozenset(lookup)
+        if new_keys == self._keywords and self._pattern is not None:
+            return False
+
+        self._keywords = new_keys
+        self._lookup = lookup
+        self._pattern = self._compile(new_keys) if new_keys else None
+        self._needles = self._prefilter(new_keys) if len(new_keys) <= PREFILTER_MAX_KEYWORDS else None
+        return True
+
+    @staticmethod
+    def _compile(keys: Iterable[str]) -> Pattern[str]:
+        trie: dict = {}
+        for key in keys:
+            node = trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        # The trie regex is greedy, so the longest phrase at a position wins
+        # ("i'm tired" over "tired"); the boundaries stop partial-word hits.
+        # No IGNORECASE: callers already lowercase, and the flag halves throughput.
+        return re.compile(r"(?<!\w)(?:" + _trie_pattern(trie) + r")(?!\w)")
+
+    @staticmethod
+    def _prefilter(keys: Iterable[str]) -> Tuple[str, ...]:
+        # Any match contains its keyword's spaces and apostrophes swapped for other runs, but every
+        # piece in between verbatim; one piece per keyword is enough to rule a message out.
+        needles = {max(_LITERAL_RUNS.findall(key), key=len) for key in keys}
+        # A needle containing a shorter one is redundant: the shorter one is found whenever it is.
+        return tuple(n for n in needles if not any(o != n and o in n for o in needles))
+
+    def search(self, content: str) -> Optional[str]:
+        """Return the first keyword found in lowercased `content`, or None."""
+        if self._pattern is None or not content:
+            return None
+        needles = self._needles
+        if needles is not None and not any(n in content for n in needles):
+            return None
+        m = self._pattern.search(content)
+        if m is None:
+            return None
+        return self._lookup.get(_normalize(m.group(0)), m.group(0))
+
+    def __contains__(self, content: str) -> bool:
+        return self.search(content) is not None
+
+    def __len__(self) -> int:
+        return len(self._keywords)
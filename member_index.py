@@ -0,0 +1,164 @@
+import random
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import discord
+
+
+class BoosterIndex:
+    """Per-guild set of boosting members, kept current from member events.
+
+    Built once per guild when it becomes available, then patched by
+    `update()` / `discard()`, so reading it never walks `guild.members`.
+    Rendered text is cached per guild until the guild's boosters change.
+    """
+
+    def __init__(self):
+        self._boosters: Dict[int, Dict[int, datetime]] = {}  # guild_id -> {member_id: premium_since}
+        self._rendered: Dict[int, str] = {}
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._boosters
+
+    def rebuild(self, guild: discord.Guild) -> None:
+        # premium_subscribers is still a member scan, but it only runs when a guild (re)appears.
+        self._boosters[guild.id] = {m.id: m.premium_since for m in guild.premium_subscribers if m.premium_since}
+        self._rendered.pop(guild.id, None)
+
+    def update(self, member: discord.Member) -> bool:
+        """Sync one member's boost state. Returns True if the index changed."""
+        boosters = self._boosters.get(member.guild.id)
+        if boosters is None:
+            return False
+        if member.premium_since:
+            if boosters.get(member.id) == member.premium_since:
+                return False
+            boosters[member.id] = member.premium_since
+        elif boosters.pop(member.id, None) is None:
+            return False
+        self._rendered.pop(member.guild.id, None)
+        return True
+
+    def discard(self, guild_id: int, member_id: int) -> None:
+        boosters = self._boosters.get(guild_id)
+        if boosters is not None and boosters.pop(member_id, None) is not None:
+            self._rendered.pop(guild_id, None)
+
+    def drop_guild(self, guild_id: int) -> None:
+        self._boosters.pop(guild_id, None)
+        self._rendered.pop(guild_id, None)
+
+    def mentions(self, guild_id: int) -> List[str]:
+        """Booster mentions, longest-standing booster first."""
+        boosters = self._boosters.get(guild_id, {})
+        return [f"<@{member_id}>" for member_id, _ in sorted(boosters.items(), key=lambda kv: kv[1])]
+
+    def render(self, guild_id: int, build: Callable[[List[str]], str]) -> str:
+        text = self._rendered.get(guild_id)
+        if text is None:
+            text = self._rendered[guild_id] = build(self.mentions(guild_id))
+        return text
+
+
+class SamplePool:
+    """Set of ids with O(1) add, remove and uniform random pick (swap-remove array)."""
+
+    __slots__ = ("_items", "_pos")
+
+    def __init__(self):
+        self._items: List[int] = []
+        self._pos: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._pos
+
+    def add(self, item: int) -> None:
+        if item not in self._pos:
+            self._pos[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item: int) -> None:
+        idx = self._pos.pop(item, None)
+        if idx is None:
+            return
+        last = self._items.pop()
+        if idx < len(self._items):
+            self._items[idx] = last
+            self._pos[last] = idx
+
+    def sample(self, rng: random.Random = random) -> Optional[int]:
+        if not self._items:
+            return None
+        return self._items[int(rng.random() * len(self._items))]
+
+
+class MemberPool:
+    """Per-guild pools of human members, and of online humans when presences are tracked.
+
+    Both pools are patched from member/presence events, so picking a random
+    member costs the same on a 50k-member guild as on a 50-member one.
+    """
+
+    def __init__(self, track_presences: bool = False):
+        self.track_presences = track_presences
+        self._humans: Dict[int, SamplePool] = {}
+        self._online: Dict[int, SamplePool] = {}
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._humans
+
+    def rebuild(self, guild: discord.Guild) -> None:
+        humans = SamplePool()
+        online = SamplePool()
+        for m in guild.members:
+            if m.bot:
+                continue
+            humans.add(m.id)
+            if self.track_presences and m.status != discord.Status.offline:
+                online.add(m.id)
+        self._humans[guild.id] = humans
+        self._online[guild.id] = online
+
+    def drop_guild(self, guild_id: int) -> None:
+        self._humans.pop(guild_id, None)
+        self._online.pop(guild_id, None)
+
+    def add(self, member: discord.Member) -> None:
+        humans = self._humans.get(member.guild.id)
+        if humans is None or member.bot:
+            return
+        humans.add(member.id)
+        self.update_presence(member)
+
+    def discard(self, guild_id: int, member_id: int) -> None:
+        for pools in (self._humans, self._online):
+            pool = pools.get(guild_id)
+            if pool is not None:
+                pool.discard(member_id)
+
+    def update_presence(self, member: discord.Member) -> None:
+        online = self._online.get(member.guild.id)
+        if online is None or member.bot or not self.track_presences:
+            return
+        if member.status != discord.Status.offline:
+            online.add(member.id)
+        else:
+            online.discard(member.id)
+
+    def sample(self, guild: discord.Guild, rng: random.Random = random, attempts: int = 5) -> Optional[discord.Member]:
+        """Random online human, falling back to any human. Stale ids are pruned as they're hit."""
+        for pool in (self._online.get(guild.id), self._humans.get(guild.id)):
+            if not pool:
+                continue
+            for _ in range(attempts):
+                member_id = pool.sample(rng)
+                if member_id is None:
+                    break
+                member = guild.get_member(member_id)
+                if member is not None:
+                    return member
+                self.discard(guild.id, member_id)
+        return None
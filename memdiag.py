@@ -0,0 +1,155 @@
+import asyncio
+import hmac
+import logging
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import web
+
+from cache_profile import resident_memory_bytes
+
+logger = logging.getLogger("sabaw_bot.memory")
+
+# Allocation sites inside these are tracemalloc's own bookkeeping, not ours.
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _site(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class MemoryDiagnostics:
+    """tracemalloc snapshots plus the sizes of the bot's own tables.
+
+    Tracing costs CPU and memory on every allocation, so it's off until
+    `start()`. `start()` takes a baseline snapshot; `snapshot()` takes a new
+    "latest" one; `top()` reads the latest and `diff()` compares it to the
+    baseline. Statistics are computed off the event loop.
+
+    Structure sizes come from callables registered with `register()`, the
+    same way gauges are registered on Metrics.
+    """
+
+    def __init__(self, frames: int = 10):
+        self.frames = frames
+        self._sizes: Dict[str, Callable[[], int]] = {}
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._latest: Optional[tracemalloc.Snapshot] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def register(self, name: str, size: Callable[[], int]) -> None:
+        self._sizes[name] = size
+
+    def structures(self) -> Dict[str, Optional[int]]:
+        sizes = {}
+        for name, size in self._sizes.items():
+            try:
+                sizes[name] = int(size())
+            except Exception:
+                logger.exception(f"Size probe {name} failed.")
+                sizes[name] = None
+        return sizes
+
+    def start(self) -> bool:
+        """Start tracing and take the baseline. False if it was already running."""
+        if tracemalloc.is_tracing():
+            return False
+        tracemalloc.start(self.frames)
+        self._baseline = self._take()
+        self._latest = None
+        logger.info(f"tracemalloc started ({self.frames} frames)")
+        return True
+
+    def stop(self) -> bool:
+        if not tracemalloc.is_tracing():
+            return False
+        tracemalloc.stop()
+        self._baseline = self._latest = None
+        logger.info("tracemalloc stopped")
+        return True
+
+    def _take(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    def snapshot(self) -> None:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc isn't running; start it first")
+        self._latest = self._take()
+
+    async def top(self, limit: int = 10, key_type: str = "lineno") -> List[Dict[str, Any]]:
+        snap = self._latest or self._baseline
+        if snap is None:
+            return []
+        async with self._lock:
+            stats = await asyncio.to_thread(snap.statistics, key_type)
+        return [{"site": _site(s), "size": s.size, "count": s.count} for s in stats[:limit]]
+
+    async def diff(self, limit: int = 10, key_type: str = "lineno") -> List[Dict[str, Any]]:
+        if self._baseline is None or self._latest is None:
+            return []
+        async with self._lock:
+            stats = await asyncio.to_thread(self._latest.compare_to, self._baseline, key_type)
+        return [{"site": _site(s), "size_diff": s.size_diff, "size": s.size, "count_diff": s.count_diff}
+                for s in stats[:limit]]
+
+    async def report(self, limit: int = 10) -> Dict[str, Any]:
+        traced = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+        return {
+            "rss": resident_memory_bytes(),
+            "tracing": tracemalloc.is_tracing(),
+            "traced_current": traced[0] if traced else None,
+            "traced_peak": traced[1] if traced else None,
+            "structures": self.structures(),
+            "top": await self.top(limit),
+            "diff": await self.diff(limit),
+        }
+
+    # --- HTTP ---
+    def add_routes(self, app: web.Application, token: Optional[str], path: str = "/debug/memory") -> None:
+        """GET `path` for the report, POST `path`/{start,stop,snapshot} to drive tracing.
+
+        Allocation sites name files and lines, so without `token` nothing is registered;
+        with one, requests must send `Authorization: Bearer <token>`.
+        """
+        if not token:
+            return
+
+        def authorized(request: web.Request) -> bool:
+            return hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}")
+
+        async def report(request: web.Request) -> web.Response:
+            if not authorized(request):
+                return web.json_response({"error": "unauthorized"}, status=401)
+            limit = min(int(request.query.get("limit", 10)), 100)
+            return web.json_response(await self.report(limit))
+
+        async def action(request: web.Request) -> web.Response:
+            if not authorized(request):
+                return web.json_response({"error": "unauthorized"}, status=401)
+            name = request.match_info["action"]
+            if name == "start":
+                changed = self.start()
+            elif name == "stop":
+                changed = self.stop()
+            elif name == "snapshot":
+                try:
+                    self.snapshot()
+                except RuntimeError as e:
+                    return web.json_response({"error": str(e)}, status=409)
+                changed = True
+            else:
+                return web.json_response({"error": f"unknown action {name}"}, status=404)
+            return web.json_response({"action": name, "changed": changed, "tracing": self.tracing})
+
+        app.router.add_get(path, report)
+        app.router.add_post(path + "/{action}", action)
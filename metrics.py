@@ -0,0 +1,287 @@
+import time
+import logging
+import functools
+import inspect
+import weakref
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from aiohttp import web
+from discord.ext import commands
+
+logger = logging.getLogger("sabaw_bot.metrics")
+
+Labels = Tuple[Tuple[str, str], ...]
+GaugeValue = Union[float, Dict[Labels, float]]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels)
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound holding the q-th observation (inf past the last bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def render(self, name: str, labels: Labels) -> List[str]:
+        lines = []
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            lines.append(f"{name}_bucket{_fmt_labels(labels, ('le', _fmt_value(bound)))} {seen}")
+        lines.append(f"{name}_bucket{_fmt_labels(labels, ('le', '+Inf'))} {self.count}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_value(self.sum)}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {self.count}")
+        return lines
+
+
+class HandlerStats:
+    __slots__ = ("calls", "errors", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+
+
+class Metrics:
+    """In-process metrics registry with Prometheus text export.
+
+    Handlers (events, commands, interactions) get call/error counters and a
+    latency histogram each. Anything else can use plain counters, histograms,
+    or gauges that are computed when /metrics is scraped.
+    """
+
+    def __init__(self, prefix: str = "sabaw"):
+        self.prefix = prefix
+        self.handlers: Dict[Tuple[str, str], HandlerStats] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._gauges: Dict[str, Callable[[], GaugeValue]] = {}
+        self._help: Dict[str, str] = {}
+        self._command_started: "weakref.WeakKeyDictionary[commands.Context, float]" = weakref.WeakKeyDictionary()
+
+    # --- primitives ---
+    def handler(self, kind: str, name: str) -> HandlerStats:
+        stats = self.handlers.get((kind, name))
+        if stats is None:
+            stats = self.handlers[(kind, name)] = HandlerStats()
+        return stats
+
+    def inc(self, name: str, labels: Labels = (), amount: float = 1, help: str = "") -> None:
+        series = self._counters.get(name)
+        if series is None:
+            series = self._counters[name] = {}
+            self._help.setdefault(name, help)
+        series[labels] = series.get(labels, 0) + amount
+
+    def observe(self, name: str, value: float, labels: Labels = (), help: str = "",
+                buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        series = self._histograms.get(name)
+        if series is None:
+            series = self._histograms[name] = {}
+            self._help.setdefault(name, help)
+        hist = series.get(labels)
+        if hist is None:
+            hist = series[labels] = Histogram(buckets)
+        hist.observe(value)
+
+    def gauge(self, name: str, fn: Callable[[], GaugeValue], help: str = "") -> None:
+        """Register a gauge read at scrape time. `fn` returns a number or {labels: number}."""
+        self._gauges[name] = fn
+        self._help[name] = help
+
+    def record(self, kind: str, name: str, elapsed: float, failed: bool) -> None:
+        stats = self.handler(kind, name)
+        stats.calls += 1
+        if failed:
+            stats.errors += 1
+        stats.latency.observe(elapsed)
+
+    # --- instrumentation ---
+    def timed(self, kind: str, name: Optional[str] = None):
+        """Decorator for coroutine handlers. Keeps __name__ so @bot.event still works."""
+        def decorator(func):
+            label = name or func.__name__
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                failed = False
+                try:
+                    return await func(*args, **kwargs)
+                except BaseException:
+                    failed = True
+                    raise
+                finally:
+                    self.record(kind, label, time.perf_counter() - started, failed)
+            return wrapper
+        return decorator
+
+    def instrument_bot(self, bot: commands.Bot) -> None:
+        """Wrap every @bot.event handler and hook command invocation and REST calls.
+
+        Call once, after all handlers are registered.
+        """
+        for attr, value in list(vars(bot).items()):
+            if attr.startswith("on_") and inspect.iscoroutinefunction(value):
+                setattr(bot, attr, self.timed("event", attr)(value))
+
+        @bot.before_invoke
+        async def _before(ctx: commands.Context):
+            self._command_started[ctx] = time.perf_counter()
+
+        @bot.after_invoke
+        async def _after(ctx: commands.Context):
+            started = self._command_started.get(ctx)
+            if started is not None and ctx.command is not None:
+                self.record("command", ctx.command.qualified_name, time.perf_counter() - started, ctx.command_failed)
+
+        async def _command_error(ctx: commands.Context, error: commands.CommandError):
+            # Checks and cooldowns fail before before_invoke, so they never reach the histogram.
+            # Entries are left for the weak dict to drop, so invoke errors aren't double-counted here.
+            if ctx not in self._command_started and ctx.command is not None:
+                self.inc(f"{self.prefix}_command_rejections_total",
+                         (("name", ctx.command.qualified_name), ("reason", type(error).__name__)),
+                         help="Command invocations refused by checks, cooldowns or bad arguments.")
+
+        bot.add_listener(_command_error, "on_command_error")
+        self.instrument_http(bot)
+
+    def instrument_http(self, bot: commands.Bot) -> None:
+        http = bot.http
+        original = http.request
+        calls = f"{self.prefix}_discord_http_requests_total"
+        failures = f"{self.prefix}_discord_http_errors_total"
+
+        @functools.wraps(original)
+        async def request(route, **kwargs):
+            labels = (("method", route.method), ("route", route.path))
+            self.inc(calls, labels, help="Outbound Discord REST calls by route template.")
+            try:
+                return await original(route, **kwargs)
+            except Exception as e:
+                status = getattr(e, "status", None)
+                self.inc(failures, labels + (("status", str(status or "error")),),
+                         help="Discord REST calls that raised, by status.")
+                raise
+
+        http.request = request
+        # discord.py retries 429s internally and only says so in the log.
+        logging.getLogger("discord.http").addFilter(_RateLimitCounter(self))
+
+    # --- export ---
+    def _family(self, name: str, kind: str) -> List[str]:
+        lines = []
+        if self._help.get(name):
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+        return lines
+
+    def render(self) -> str:
+        p = self.prefix
+        out: List[str] = []
+
+        ordered = sorted(self.handlers.items())
+        out += [f"# HELP {p}_handler_calls_total Handler invocations.", f"# TYPE {p}_handler_calls_total counter"]
+        out += [f"{p}_handler_calls_total{_fmt_labels((('kind', k), ('name', n)))} {s.calls}" for (k, n), s in ordered]
+        out += [f"# HELP {p}_handler_errors_total Handler invocations that raised.", f"# TYPE {p}_handler_errors_total counter"]
+        out += [f"{p}_handler_errors_total{_fmt_labels((('kind', k), ('name', n)))} {s.errors}" for (k, n), s in ordered]
+        out += [f"# HELP {p}_handler_latency_seconds Handler wall time.", f"# TYPE {p}_handler_latency_seconds histogram"]
+        for (k, n), s in ordered:
+            out += s.latency.render(f"{p}_handler_latency_seconds", (("kind", k), ("name", n)))
+
+        for name, series in sorted(self._counters.items()):
+            out += self._family(name, "counter")
+            out += [f"{name}{_fmt_labels(labels)} {_fmt_value(v)}" for labels, v in sorted(series.items())]
+
+        for name, hseries in sorted(self._histograms.items()):
+            out += self._family(name, "histogram")
+            for labels, hist in sorted(hseries.items()):
+                out += hist.render(name, labels)
+
+        for name, fn in sorted(self._gauges.items()):
+            try:
+                value = fn()
+            except Exception:
+                logger.exception(f"Gauge {name} failed")
+                continue
+            out += self._family(name, "gauge")
+            if isinstance(value, dict):
+                out += [f"{name}{_fmt_labels(labels)} {_fmt_value(v)}" for labels, v in sorted(value.items())]
+            else:
+                out.append(f"{name} {_fmt_value(value)}")
+
+        return "\n".join(out) + "\n"
+
+    async def handle(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    def add_routes(self, app: web.Application, path: str = "/metrics") -> None:
+        app.router.add_get(path, self.handle)
+
+
+class _RateLimitCounter(logging.Filter):
+    """Counts discord.py's 429 warnings without touching the records."""
+
+    def __init__(self, metrics: Metrics):
+        super().__init__()
+        self.metrics = metrics
+        self.name_ = f"{metrics.prefix}_discord_http_429_total"
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        msg = record.msg if isinstance(record.msg, str) else ""
+        is_global = msg.lower().startswith("global rate limit")
+        if "429" in msg or is_global:
+            scope = "global" if is_global else "route"
+            method = ""
+            if scope == "route" and isinstance(record.args, tuple) and record.args:
+                method = str(record.args[0])
+            self.metrics.inc(self.name_, (("scope", scope), ("method", method)),
+                             help="429 responses reported by discord.py (retried internally).")
+        return True
+
@@ -0,0 +1,144 @@
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import discord
+
+logger = logging.getLogger("sabaw_bot.reactions")
+
+ReactionCallback = Callable[["ReactionJob"], Awaitable[None]]
+
+
+class ReactionJob:
+    """Reactions queued for one message, and how they went."""
+
+    __slots__ = ("message", "emojis", "added", "failed", "on_done", "done")
+
+    def __init__(self, message: discord.Message, emojis: List[str], on_done: Optional[ReactionCallback]):
+        self.message = message
+        self.emojis = emojis
+        self.added: List[str] = []
+        self.failed: List[Tuple[str, str]] = []  # (emoji, reason)
+        self.on_done = on_done
+        self.done = asyncio.Event()
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.failed)
+
+
+class ReactionScheduler:
+    """Background reaction dispatcher shared by every command that reacts.
+
+    Jobs are queued per channel, which is how Discord buckets reaction
+    routes, and drained by one worker per busy channel. There are no fixed
+    sleeps between calls: discord.py's HTTP client already waits on the
+    bucket's own X-RateLimit headers, so each emoji costs exactly one PUT.
+    429s that discord.py gives up on and 5xx errors are retried with jittered
+    exponential backoff until `max_attempts` is spent.
+    """
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 30.0, metrics=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.metrics = metrics
+        self._queues: Dict[int, Deque[ReactionJob]] = {}
+        self._workers: Set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def submit(self, message: discord.Message, emojis: List[str],
+               on_done: Optional[ReactionCallback] = None) -> Optional[ReactionJob]:
+        """Queue `emojis` for `message` and return immediately."""
+        # Adding the same reaction twice is a wasted round-trip.
+        unique = list(dict.fromkeys(e for e in emojis if e))
+        if not unique:
+            return None
+
+        job = ReactionJob(message, unique, on_done)
+        channel_id = message.channel.id
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = self._queues[channel_id] = deque()
+            task = asyncio.create_task(self._drain(channel_id, queue), name=f"reactions-{channel_id}")
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
+        queue.append(job)
+        return job
+
+    async def _drain(self, channel_id: int, queue: Deque[ReactionJob]) -> None:
+        try:
+            while queue:
+                job = queue.popleft()
+                try:
+                    await self._run(job)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception(f"Reaction job for message {job.message.id} crashed")
+        finally:
+            self._queues.pop(channel_id, None)
+
+    async def _run(self, job: ReactionJob) -> None:
+        for emoji in job.emojis:
+            reason = await self._add_one(job.message, emoji)
+            if reason is None:
+                job.added.append(emoji)
+                self._count("added")
+                continue
+            job.failed.append((emoji, reason))
+            self._count(reason)
+            if reason == "message_gone":
+                job.failed.extend((e, reason) for e in job.emojis[len(job.added) + len(job.failed):])
+                break
+
+        if job.failed:
+            summary = ", ".join(f"{emoji} ({reason})" for emoji, reason in job.failed)
+            logger.warning(f"Reactions incomplete on message {job.message.id}: {len(job.added)}/{len(job.emojis)} added; failed: {summary}")
+        job.done.set()
+        if job.on_done is not None:
+            try:
+                await job.on_done(job)
+            except Exception:
+                logger.exception("Reaction on_done callback failed")
+
+    async def _add_one(self, message: discord.Message, emoji: str) -> Optional[str]:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await message.add_reaction(emoji)
+                return None
+            except discord.Forbidden:
+                return "forbidden"
+            except discord.NotFound:
+                return "message_gone"
+            except discord.HTTPException as e:
+                if e.status == 429 or e.status >= 500:
+                    if attempt == self.max_attempts:
+                        return "rate_limited" if e.status == 429 else "server_error"
+                    delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+                    retry_after = getattr(e, "retry_after", None)
+                    if retry_after:
+                        delay = max(delay, retry_after)
+                    delay *= random.uniform(1.0, 1.25)
+                    logger.warning(f"Reaction {emoji} got {e.status}; retry {attempt}/{self.max_attempts - 1} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                # 400 Unknown Emoji and friends won't get better by retrying.
+                return "invalid"
+        return "rate_limited"
+
+    def _count(self, outcome: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("sabaw_reactions_total", (("outcome", outcome),),
+                             help="Reactions attempted by the reaction scheduler, by outcome.")
+
+    async def close(self) -> None:
+        for task in list(self._workers):
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
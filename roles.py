@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger("sabaw_bot.roles")
+
+
+class RoleCache:
+    """Role name -> id per guild, resolved with one scan and kept until a role event.
+
+    `discord.utils.get(guild.roles, name=...)` walks (and sorts) every role on
+    each call. Here the first lookup in a guild maps all role names at once;
+    later lookups are a dict hit plus `guild.get_role`. Call `invalidate()`
+    from the role create/update/delete events.
+    """
+
+    def __init__(self):
+        self._names: Dict[int, Dict[str, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, guild: discord.Guild, name: str) -> Optional[discord.Role]:
+        names = self._names.get(guild.id)
+        if names is None:
+            self.misses += 1
+            names = {}
+            for role in guild.roles:
+                names.setdefault(role.name, role.id)  # first by position, same as utils.get
+            self._names[guild.id] = names
+        else:
+            self.hits += 1
+
+        role_id = names.get(name)
+        if role_id is None:
+            return None
+        role = guild.get_role(role_id)
+        if role is None:
+            # Deleted without us hearing about it; rebuild next time.
+            self.invalidate(guild.id)
+        return role
+
+    def invalidate(self, guild_id: int) -> None:
+        self._names.pop(guild_id, None)
+
+
+class RoleGrants:
+    """Bounded-concurrency `add_roles` with duplicate requests collapsed.
+
+    The request runs in a task of its own that every caller for the same
+    member and role awaits, so a second grant while the first is in flight
+    sends nothing new. A caller that is cancelled stops waiting; the grant
+    itself still finishes for everyone else.
+    """
+
+    def __init__(self, concurrency: int = 4, metrics=None):
+        self._sem = asyncio.Semaphore(concurrency)
+        self._inflight: Dict[Tuple[int, int, int], asyncio.Task] = {}
+        self.metrics = metrics
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def grant(self, member: discord.Member, role: discord.Role, reason: Optional[str] = None) -> None:
+        key = (member.guild.id, member.id, role.id)
+        task = self._inflight.get(key)
+        if task is not None:
+            self._count("deduplicated")
+        else:
+            task = self._inflight[key] = asyncio.create_task(self._grant(member, role, reason))
+            task.add_done_callback(lambda t: self._done(key, t))
+        # shield: one impatient caller being cancelled mustn't cancel everyone's grant.
+        await asyncio.shield(task)
+
+    async def _grant(self, member: discord.Member, role: discord.Role, reason: Optional[str]) -> None:
+        try:
+            async with self._sem:
+                await member.add_roles(role, reason=reason)
+        except Exception:
+            self._count("failed")
+            raise
+        self._count("granted")
+
+    def _done(self, key: Tuple[int, int, int], task: asyncio.Task) -> None:
+        del self._inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody is left waiting on doesn't log "exception was never retrieved".
+            task.exception()
+
+    def _count(self, outcome: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("sabaw_role_grants_total", (("outcome", outcome),),
+                             help="Role grants by outcome.")
@@ -0,0 +1,294 @@
+import re
+import json
+import time
+import heapq
+import asyncio
+import sqlite3
+import logging
+from datetime import datetime, timedelta, tzinfo
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger("sabaw_bot.scheduler")
+
+DELAY_BUCKETS = (1, 5, 15, 60, 300, 900, 3600, 6 * 3600, 24 * 3600)
+
+_DURATION = re.compile(r"(\d+)\s*([smhdw])")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+_TIMESTAMP = re.compile(r"<t:(\d+)(?::[a-zA-Z])?>")
+
+
+def parse_when(text: str, now: float, tz: tzinfo) -> float:
+    """Wall-clock epoch seconds for "2h30m", "in 45m", "18:00", "2026-10-20T18:00" or "<t:1760000000>".
+
+    Clock times and dates are read in `tz`; a bare "HH:MM" that has already
+    passed today means tomorrow. Raises ValueError for anything else.
+    """
+    text = text.strip().lower()
+    if text.startswith("in "):
+        text = text[3:].strip()
+
+    match = _TIMESTAMP.fullmatch(text)
+    if match:
+        return float(match.group(1))
+
+    compact = text.replace(" ", "")
+    if compact and _DURATION.sub("", compact) == "":
+        seconds = sum(int(n) * _UNITS[unit] for n, unit in _DURATION.findall(compact))
+        if seconds <= 0:
+            raise ValueError("delay must be more than zero")
+        return now + seconds
+
+    local_now = datetime.fromtimestamp(now, tz)
+    try:
+        clock = datetime.strptime(text, "%H:%M")
+    except ValueError:
+        pass
+    else:
+        at = local_now.replace(hour=clock.hour, minute=clock.minute, second=0, microsecond=0)
+        if at.timestamp() <= now:
+            at += timedelta(days=1)
+        return at.timestamp()
+
+    try:
+        at = datetime.fromisoformat(text.replace(" ", "T", 1).upper())
+    except ValueError:
+        raise ValueError(f"don't know when {text!r} is") from None
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=tz)
+    return at.timestamp()
+
+
+class ScheduledAnnouncement:
+    """One pending `!ann` post. `payload` holds what the announcement needs to be rebuilt."""
+
+    __slots__ = ("id", "guild_id", "channel_id", "author_id", "run_at", "created_at", "payload")
+
+    def __init__(self, id: int, guild_id: int, channel_id: int, author_id: int, run_at: float,
+                 created_at: float, payload: Dict[str, Any]):
+        self.id = id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.run_at = run_at
+        self.created_at = created_at
+        self.payload = payload
+
+
+Runner = Callable[[ScheduledAnnouncement], Awaitable[None]]
+
+
+class AnnouncementScheduler:
+    """Announcements posted at a later time, kept in SQLite so they survive restarts.
+
+    Pending jobs live in a dict plus one min-heap of (run_at, id), and a
+    single timer task sleeps until the earliest one is due, so a thousand
+    pending jobs cost a thousand heap entries rather than a thousand sleeping
+    tasks. Adding an earlier job wakes the timer; cancelling just drops the
+    job from the dict and its heap entry is skipped when it comes up.
+
+    Rows are written through when a job is added or cancelled and deleted
+    once it has run, so a crash mid-post means the job runs again on the next
+    start (at least once). Jobs that came due while the bot was down are
+    caught up as soon as the timer starts; ones more than `catch_up` seconds
+    late are dropped instead of posting stale news.
+
+    With several shard processes sharing one database, `owns(guild_id)`
+    limits each process to the jobs of its own guilds.
+    """
+
+    def __init__(self, path: str, run: Runner, catch_up: float = 24 * 3600,
+                 owns: Optional[Callable[[int], bool]] = None, metrics=None):
+        self.path = path
+        self.run = run
+        self.catch_up = catch_up
+        self.owns = owns
+        self.metrics = metrics
+        self._jobs: Dict[int, ScheduledAnnouncement] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._wake = asyncio.Event()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._posting: Set[asyncio.Task] = set()
+        self._finished: List[int] = []  # ran (or expired), row not deleted yet
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def open(self) -> None:
+        self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS scheduled_announcements ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER NOT NULL, channel_id INTEGER NOT NULL,"
+                " author_id INTEGER NOT NULL, run_at REAL NOT NULL, created_at REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+        rows = self._conn.execute(
+            "SELECT id, guild_id, channel_id, author_id, run_at, created_at, payload FROM scheduled_announcements"
+        ).fetchall()
+        for id, guild_id, channel_id, author_id, run_at, created_at, payload in rows:
+            if self.owns is not None and not self.owns(guild_id):
+                continue
+            try:
+                job = ScheduledAnnouncement(id, guild_id, channel_id, author_id, run_at, created_at, json.loads(payload))
+            except ValueError:
+                logger.warning(f"Dropping unreadable scheduled announcement #{id}")
+                continue
+            self._jobs[id] = job
+            self._heap.append((run_at, id))
+        heapq.heapify(self._heap)
+        overdue = sum(1 for run_at, _ in self._heap if run_at <= time.time())
+        logger.info(f"Loaded {len(self._jobs)} scheduled announcement(s) from {self.path} ({overdue} overdue)")
+
+    def start(self, ready: Optional[Callable[[], Awaitable[Any]]] = None) -> None:
+        """Start the timer. It waits on `ready()` first so overdue jobs have channels to post in."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._timer(ready), name="announcement-scheduler")
+
+    async def close(self, timeout: float = 5.0) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._posting:
+            # Posts cut off here keep their rows and go out again after the restart.
+            _, unfinished = await asyncio.wait(list(self._posting), timeout=timeout)
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        if self._conn is not None:
+            # A delete from a _forget cut off above may still be running in its thread; wait it out.
+            async with self._write_lock:
+                if self._finished:
+                    self._delete(self._finished)
+                    self._finished = []
+                self._conn.close()
+                self._conn = None
+
+    # --- jobs ---
+    async def add(self, guild_id: int, channel_id: int, author_id: int, run_at: float,
+                  payload: Dict[str, Any]) -> ScheduledAnnouncement:
+        created_at = time.time()
+        id = await self._write(
+            "INSERT INTO scheduled_announcements (guild_id, channel_id, author_id, run_at, created_at, payload)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (guild_id, channel_id, author_id, run_at, created_at, json.dumps(payload)),
+        )
+        job = self._jobs[id] = ScheduledAnnouncement(id, guild_id, channel_id, author_id, run_at, created_at, payload)
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (run_at, id))
+        if earliest is None or run_at < earliest:
+            self._wake.set()
+        return job
+
+    async def cancel(self, guild_id: int, job_id: int) -> bool:
+        """Cancel a pending job of this guild. False if there's no such job (or it already ran)."""
+        job = self._jobs.get(job_id)
+        if job is None or job.guild_id != guild_id:
+            return False
+        del self._jobs[job_id]
+        if len(self._heap) > 2 * len(self._jobs) + 64:
+            # Mostly cancelled entries by now; rebuild rather than carry them until they come due.
+            self._heap = [(j.run_at, j.id) for j in self._jobs.values()]
+            heapq.heapify(self._heap)
+        await self._write("DELETE FROM scheduled_announcements WHERE id = ?", (job_id,))
+        self._count("cancelled")
+        return True
+
+    def pending(self, guild_id: Optional[int] = None) -> List[ScheduledAnnouncement]:
+        """Pending jobs, soonest first, optionally only one guild's."""
+        jobs = [j for j in self._jobs.values() if guild_id is None or j.guild_id == guild_id]
+        return sorted(jobs, key=lambda j: (j.run_at, j.id))
+
+    # --- timer ---
+    async def _timer(self, ready) -> None:
+        if ready is not None:
+            await ready()
+        while True:
+            self._wake.clear()
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                run_at, id = heapq.heappop(self._heap)
+                job = self._jobs.pop(id, None)
+                if job is None:
+                    continue  # cancelled
+                self._fire(job, now)
+            # Wake up at least once a minute so wall-clock jumps (NTP, suspend) can't strand a job.
+            timeout = min(self._heap[0][0] - now, 60.0) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, job: ScheduledAnnouncement, now: float) -> None:
+        late = now - job.run_at
+        if late > self.catch_up:
+            logger.warning(f"Dropping scheduled announcement #{job.id} in guild {job.guild_id}: "
+                           f"{late / 3600:.1f}h overdue")
+            self._count("expired")
+            self._spawn(self._forget(job))
+            return
+        if self.metrics is not None:
+            self.metrics.observe("sabaw_scheduled_announcement_delay_seconds", late,
+                                 help="How long after its scheduled time an announcement went out.",
+                                 buckets=DELAY_BUCKETS)
+        self._spawn(self._post(job))
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._posting.add(task)
+        task.add_done_callback(self._posting.discard)
+
+    async def _post(self, job: ScheduledAnnouncement) -> None:
+        try:
+            await self.run(job)
+        except asyncio.CancelledError:
+            raise  # shutting down: the row stays, so it runs again after the restart
+        except Exception:
+            logger.exception(f"Scheduled announcement #{job.id} in guild {job.guild_id} failed; dropping it.")
+            self._count("failed")
+        else:
+            self._count("sent")
+        await self._forget(job)
+
+    async def _forget(self, job: ScheduledAnnouncement) -> None:
+        # Jobs that finish while a delete is in flight are picked up by the next one, in one transaction.
+        self._finished.append(job.id)
+        async with self._write_lock:
+            if not self._finished or self._conn is None:
+                return
+            ids, self._finished = self._finished, []
+            try:
+                await self._in_thread(self._delete, ids)
+            except Exception:
+                logger.exception(f"Couldn't delete {len(ids)} finished announcement(s); they may run again after a restart.")
+
+    def _count(self, outcome: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("sabaw_scheduled_announcements_total", (("outcome", outcome),),
+                             help="Scheduled announcements by how they ended.")
+
+    # --- SQLite ---
+    async def _write(self, sql: str, params: tuple) -> int:
+        if self._conn is None:
+            raise RuntimeError("AnnouncementScheduler is not open")
+        async with self._write_lock:
+            return await self._in_thread(self._execute, sql, params)
+
+    async def _in_thread(self, fn, *args):
+        # Called with _write_lock held. A cancelled caller can't stop the thread, so it keeps the lock
+        # (and with it the connection) until the thread is done.
+        call = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        try:
+            return await asyncio.shield(call)
+        except asyncio.CancelledError:
+            await asyncio.wait([call])
+            raise
+
+    def _delete(self, ids: List[int]) -> None:
+        with self._conn:
+            self._conn.executemany("DELETE FROM scheduled_announcements WHERE id = ?", [(i,) for i in ids])
+
+    def _execute(self, sql: str, params: tuple) -> int:
+        with self._conn:
+            return self._conn.execute(sql, params).lastrowid
@@ -0,0 +1,116 @@
+import random
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Set, TypeVar
+
+T = TypeVar("T")
+
+
+class ShuffleBag:
+    """Draws every item of a sequence once, in random order, before repeating any.
+
+    Items aren't copied: the bag holds a permutation of indexes and a cursor.
+    A draw is one index read; the reshuffle at the end of each pass is O(n)
+    and happens once every n draws. At the pass boundary the first `window`
+    slots of the new order are kept clear of the last `window` items drawn,
+    so no item comes back within `window` draws of itself even across passes.
+    """
+
+    __slots__ = ("items", "window", "rng", "_order", "_pos", "_recent")
+
+    def __init__(self, items: Sequence[T], window: int = 1, rng: random.Random = random,
+                 recent: Optional[List[int]] = None):
+        if not items:
+            raise ValueError("can't draw from an empty sequence")
+        self.items = items
+        # With window >= n/2 there may be no legal order; leave at least half the bag free.
+        self.window = max(0, min(window, len(items) // 2))
+        self.rng = rng
+        self._order = list(range(len(items)))
+        self._recent: List[int] = [i for i in (recent or []) if i < len(items)][-self.window:] if self.window else []
+        self._pos = len(items)  # first draw shuffles
+
+    @property
+    def recent(self) -> List[int]:
+        """Indexes of the last `window` draws, oldest first."""
+        return list(self._recent)
+
+    def _reshuffle(self) -> None:
+        order = self._order
+        self.rng.shuffle(order)
+        window = self.window
+        if window and self._recent:
+            blocked = set(self._recent)
+            n = len(order)
+            for i in range(window):
+                if order[i] in blocked:
+                    # Swap in something from past the window that isn't blocked.
+                    while True:
+                        j = self.rng.randrange(window, n)
+                        if order[j] not in blocked:
+                            break
+                    order[i], order[j] = order[j], order[i]
+        self._pos = 0
+
+    def draw(self) -> T:
+        if self._pos >= len(self._order):
+            self._reshuffle()
+        index = self._order[self._pos]
+        self._pos += 1
+        if self.window:
+            recent = self._recent
+            recent.append(index)
+            if len(recent) > self.window:
+                del recent[0]
+        return self.items[index]
+
+
+class SelectionEngine:
+    """Shuffle bags per scope, so each guild / channel / user gets its own rotation.
+
+    `scope` is any string naming whose history it is, e.g. "roast:<user id>".
+    A scope's bag is rebuilt when its sequence is replaced (a content pack
+    reload hands out a new tuple). At most `max_bags` are kept, least
+    recently used first out, so per-user scopes can't grow without bound.
+
+    `recent()` / `seed()` export and restore the no-repeat history so it can
+    be persisted; `touched()` returns the scopes drawn from since last asked.
+    """
+
+    def __init__(self, window: int = 1, max_bags: int = 10_000, rng: random.Random = random):
+        self.window = window
+        self.max_bags = max_bags
+        self.rng = rng
+        self._bags: "OrderedDict[str, ShuffleBag]" = OrderedDict()
+        self._seeds: Dict[str, List[int]] = {}
+        self._touched: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._bags)
+
+    def draw(self, scope: str, items: Sequence[T]) -> T:
+        bags = self._bags
+        bag = bags.get(scope)
+        if bag is None or bag.items is not items:
+            recent = self._seeds.pop(scope, None) if bag is None else None
+            if bag is not None and len(bag.items) == len(items):
+                recent = bag.recent  # same-size reload: indexes still line up closely enough
+            bag = bags[scope] = ShuffleBag(items, self.window, self.rng, recent)
+            while len(bags) > self.max_bags:
+                bags.popitem(last=False)
+        else:
+            bags.move_to_end(scope)
+        self._touched.add(scope)
+        return bag.draw()
+
+    def recent(self, scope: str) -> List[int]:
+        bag = self._bags.get(scope)
+        return bag.recent if bag is not None else list(self._seeds.get(scope, []))
+
+    def seed(self, scope: str, recent: List[int]) -> None:
+        """History for a scope that has no bag yet; applied when it's first drawn from."""
+        if scope not in self._bags:
+            self._seeds[scope] = list(recent)
+
+    def touched(self) -> List[str]:
+        scopes, self._touched = self._touched, set()
+        return [s for s in scopes if s in self._bags]
@@ -0,0 +1,105 @@
+import math
+from typing import Any, Dict, List, Optional
+
+from discord.ext import commands
+
+
+def parse_shard_ids(spec: str) -> Optional[List[int]]:
+    """"0-3,6,8-9" -> [0, 1, 2, 3, 6, 8, 9]. Empty -> None (let discord.py pick)."""
+    spec = spec.strip()
+    if not spec:
+        return None
+    ids = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            ids.update(range(int(lo), int(hi) + 1))
+        elif part:
+            ids.add(int(part))
+    return sorted(ids)
+
+
+def format_shard_ids(ids: List[int]) -> str:
+    return ",".join(str(i) for i in ids)
+
+
+def split_shards(shard_count: int, workers: int) -> List[List[int]]:
+    """Contiguous shard ranges, as even as possible, one per worker process."""
+    if shard_count < 1:
+        raise ValueError("shard_count must be at least 1")
+    workers = max(1, min(workers, shard_count))
+    size, extra = divmod(shard_count, workers)
+    ranges = []
+    start = 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)  # the first `extra` workers take one more
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def shard_for(guild_id: int, shard_count: int) -> int:
+    """The shard Discord routes a guild to."""
+    return (guild_id >> 22) % shard_count
+
+
+def owns_guild(guild_id: int, shard_count: Optional[int], shard_ids: Optional[List[int]]) -> bool:
+    """Whether a process running `shard_ids` of `shard_count` serves this guild. Unsharded processes own all."""
+    if not shard_count or shard_ids is None:
+        return True
+    return shard_for(guild_id, shard_count) in shard_ids
+
+
+def is_sharded(bot: commands.Bot) -> bool:
+    return isinstance(bot, commands.AutoShardedBot)
+
+
+def shard_state(bot: commands.Bot) -> Dict[str, Any]:
+    """Per-shard gateway view for /healthz. Empty for an unsharded bot."""
+    if not is_sharded(bot):
+        return {}
+    shards = {}
+    guild_counts: Dict[int, int] = {}
+    for guild in bot.guilds:
+        guild_counts[guild.shard_id] = guild_counts.get(guild.shard_id, 0) + 1
+    for shard_id, info in sorted(bot.shards.items()):
+        latency = info.latency
+        shards[str(shard_id)] = {
+            "closed": info.is_closed(),
+            "latency_ms": round(latency * 1000, 1) if math.isfinite(latency) else None,
+            "guilds": guild_counts.get(shard_id, 0),
+        }
+    return {"shard_count": bot.shard_count, "shard_ids": sorted(bot.shards), "shards": shards}
+
+
+def register_shard_metrics(bot: commands.Bot, metrics) -> None:
+    """Per-shard latency/guild gauges and connect/disconnect counters."""
+    if not is_sharded(bot):
+        return
+
+    def latencies():
+        return {(("shard", str(sid)),): lat for sid, lat in bot.latencies if math.isfinite(lat)}
+
+    def guilds():
+        counts: Dict[int, int] = {sid: 0 for sid in bot.shards}
+        for guild in bot.guilds:
+            counts[guild.shard_id] = counts.get(guild.shard_id, 0) + 1
+        return {(("shard", str(sid)),): n for sid, n in counts.items()}
+
+    metrics.gauge("sabaw_shard_latency_seconds", latencies, help="Heartbeat latency per shard.")
+    metrics.gauge("sabaw_shard_guilds", guilds, help="Guilds served per shard.")
+
+    async def on_shard_connect(shard_id: int):
+        metrics.inc("sabaw_shard_events_total", (("shard", str(shard_id)), ("event", "connect")),
+                    help="Shard gateway lifecycle events.")
+
+    async def on_shard_disconnect(shard_id: int):
+        metrics.inc("sabaw_shard_events_total", (("shard", str(shard_id)), ("event", "disconnect")))
+
+    async def on_shard_resumed(shard_id: int):
+        metrics.inc("sabaw_shard_events_total", (("shard", str(shard_id)), ("event", "resumed")))
+
+    bot.add_listener(on_shard_connect)
+    bot.add_listener(on_shard_disconnect)
+    bot.add_listener(on_shard_resumed)
@@ -0,0 +1,222 @@
+import json
+import time
+import asyncio
+import sqlite3
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from discord.ext import commands
+
+logger = logging.getLogger("sabaw_bot.state")
+
+_MISSING = object()
+
+
+class StateStore:
+    """Small runtime state (cooldowns, last picks) that survives restarts.
+
+    Everything is read once in `open()` into an in-memory snapshot. After that
+    `get()` / `put()` are plain dict operations and never wait on disk; changed
+    keys are only marked dirty and written out together every `flush_interval`
+    seconds, in one transaction on a WAL-mode SQLite connection off the event
+    loop. A crash loses at most one interval of writes.
+
+    Entries may carry a wall-clock `expires_at`. Expired entries are skipped
+    on load, dropped from memory on each flush and deleted from disk.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 5.0, metrics=None):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.metrics = metrics
+        self._data: Dict[str, Dict[str, Tuple[Any, Optional[float]]]] = {}
+        self._dirty: Dict[Tuple[str, str], bool] = {}  # (namespace, key) -> still present?
+        self._collectors: List[Callable[[], None]] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    def open(self) -> None:
+        self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bot_state ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        now = time.time()
+        with self._conn:
+            self._conn.execute("DELETE FROM bot_state WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        rows = self._conn.execute("SELECT namespace, key, value, expires_at FROM bot_state").fetchall()
+        for namespace, key, value, expires_at in rows:
+            try:
+                self._data.setdefault(namespace, {})[key] = (json.loads(value), expires_at)
+            except ValueError:
+                logger.warning(f"Dropping unreadable state {namespace}/{key}")
+        logger.info(f"Restored {len(rows)} state entr{'y' if len(rows) == 1 else 'ies'} from {self.path}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="state-flush")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            # Stopped rather than cancelled, so a flush in progress finishes before the last one starts.
+            self._stop.set()
+            await self._task
+            self._task = None
+        if self._conn is not None:
+            await self.flush()
+            self._conn.close()
+            self._conn = None
+
+    # --- snapshot ---
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        entry = self._data.get(namespace, {}).get(key)
+        if entry is None or (entry[1] is not None and entry[1] <= time.time()):
+            return default
+        return entry[0]
+
+    def items(self, namespace: str) -> Iterator[Tuple[str, Any, Optional[float]]]:
+        """(key, value, expires_at) for every live entry in `namespace`."""
+        now = time.time()
+        for key, (value, expires_at) in list(self._data.get(namespace, {}).items()):
+            if expires_at is None or expires_at > now:
+                yield key, value, expires_at
+
+    def put(self, namespace: str, key: str, value: Any, expires_at: Optional[float] = None) -> None:
+        entries = self._data.setdefault(namespace, {})
+        if entries.get(key, _MISSING) == (value, expires_at):
+            return
+        entries[key] = (value, expires_at)
+        self._dirty[(namespace, key)] = True
+
+    def delete(self, namespace: str, key: str) -> None:
+        if self._data.get(namespace, {}).pop(key, None) is not None:
+            self._dirty[(namespace, key)] = False
+
+    def add_collector(self, collect: Callable[[], None]) -> None:
+        """Run `collect()` right before each flush, for state that's cheaper to copy than to track."""
+        self._collectors.append(collect)
+
+    # --- write-behind ---
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.flush_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("State flush failed; will retry next interval.")
+
+    def _purge(self, now: float) -> None:
+        for entries in self._data.values():
+            expired = [k for k, (_, exp) in entries.items() if exp is not None and exp <= now]
+            for key in expired:
+                del entries[key]
+
+    async def flush(self) -> int:
+        """Write every dirty key in one transaction. Returns how many were written."""
+        if self._conn is None:
+            raise RuntimeError("StateStore is not open")
+        for collect in self._collectors:
+            try:
+                collect()
+            except Exception:
+                logger.exception("State collector failed.")
+
+        async with self._flush_lock:
+            now = time.time()
+            self._purge(now)
+            dirty, self._dirty = self._dirty, {}
+            upserts, deletes = [], []
+            for (namespace, key), present in dirty.items():
+                entry = self._data.get(namespace, {}).get(key)
+                if present and entry is not None:
+                    upserts.append((namespace, key, json.dumps(entry[0]), entry[1]))
+                else:
+                    deletes.append((namespace, key))
+
+            started = time.perf_counter()
+            write = asyncio.ensure_future(asyncio.to_thread(self._write, upserts, deletes, now))
+            try:
+                await asyncio.shield(write)
+            except BaseException:
+                if not write.done():
+                    # Cancelled mid-write: the thread can't be stopped, so keep the lock until it's done
+                    # instead of letting another flush or close() use the connection under it.
+                    await asyncio.wait([write])
+                # Put the keys back unless they were touched again meanwhile.
+                for item, present in dirty.items():
+                    self._dirty.setdefault(item, present)
+                raise
+            if self.metrics is not None:
+                self.metrics.observe("sabaw_state_flush_seconds", time.perf_counter() - started,
+                                     help="Time spent writing dirty state to SQLite.")
+                self.metrics.inc("sabaw_state_writes_total", amount=len(dirty),
+                                 help="State keys written (or deleted) by the write-behind flush.")
+            return len(dirty)
+
+    def _write(self, upserts: List[tuple], deletes: List[tuple], now: float) -> None:
+        with self._conn:
+            if upserts:
+                self._conn.executemany(
+                    "INSERT INTO bot_state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value,"
+                    " expires_at = excluded.expires_at",
+                    upserts,
+                )
+            if deletes:
+                self._conn.executemany("DELETE FROM bot_state WHERE namespace = ? AND key = ?", deletes)
+            self._conn.execute("DELETE FROM bot_state WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+
+
+# --- discord.py command cooldowns ---
+COMMAND_COOLDOWNS = "command_cooldowns"
+
+
+def _cooldown_mappings(bot: commands.Bot) -> Iterator[Tuple[str, commands.CooldownMapping]]:
+    for command in bot.walk_commands():
+        mapping = command._buckets
+        if mapping.valid and mapping.type is not commands.BucketType.default:
+            yield command.qualified_name, mapping
+
+
+def collect_command_cooldowns(bot: commands.Bot, store: StateStore) -> None:
+    """Copy every running `@commands.cooldown` bucket into `store`.
+
+    discord.py keeps these in `command._buckets._cache` (bucket key -> Cooldown,
+    on the wall clock). Only int bucket keys (user/guild/channel ids) are kept.
+    """
+    for name, mapping in _cooldown_mappings(bot):
+        for bucket_key, cooldown in list(mapping._cache.items()):
+            if not isinstance(bucket_key, int) or cooldown._tokens >= cooldown.rate:
+                continue
+            store.put(COMMAND_COOLDOWNS, f"{name}:{bucket_key}",
+                      [cooldown._window, cooldown._tokens, cooldown._last],
+                      expires_at=cooldown._window + cooldown.per)
+
+
+def restore_command_cooldowns(bot: commands.Bot, store: StateStore) -> int:
+    """Put saved buckets back into each command's cooldown mapping. Returns how many."""
+    mappings = dict(_cooldown_mappings(bot))
+    restored = 0
+    for key, (window, tokens, last), _ in store.items(COMMAND_COOLDOWNS):
+        name, _, bucket_key = key.rpartition(":")
+        mapping = mappings.get(name)
+        if mapping is None:
+            continue
+        cooldown = mapping._cooldown.copy()
+        cooldown._window, cooldown._tokens, cooldown._last = window, min(int(tokens), cooldown.rate), last
+        mapping._cache[int(bucket_key)] = cooldown
+        restored += 1
+    return restored
@@ -0,0 +1,43 @@
+import asyncio
+
+from cache_profile import MemberLoader
+
+
+class _Guild:
+    """A guild whose member cache never looks complete, as with MEMBER_CACHE=none."""
+
+    chunked = False
+    name = "fake sabaw"
+    members = ()
+
+    def __init__(self, id: int = 1):
+        self.id = id
+        self.chunks = 0
+
+    async def chunk(self, cache: bool = True):
+        self.chunks += 1
+        await asyncio.sleep(0.01)
+
+
+def test_a_guild_is_chunked_once_even_if_it_never_looks_chunked():
+    async def run():
+        rebuilt = []
+        loader = MemberLoader("lazy", on_chunked=rebuilt.append)
+        guild = _Guild()
+        await asyncio.gather(loader.ensure(guild), loader.ensure(guild))
+        await loader.ensure(guild)
+        assert guild.chunks == 1
+        assert rebuilt == [guild]
+
+    asyncio.run(run())
+
+
+def test_a_replaced_guild_object_is_chunked_again():
+    async def run():
+        loader = MemberLoader("lazy")
+        before, after = _Guild(), _Guild()  # same id: the guild as rebuilt after a reconnect
+        await loader.ensure(before)
+        await loader.ensure(after)
+        assert before.chunks == after.chunks == 1
+
+    asyncio.run(run())
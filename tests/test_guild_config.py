@@ -0,0 +1,38 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from guild_config import GuildConfigStore
+
+
+def _store() -> GuildConfigStore:
+    store = GuildConfigStore(":memory:", {"verify_role_name": "tambay"})
+    store.open()
+    return store
+
+
+def test_set_and_reset_update_the_cache():
+    async def run():
+        store = _store()
+        await store.set(1, "verify_role_name", "kasapi")
+        assert store.get(1).verify_role_name == "kasapi"
+        await store.reset(1, "verify_role_name")
+        assert store.get(1).verify_role_name == "tambay"
+
+    asyncio.run(run())
+
+
+def test_failed_write_leaves_the_cache_alone():
+    async def run():
+        store = _store()
+        await store.set(1, "verify_role_name", "kasapi")
+        store._conn.execute("DROP TABLE guild_settings")
+        with pytest.raises(sqlite3.Error):
+            await store.set(1, "verify_role_name", "other")
+        assert store.get(1).verify_role_name == "kasapi"
+        with pytest.raises(sqlite3.Error):
+            await store.reset(1, "verify_role_name")
+        assert store.overrides(1) == {"verify_role_name": "kasapi"}
+
+    asyncio.run(run())
@@ -0,0 +1,39 @@
+import pytest
+
+import matcher
+from matcher import KeywordMatcher
+
+KEYWORDS = ["im bored", "i'm bored", "bored", "pagod", "i'm tired", "tired",
+            "miss", "sleep", "gutom", "hungry", "help", "sos"]
+
+MESSAGES = [
+    "i'm tired", "i’m   tired lol", "iʼm bored na", "im bored", "so bored",
+    "on a mission", "the helpful one", "sleepy ako", "sos!", "gutom na ako", "help",
+    "wala lang, vibes lang", "", "mis s", "i'm", "tiredness",
+]
+
+
+@pytest.mark.parametrize("content", MESSAGES)
+def test_prefilter_never_changes_the_result(content, monkeypatch):
+    prefiltered = KeywordMatcher(KEYWORDS)
+    monkeypatch.setattr(matcher, "PREFILTER_MAX_KEYWORDS", 0)
+    regex_only = KeywordMatcher(KEYWORDS)
+    assert prefiltered._needles is not None and regex_only._needles is None
+    assert prefiltered.search(content) == regex_only.search(content)
+
+
+@pytest.mark.parametrize("content, expected", [
+    ("i’m   tired lol", "i'm tired"),
+    ("on a mission", None),
+    ("the helpful one", None),
+    ("sos!", "sos"),
+])
+def test_matches_are_word_bounded_and_whitespace_tolerant(content, expected):
+    assert KeywordMatcher(KEYWORDS).search(content) == expected
+
+
+def test_large_sets_skip_the_prefilter():
+    many = KEYWORDS + [f"word{i}" for i in range(matcher.PREFILTER_MAX_KEYWORDS)]
+    m = KeywordMatcher(many)
+    assert m._needles is None
+    assert m.search("word7 please") == "word7"
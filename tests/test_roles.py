@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from roles import RoleGrants
+
+
+class _Guild:
+    id = 1
+
+
+class _Role:
+    id = 2
+
+
+class _Member:
+    """Just what RoleGrants reads off a discord.Member."""
+
+    id = 3
+    guild = _Guild()
+
+    def __init__(self, error: Exception = None):
+        self.calls = 0
+        self.error = error
+
+    async def add_roles(self, role, reason=None):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        if self.error is not None:
+            raise self.error
+
+
+def test_duplicate_grants_share_one_request():
+    async def run():
+        grants, member = RoleGrants(), _Member()
+        await asyncio.gather(*(grants.grant(member, _Role()) for _ in range(5)))
+        assert member.calls == 1
+        assert grants.inflight == 0
+
+    asyncio.run(run())
+
+
+def test_cancelling_the_first_caller_does_not_cancel_the_others():
+    async def run():
+        grants, member = RoleGrants(), _Member()
+        first = asyncio.create_task(grants.grant(member, _Role()))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(grants.grant(member, _Role()))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        await second
+        assert first.cancelled()
+        assert member.calls == 1
+        assert grants.inflight == 0
+
+    asyncio.run(run())
+
+
+def test_failures_reach_every_caller():
+    async def run():
+        grants, member = RoleGrants(), _Member(RuntimeError("forbidden"))
+        results = await asyncio.gather(grants.grant(member, _Role()), grants.grant(member, _Role()),
+                                       return_exceptions=True)
+        assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+        assert member.calls == 1
+
+    asyncio.run(run())
@@ -0,0 +1,40 @@
+import time
+import asyncio
+import sqlite3
+import threading
+
+from scheduler import AnnouncementScheduler
+
+
+def test_close_waits_for_a_delete_still_running_in_its_thread(tmp_path):
+    path = str(tmp_path / "ann.db")
+    posted = []
+
+    async def post(job):
+        posted.append(job.id)
+
+    async def run():
+        scheduler = AnnouncementScheduler(path, post)
+        scheduler.open()
+        delete, busy = scheduler._delete, threading.Lock()
+
+        def slow_delete(ids):
+            assert busy.acquire(blocking=False), "two deletes overlapped on one connection"
+            try:
+                time.sleep(0.2)
+                delete(ids)
+            finally:
+                busy.release()
+
+        scheduler._delete = slow_delete
+        first = await scheduler.add(1, 10, 100, time.time() - 1, {"title": "a"})
+        scheduler.start()
+        await asyncio.sleep(0.05)  # posted, its delete is in the thread
+        second = await asyncio.wait_for(scheduler.add(1, 10, 100, time.time() - 1, {"title": "b"}), 1)
+        await asyncio.sleep(0.01)  # posted too, waiting on the write lock to delete
+        await scheduler.close(timeout=0)
+        return first.id, second.id
+
+    ids = asyncio.run(run())
+    assert posted == list(ids)
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM scheduled_announcements").fetchone() == (0,)
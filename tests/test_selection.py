@@ -0,0 +1,83 @@
+import random
+from collections import Counter
+
+import pytest
+
+from selection import SelectionEngine, ShuffleBag
+
+
+def _draws(n: int, window: int, count: int, seed: int = 1) -> list:
+    bag = ShuffleBag(tuple(range(n)), window, random.Random(seed))
+    return [bag.draw() for _ in range(count)]
+
+
+@pytest.mark.parametrize("n, window", [(2, 1), (5, 2), (30, 3), (200, 10)])
+def test_every_pass_is_a_permutation(n, window):
+    seq = _draws(n, window, n * 20)
+    for start in range(0, len(seq), n):
+        assert sorted(seq[start:start + n]) == list(range(n)), f"pass at {start} is not a permutation"
+
+
+@pytest.mark.parametrize("n, window", [(2, 1), (5, 2), (30, 3), (200, 10)])
+def test_no_repeat_within_window(n, window):
+    seq = _draws(n, window, n * 20)
+    for i in range(1, len(seq)):
+        assert seq[i] not in seq[max(0, i - window):i], f"repeat within {window} at draw {i}"
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_no_repeat_across_pass_boundary(seed):
+    n, window = 6, 3
+    seq = _draws(n, window, n * 10, seed)
+    for boundary in range(n, len(seq), n):
+        tail, head = seq[boundary - window:boundary], seq[boundary:boundary + window]
+        assert not set(tail) & set(head), f"pass boundary at {boundary}: {tail} then {head}"
+
+
+def test_window_is_capped_at_half_the_bag():
+    assert ShuffleBag((1, 2, 3, 4), window=10).window == 2
+    assert ShuffleBag(("only",), window=3).window == 0
+
+
+def test_empty_sequence_is_rejected():
+    with pytest.raises(ValueError):
+        ShuffleBag(())
+
+
+def test_first_slot_excludes_recent_and_stays_uniform():
+    # Across pass boundaries the guard must only exclude recent items, not bias the rest.
+    n, trials = 8, 3000
+    rng = random.Random(7)
+    firsts = Counter(ShuffleBag(tuple(range(n)), 2, rng, recent=[0, 1]).draw() for _ in range(trials))
+    assert firsts[0] == firsts[1] == 0
+    expected = trials / (n - 2)
+    chi2 = sum((firsts[i] - expected) ** 2 / expected for i in range(2, n))
+    assert chi2 < 20.5, f"first draw after reshuffle looks biased (chi2={chi2:.1f})"  # p = 0.001 at 5 dof
+
+
+def test_engine_keeps_history_when_pack_reloads_at_same_size():
+    engine = SelectionEngine(window=2, rng=random.Random(3))
+    lines = tuple(f"line {i}" for i in range(6))
+    last = [engine.draw("guild:1", lines) for _ in range(4)][-2:]
+    reloaded = tuple(list(lines))  # a pack reload hands out a new tuple with the same lines
+    assert engine.draw("guild:1", reloaded) not in last
+
+
+def test_engine_seed_applies_on_first_draw():
+    engine = SelectionEngine(window=2, rng=random.Random(5))
+    lines = ("a", "b", "c", "d", "e")
+    engine.seed("roast:1", [0, 1])
+    assert engine.recent("roast:1") == [0, 1]
+    assert engine.draw("roast:1", lines) not in ("a", "b")
+
+
+def test_engine_evicts_least_recently_used_scope():
+    engine = SelectionEngine(max_bags=2, rng=random.Random(1))
+    lines = ("a", "b", "c")
+    engine.draw("one", lines)
+    engine.draw("two", lines)
+    engine.draw("one", lines)
+    engine.draw("three", lines)
+    assert len(engine) == 2
+    assert engine.recent("two") == []
+    assert sorted(engine.touched()) == ["one", "three"]
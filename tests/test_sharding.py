@@ -0,0 +1,26 @@
+import pytest
+
+from sharding import owns_guild, shard_for, split_shards
+
+
+@pytest.mark.parametrize("shards, workers", [(5, 4), (8, 2), (7, 3), (16, 5), (3, 3), (1, 4), (10, 1)])
+def test_split_shards_uses_every_worker_evenly(shards, workers):
+    ranges = split_shards(shards, workers)
+    assert len(ranges) == min(workers, shards)
+    assert [sid for r in ranges for sid in r] == list(range(shards))
+    sizes = [len(r) for r in ranges]
+    assert max(sizes) - min(sizes) <= 1
+    assert sizes == sorted(sizes, reverse=True)  # the remainder goes to the first ranges
+
+
+def test_split_shards_rejects_no_shards():
+    with pytest.raises(ValueError):
+        split_shards(0, 2)
+
+
+def test_owns_guild_follows_shard_for():
+    guild_id = 1234567890123456789
+    shard = shard_for(guild_id, 4)
+    assert owns_guild(guild_id, 4, [shard])
+    assert not owns_guild(guild_id, 4, [s for s in range(4) if s != shard])
+    assert owns_guild(guild_id, None, None)
@@ -0,0 +1,64 @@
+import time
+import asyncio
+import sqlite3
+import threading
+
+from state_store import StateStore
+
+
+def _slow_writes(store: StateStore, delay: float) -> list:
+    """Make each write take `delay` seconds; returns the list of (start, end) times per write."""
+    spans, write = [], store._write
+    busy = threading.Lock()
+
+    def slow(*args):
+        assert busy.acquire(blocking=False), "two writes overlapped on one connection"
+        try:
+            started = time.monotonic()
+            time.sleep(delay)
+            write(*args)
+            spans.append((started, time.monotonic()))
+        finally:
+            busy.release()
+
+    store._write = slow
+    return spans
+
+
+def test_close_waits_for_a_cancelled_flush_before_writing_again(tmp_path):
+    path = str(tmp_path / "state.db")
+
+    async def run():
+        store = StateStore(path, flush_interval=60)
+        store.open()
+        spans = _slow_writes(store, 0.1)
+        store.put("ns", "a", 1)
+        flush = asyncio.create_task(store.flush())
+        await asyncio.sleep(0.02)
+        flush.cancel()
+        store.put("ns", "b", 2)
+        await store.close()
+        assert len(spans) == 2 and spans[0][1] <= spans[1][0]
+
+    asyncio.run(run())
+    rows = sqlite3.connect(path).execute("SELECT key FROM bot_state ORDER BY key").fetchall()
+    assert rows == [("a",), ("b",)]
+
+
+def test_close_lets_the_running_flush_finish(tmp_path):
+    path = str(tmp_path / "state.db")
+
+    async def run():
+        store = StateStore(path, flush_interval=0.01)
+        store.open()
+        spans = _slow_writes(store, 0.1)
+        store.put("ns", "a", 1)
+        store.start()
+        await asyncio.sleep(0.03)  # the periodic flush is mid-write now
+        store.put("ns", "b", 2)
+        await store.close()
+        assert len(spans) == 2
+
+    asyncio.run(run())
+    rows = sqlite3.connect(path).execute("SELECT key FROM bot_state ORDER BY key").fetchall()
+    assert rows == [("a",), ("b",)]
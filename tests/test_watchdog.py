@@ -0,0 +1,58 @@
+import time
+import asyncio
+
+from watchdog import LoopWatchdog
+
+
+class _Metrics:
+    def __init__(self):
+        self.counts = {}
+
+    def inc(self, name, labels=(), amount=1, help=""):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def observe(self, *args, **kwargs):
+        pass
+
+    def gauge(self, *args, **kwargs):
+        pass
+
+
+async def _block_across_due(watchdog: LoopWatchdog, before_due: float, block: float) -> None:
+    # Until the watchdog's timer is running and its next firing is safely ahead.
+    while not before_due + 0.02 < watchdog._due - time.monotonic() < watchdog.interval + 1:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(watchdog._due - time.monotonic() - before_due)
+    time.sleep(block)
+    await asyncio.sleep(watchdog.interval * 2)  # the timer catches up and records the lag
+
+
+def test_short_stall_between_ticks_is_caught_with_a_stack():
+    metrics = _Metrics()
+
+    async def run():
+        watchdog = LoopWatchdog(interval=0.25, threshold=0.1, metrics=metrics)
+        watchdog.start()
+        # Lag of ~150ms, so the loop never goes interval + threshold (350ms) without a tick.
+        await _block_across_due(watchdog, before_due=0.05, block=0.2)
+        await watchdog.close()
+        return watchdog.stalls()
+
+    stalls = asyncio.run(run())
+    assert len(stalls) == 1
+    assert stalls[0]["stack"] and "_block_across_due" in "".join(stalls[0]["stack"])
+    assert metrics.counts.get("sabaw_loop_stalls_total") == 1
+
+
+def test_lag_under_threshold_is_not_a_stall():
+    metrics = _Metrics()
+
+    async def run():
+        watchdog = LoopWatchdog(interval=0.25, threshold=0.1, metrics=metrics)
+        watchdog.start()
+        await _block_across_due(watchdog, before_due=0.05, block=0.1)
+        await watchdog.close()
+        return watchdog.stalls()
+
+    assert asyncio.run(run()) == []
+    assert "sabaw_loop_stalls_total" not in metrics.counts
@@ -0,0 +1,136 @@
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger("sabaw_bot.watchdog")
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LoopWatchdog:
+    """Measures event-loop lag and catches whatever is blocking the loop in the act.
+
+    A task on the loop sleeps `interval` seconds at a time; how late it wakes
+    up is the lag, kept in a rolling window (`window` seconds) and in the
+    `sabaw_loop_lag_seconds` histogram. A daemon thread watches the same
+    timer: once it is more than `threshold` overdue, the thread grabs the
+    loop thread's stack and current task from outside (the loop can't report
+    on itself while it's stuck) and logs them once per stall.
+
+    Every lag over `threshold` is a stall, counted in `sabaw_loop_stalls_total`
+    and kept in `recent_stalls`. One too short for the thread to catch in the
+    act is still logged when the timer finally runs, just without a stack.
+    """
+
+    def __init__(self, interval: float = 0.25, threshold: float = 0.1, window: float = 300.0,
+                 metrics=None, keep_stalls: int = 20):
+        self.interval = interval
+        self.threshold = threshold
+        self.metrics = metrics
+        self._lags: Deque[float] = deque(maxlen=max(1, int(window / interval)))
+        self.recent_stalls: Deque[Dict[str, Any]] = deque(maxlen=keep_stalls)
+        self._due = float("inf")  # monotonic time the watchdog timer should fire
+        self._claimed = None  # _due of the last stall reported, by whichever side got there first
+        self._claim_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._measure(), name="loop-watchdog")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        if self.metrics is not None:
+            self.metrics.gauge("sabaw_loop_lag_recent_seconds", self._recent_gauge,
+                               help="Loop lag over the watchdog's rolling window.")
+
+    async def close(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join, 1.0)
+            self._thread = None
+
+    # --- on the loop ---
+    async def _measure(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            due = self._due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self._lags.append(lag)
+            if self.metrics is not None:
+                self.metrics.observe("sabaw_loop_lag_seconds", lag, help="How late the loop ran a timer.",
+                                     buckets=LAG_BUCKETS)
+            if lag > self.threshold:
+                if self.metrics is not None:
+                    self.metrics.inc("sabaw_loop_stalls_total",
+                                     help="Times the loop was blocked past the watchdog threshold.")
+                if self._claim(due):
+                    self._record(lag, None, [])
+
+    def quantiles(self) -> Dict[str, float]:
+        lags = sorted(self._lags)
+        if not lags:
+            return {}
+        pick = lambda q: lags[min(len(lags) - 1, int(q * len(lags)))]
+        return {"p50": pick(0.50), "p99": pick(0.99), "max": lags[-1]}
+
+    def _recent_gauge(self):
+        return {(("stat", stat),): value for stat, value in self.quantiles().items()}
+
+    # --- off the loop ---
+    def _claim(self, due: float) -> bool:
+        """True for the first of the thread and the loop to report the stall on the timer due at `due`."""
+        with self._claim_lock:
+            if self._claimed == due:
+                return False
+            self._claimed = due
+            return True
+
+    def _watch(self) -> None:
+        # Polls at a fraction of the threshold, so anything blocked past it is caught while still blocked.
+        while not self._stop.wait(self.threshold / 4):
+            due = self._due
+            stalled_for = time.monotonic() - due
+            if stalled_for < self.threshold or self._claimed == due or not self._claim(due):
+                continue  # one report per stall, however long it lasts
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = traceback.format_stack(frame, limit=15) if frame is not None else []
+            task = asyncio.current_task(self._loop) if self._loop is not None else None
+            self._record(stalled_for, task, stack)
+
+    def _record(self, stalled_for: float, task: Optional[asyncio.Task], stack: List[str]) -> None:
+        stall = {
+            "at": time.time(),
+            "stalled_for": stalled_for,
+            "task": task.get_name() if task is not None else None,
+            "coro": getattr(task.get_coro(), "__qualname__", None) if task is not None else None,
+            "stack": [line.rstrip() for line in stack],
+        }
+        self.recent_stalls.append(stall)
+        if not stack:
+            logger.warning(f"Event loop blocked for {stalled_for * 1000:.0f}ms (over before a stack was taken)")
+            return
+        where = stack[-1].strip().splitlines()[0]
+        logger.warning(f"Event loop blocked for {stalled_for * 1000:.0f}ms+ in task {stall['task']} "
+                       f"({stall['coro']}) at {where}\n" + "".join(stack))
+
+    def stalls(self) -> List[Dict[str, Any]]:
+        return list(self.recent_stalls)